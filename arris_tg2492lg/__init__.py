@@ -1,15 +1,64 @@
-from .connect_box import ConnectBox, RouterInformation
+from .cache import SnmpCache
+from .connect_box import BodyLogging, ConnectBox, RouterInformation, SnmpGetResult
+from .credential_store import CredentialStore, FileCredentialStore, MemoryCredentialStore, StoredCredential
+from .delta import DeviceChange, DeviceDelta, DeviceSnapshot
 from .device import Device, LanClientAdapterType, LanClientType
-from .exception import ConnectBoxError, InvalidCredentialError
+from .device_index import OnlineDeviceIndex, PhysicalDevice
+from .device_table import DeviceRow, DeviceTable
+from .exception import ConnectBoxError, InvalidCredentialError, InvalidOidError
+from .fleet import ConnectBoxFleet, FleetResult
+from .history import AttributeChange, PresenceHistory, PresenceInterval
+from .instrumentation import Instrumentation, PrometheusExporter, RequestEvent
+from .metrics import METRIC_CATALOG, Metric, MetricSample, MetricsCollector, MetricType
+from .poller import AdaptiveInterval, ConnectBoxPoller, PollUpdate
+from .recorder import PayloadRecorder, RecordedPayload, read_recording
+from .session import create_websession
+from .snmp_table import TableRow
 
 __all__ = [
     "ConnectBox",
     "RouterInformation",
+    "SnmpGetResult",
+    "BodyLogging",
+    "SnmpCache",
+    "CredentialStore",
+    "FileCredentialStore",
+    "MemoryCredentialStore",
+    "StoredCredential",
+    "DeviceChange",
+    "DeviceDelta",
+    "DeviceSnapshot",
     "Device",
     "LanClientAdapterType",
     "LanClientType",
+    "OnlineDeviceIndex",
+    "PhysicalDevice",
+    "DeviceRow",
+    "DeviceTable",
     "ConnectBoxError",
     "InvalidCredentialError",
+    "InvalidOidError",
+    "ConnectBoxFleet",
+    "FleetResult",
+    "AttributeChange",
+    "PresenceHistory",
+    "PresenceInterval",
+    "Instrumentation",
+    "PrometheusExporter",
+    "RequestEvent",
+    "METRIC_CATALOG",
+    "Metric",
+    "MetricSample",
+    "MetricsCollector",
+    "MetricType",
+    "AdaptiveInterval",
+    "ConnectBoxPoller",
+    "PollUpdate",
+    "PayloadRecorder",
+    "RecordedPayload",
+    "TableRow",
+    "create_websession",
+    "read_recording",
 ]
 
 import logging
@@ -0,0 +1,91 @@
+import time
+
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+from .const import (
+    DEFAULT_SNMP_CACHE_TTL,
+    HARDWARE_VERSION_OID,
+    MAC_ADDRESS_OID,
+    SERIAL_NUMBER_OID,
+    SOFTWARE_VERSION_OID,
+    STATIC_SNMP_CACHE_TTL,
+)
+
+# The identity of the router only changes with a firmware upgrade, so these values can be cached for a long time.
+DEFAULT_SNMP_CACHE_TTLS: Dict[str, timedelta] = {
+    MAC_ADDRESS_OID: STATIC_SNMP_CACHE_TTL,
+    HARDWARE_VERSION_OID: STATIC_SNMP_CACHE_TTL,
+    SOFTWARE_VERSION_OID: STATIC_SNMP_CACHE_TTL,
+    SERIAL_NUMBER_OID: STATIC_SNMP_CACHE_TTL,
+}
+
+
+class SnmpCache:
+    """Bounded cache of SNMP values with a time to live per OID.
+
+    The TTL of an OID is looked up in `ttls`, first by the OID itself and then by its parent OIDs, so a TTL can be
+    configured for a complete subtree. Other OIDs use `default_ttl`. When the cache is full the least recently used
+    value is evicted.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: timedelta = DEFAULT_SNMP_CACHE_TTL,
+        ttls: Optional[Dict[str, timedelta]] = None,
+    ):
+        self._max_size = max_size
+        self._default_ttl = default_ttl.total_seconds()
+        self._ttls = {oid: ttl.total_seconds() for oid, ttl in (DEFAULT_SNMP_CACHE_TTLS if ttls is None else ttls).items()}
+        self._values: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, oid: str) -> Optional[str]:
+        """Return the cached value of the OID, or None when it is not cached or expired."""
+        entry = self._values.get(oid)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._values[oid]
+            self.misses += 1
+            return None
+
+        self._values.move_to_end(oid)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, oid: str, value: str) -> None:
+        ttl = self.ttl_for(oid)
+        if ttl <= 0:
+            return
+
+        self._values[oid] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(oid)
+
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+    def ttl_for(self, oid: str) -> float:
+        """Return the time to live in seconds of the OID."""
+        while oid:
+            ttl = self._ttls.get(oid)
+            if ttl is not None:
+                return ttl
+            oid = oid.rpartition(".")[0]
+
+        return self._default_ttl
+
+    def invalidate(self, oid: Optional[str] = None) -> None:
+        """Remove the OID and the OIDs below it from the cache, or all values when no OID is given."""
+        if oid is None:
+            self._values.clear()
+            return
+
+        for cached_oid in [cached_oid for cached_oid in self._values if cached_oid == oid or cached_oid.startswith(oid + ".")]:
+            del self._values[cached_oid]
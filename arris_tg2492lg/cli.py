@@ -0,0 +1,340 @@
+"""The `arris-tg2492lg` command, which queries one or more routers and writes JSON Lines or CSV."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+
+from abc import ABC, abstractmethod
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from .const import POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, __version__
+from .credential_store import FileCredentialStore
+from .delta import DeviceDelta
+from .device import Device
+from .fleet import ConnectBoxFleet, FleetResult
+from .poller import ConnectBoxPoller
+
+PASSWORD_ENVIRONMENT_VARIABLE = "ARRIS_TG2492LG_PASSWORD"
+
+DEVICE_FIELDS = [
+    "host",
+    "ip",
+    "mac",
+    "hostname",
+    "adapter_type",
+    "type",
+    "lease_end",
+    "row_status",
+    "online",
+    "comment",
+    "device_name",
+]
+INFO_FIELDS = ["host", "mac_address", "hardware_version", "software_version", "serial_number"]
+SNMP_GET_FIELDS = ["host", "oid", "value", "error"]
+WATCH_FIELDS = ["time", "event"] + DEVICE_FIELDS + ["error"]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Namespace:
+    parser = ArgumentParser(prog="arris-tg2492lg", description="Query Arris TG2492LG routers.")
+    parser.add_argument("--version", action="version", version=__version__)
+    parser.add_argument(
+        "--host",
+        action="append",
+        dest="hosts",
+        default=[],
+        help="address of a router, can be repeated",
+    )
+    parser.add_argument(
+        "--hosts-file",
+        help="file with a router on every line: the address, optionally followed by its password",
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(PASSWORD_ENVIRONMENT_VARIABLE),
+        help=f"password of the routers, defaults to ${PASSWORD_ENVIRONMENT_VARIABLE}",
+    )
+    parser.add_argument(
+        "--credentials",
+        help="file in which login sessions are kept, so the next invocation doesn't have to login again",
+    )
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="output format")
+    parser.add_argument("--concurrency", type=int, default=10, help="number of routers that are queried at once")
+    parser.add_argument("--timeout", type=float, default=30.0, help="timeout of a request in seconds")
+    parser.add_argument("--verbose", action="store_true", help="log debug messages")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    devices_parser = subparsers.add_parser("devices", help="list the connected devices")
+    devices_parser.add_argument("--online", action="store_true", help="only list online devices")
+
+    subparsers.add_parser("info", help="show the router information")
+
+    snmp_get_parser = subparsers.add_parser("snmp-get", help="get the values of SNMP OIDs")
+    snmp_get_parser.add_argument("oids", nargs="+", metavar="OID")
+
+    watch_parser = subparsers.add_parser("watch", help="poll the connected devices and write the changes")
+    watch_parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=POLL_MIN_INTERVAL.total_seconds(),
+        help="seconds between polls while devices change",
+    )
+    watch_parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=POLL_MAX_INTERVAL.total_seconds(),
+        help="seconds between polls of an idle router",
+    )
+    watch_parser.add_argument("--duration", type=float, help="stop after this many seconds")
+
+    args = parser.parse_args(argv)
+
+    try:
+        args.routers = _routers(args)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    try:
+        return asyncio.run(async_main(args, sys.stdout))
+    except KeyboardInterrupt:
+        return 130
+
+
+async def async_main(args: Namespace, output: TextIO) -> int:
+    """Run the command and return the exit code, 1 when a router failed."""
+    credential_store = None if args.credentials is None else FileCredentialStore(args.credentials)
+    fleet = ConnectBoxFleet(
+        args.routers, max_concurrency=args.concurrency, timeout=args.timeout, credential_store=credential_store
+    )
+
+    async with fleet:
+        try:
+            if args.command == "devices":
+                return await _async_devices(fleet, _writer(args.format, output, DEVICE_FIELDS), args.online)
+            if args.command == "info":
+                return await _async_info(fleet, _writer(args.format, output, INFO_FIELDS))
+            if args.command == "snmp-get":
+                return await _async_snmp_get(fleet, _writer(args.format, output, SNMP_GET_FIELDS), args.oids)
+
+            return await _async_watch(fleet, _writer(args.format, output, WATCH_FIELDS), args)
+        finally:
+            # Without a credential store the session can't be reused, so it is ended for other clients of the router.
+            if credential_store is None:
+                await fleet.async_logout()
+
+
+async def _async_devices(fleet: ConnectBoxFleet, writer: _Writer, online: bool) -> int:
+    exit_code = 0
+
+    async for result in fleet.async_get_connected_devices():
+        if result.result is None:
+            exit_code = _report_error(result)
+            continue
+
+        for device in result.result:
+            if device.online or not online:
+                writer.write(_device_row(result.hostname, device))
+
+    return exit_code
+
+
+async def _async_info(fleet: ConnectBoxFleet, writer: _Writer) -> int:
+    exit_code = 0
+
+    async for result in fleet.async_poll(lambda connect_box: connect_box.async_get_router_information()):
+        if result.result is None:
+            exit_code = _report_error(result)
+            continue
+
+        writer.write(
+            {
+                "host": result.hostname,
+                "mac_address": result.result.mac_address,
+                "hardware_version": result.result.hardware_version,
+                "software_version": result.result.software_version,
+                "serial_number": result.result.serial_number,
+            }
+        )
+
+    return exit_code
+
+
+async def _async_snmp_get(fleet: ConnectBoxFleet, writer: _Writer, oids: List[str]) -> int:
+    exit_code = 0
+
+    async for result in fleet.async_poll(lambda connect_box: connect_box.async_snmp_get_many(oids)):
+        if result.result is None:
+            exit_code = _report_error(result)
+            continue
+
+        for oid in oids:
+            value = result.result.values.get(oid)
+            error = result.result.errors.get(oid)
+            writer.write({"host": result.hostname, "oid": oid, "value": value, "error": error})
+            if error is not None:
+                exit_code = 1
+
+    return exit_code
+
+
+async def _async_watch(fleet: ConnectBoxFleet, writer: _Writer, args: Namespace) -> int:
+    """Poll every router with its own ConnectBoxPoller, so every router adapts its interval.
+
+    The credential of every router is refreshed in the background, so the session is kept when the router is polled
+    less often than its session expires. The refresh is started by a successful poll and stops after a failed login,
+    so a router that is down or rejects the password is only requested by its backed off poller. Polls are limited by
+    --concurrency and --timeout like the other commands.
+
+    Every poll without changes is skipped; the first poll of a router writes all its devices as added.
+    """
+    pollers = [
+        fleet.create_poller(hostname, timedelta(seconds=args.min_interval), timedelta(seconds=args.max_interval))
+        for hostname in fleet.hostnames
+    ]
+    connect_boxes = [fleet.get_connect_box(hostname) for hostname in fleet.hostnames]
+
+    async def async_write_updates(hostname: str, poller: ConnectBoxPoller) -> None:
+        connect_box = fleet.get_connect_box(hostname)
+
+        async for update in poller.subscribe(include_unchanged=True):
+            now = datetime.now(timezone.utc).isoformat()
+
+            if update.ok:
+                connect_box.start_token_refresh(retry=False)
+
+            if update.delta is None:
+                writer.write({"time": now, "event": "error", "host": hostname, "error": repr(update.error)})
+                continue
+
+            for event, device in _events(update.delta):
+                writer.write({"time": now, "event": event, **_device_row(hostname, device)})
+
+    tasks = [asyncio.ensure_future(async_write_updates(hostname, poller)) for hostname, poller in zip(fleet.hostnames, pollers)]
+
+    try:
+        # Subscribe before the first poll, so its devices are written.
+        await asyncio.sleep(0)
+        for poller in pollers:
+            poller.start()
+
+        await asyncio.wait_for(asyncio.gather(*tasks), args.duration)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for poller in pollers:
+            await poller.async_stop()
+        for connect_box in connect_boxes:
+            await connect_box.async_stop_token_refresh()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return 0
+
+
+def _events(delta: DeviceDelta) -> List[Tuple[str, Device]]:
+    events = [("added", device) for device in delta.added]
+    events.extend(("removed", device) for device in delta.removed)
+    events.extend(("changed", change.current) for change in delta.changed)
+    return events
+
+
+def _device_row(hostname: str, device: Device) -> Dict[str, Any]:
+    lease_end = device.lease_end
+
+    return {
+        "host": hostname,
+        "ip": device.ip,
+        "mac": device.mac,
+        "hostname": device.hostname,
+        "adapter_type": _enum_name(device.adapter_type),
+        "type": _enum_name(device.type),
+        "lease_end": None if lease_end is None else lease_end.isoformat(),
+        "row_status": device.row_status,
+        "online": device.online,
+        "comment": device.comment,
+        "device_name": device.device_name,
+    }
+
+
+def _enum_name(value: Optional[Enum]) -> Optional[str]:
+    return None if value is None else value.name
+
+
+def _report_error(result: FleetResult[Any]) -> int:
+    print(f"{result.hostname}: {result.error!r}", file=sys.stderr)
+    return 1
+
+
+def _routers(args: Namespace) -> List[Tuple[str, str]]:
+    """Return the address and password of every router given by --host and --hosts-file."""
+    routers: List[Tuple[str, Optional[str]]] = [(host, args.password) for host in args.hosts]
+
+    if args.hosts_file is not None:
+        with open(args.hosts_file) as file:
+            for line in file:
+                if line.strip() and not line.lstrip().startswith("#"):
+                    host, _, host_password = line.strip().partition(" ")
+                    routers.append((host, host_password.strip() or args.password))
+
+    if not routers:
+        raise ValueError("no router given, use --host or --hosts-file")
+
+    result = []
+    for host, password in routers:
+        if password is None:
+            raise ValueError(f"no password given for {host}, use --password or ${PASSWORD_ENVIRONMENT_VARIABLE}")
+
+        result.append((host if "://" in host else f"http://{host}", password))
+
+    return result
+
+
+class _Writer(ABC):
+    """Writes rows to the output as soon as they are available."""
+
+    @abstractmethod
+    def write(self, row: Dict[str, Any]) -> None:
+        """Write a row, fields that are not in the row are empty."""
+
+
+class _JsonLinesWriter(_Writer):
+    def __init__(self, output: TextIO):
+        self._output = output
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._output.write(json.dumps(row) + "\n")
+        self._output.flush()
+
+
+class _CsvWriter(_Writer):
+    def __init__(self, output: TextIO, fields: List[str]):
+        self._output = output
+        self._writer = csv.DictWriter(output, fields)
+        self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._writer.writerow(row)
+        self._output.flush()
+
+
+def _writer(output_format: str, output: TextIO, fields: List[str]) -> _Writer:
+    if output_format == "csv":
+        return _CsvWriter(output, fields)
+
+    return _JsonLinesWriter(output)
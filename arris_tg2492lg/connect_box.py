@@ -1,45 +1,144 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import codecs
 import json
 import logging
 import random
-
-from aiohttp import ClientSession
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, List, Optional
+import time
+
+from aiohttp import ClientError, ClientResponse, ClientSession, ServerDisconnectedError
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import quote
 from yarl import URL
 
 from .const import (
     HARDWARE_VERSION_OID,
     MAC_ADDRESS_OID,
+    PARSE_EXECUTOR_THRESHOLD,
     SERIAL_NUMBER_OID,
+    SNMP_GET_MAX_CONCURRENCY,
+    SNMP_GET_MAX_URL_LENGTH,
     SOFTWARE_VERSION_OID,
+    STREAM_CHUNK_SIZE,
     TOKEN_EXPIRATION,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_REFRESH_RETRY_INTERVAL,
     USERNAME,
 )
+from .cache import SnmpCache
+from .credential_store import CredentialStore, StoredCredential
+from .delta import DeviceDelta, DeviceSnapshot
 from .device import Device
-from .exception import ConnectBoxError, InvalidCredentialError
-from .mib_mapper import format_mac, to_devices
+from .exception import InvalidCredentialError, InvalidOidError
+from .instrumentation import (
+    GET_CONN_DEVICES,
+    LOGIN,
+    LOGOUT,
+    PARSE,
+    SNMP_GET,
+    SNMP_WALK,
+    Instrumentation,
+    RequestEvent,
+)
+from .recorder import PayloadRecorder
+from .session import create_websession
+from .snmp_table import TableRow, split_table_key
+from .mib_mapper import (
+    ConnDevicesParser,
+    JsonPairReader,
+    RawRow,
+    devices_from_raw_rows,
+    format_mac,
+    to_devices,
+    to_raw_rows,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class ConnectBox:
-    def __init__(self, websession: ClientSession, hostname: str, password: str):
+    def __init__(
+        self,
+        websession: Optional[ClientSession],
+        hostname: str,
+        password: str,
+        credential_store: Optional[CredentialStore] = None,
+        snmp_cache: Optional[SnmpCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        body_logging: Optional[BodyLogging] = None,
+        parse_executor: Optional[Executor] = None,
+        parse_executor_threshold: int = PARSE_EXECUTOR_THRESHOLD,
+        recorder: Optional[PayloadRecorder] = None,
+    ):
+        """Create a client for the router at the given hostname.
+
+        Without a websession the ConnectBox creates its own session with a single persistent connection to the
+        router, see `create_websession`. Call `async_close` to close it.
+
+        When a credential store is provided the login session is shared through the store, so a new instance (e.g.
+        after a restart of the process) reuses a session that has not expired instead of logging in again.
+
+        When an SNMP cache is provided, values returned by snmpGet are cached and cached values are not requested
+        again until they expire.
+
+        Subscribe to `instrumentation` to receive the timing of every request. An Instrumentation instance can be
+        shared between ConnectBox instances.
+
+        Response bodies are only logged (at debug level) when `body_logging` is provided.
+
+        When a `parse_executor` (a ThreadPoolExecutor or ProcessPoolExecutor) is provided, getConnDevices responses of
+        at least `parse_executor_threshold` characters are parsed in the executor, so parsing a large client table
+        doesn't block the event loop. The executor returns the raw rows, which are converted to Devices in the event
+        loop. Smaller responses are parsed in the event loop, where they don't pay the cost of the executor.
+
+        When a `recorder` is provided, the getConnDevices and snmpGet responses are appended to its recording, see
+        `PayloadRecorder`.
+        """
         self._websession = websession
+        self._owns_websession = websession is None
         self._hostname = hostname
         self._password = password
         self._nonce = str(random.randrange(10000, 100000))
         self._credential: Optional[Credential] = None
+        self._credential_store = credential_store
+        self._snmp_cache = snmp_cache
+        self._instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self._body_logging = body_logging
+        self._parse_executor = parse_executor
+        self._parse_executor_threshold = parse_executor_threshold
+        self._recorder = recorder
+        self._login_task: Optional[asyncio.Future[str]] = None
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+        self._snapshot = DeviceSnapshot()
 
     async def async_login(self) -> str:
+        """Login and return the token.
+
+        Concurrent calls share a single login request, so the router never receives a second login for the same
+        session (which it could reject as a multi-login).
+        """
+        if self._login_task is None:
+            login_task = asyncio.ensure_future(self._async_login())
+            login_task.add_done_callback(self._login_done)
+            self._login_task = login_task
+
+        return await asyncio.shield(self._login_task)
+
+    async def _async_login(self) -> str:
         arg_string = f"{quote(USERNAME)}:{quote(self._password)}"
         arg = base64.b64encode(arg_string.encode("utf-8")).decode("ascii")
 
-        async with self._websession.get(f"{self._hostname}/login?arg={arg}&_n={self._nonce}") as response:
+        start = time.perf_counter()
+        async with self._async_get(f"{self._hostname}/login?arg={arg}&_n={self._nonce}") as response:
+            if self._instrumentation.enabled:
+                self._emit(LOGIN, start, response.status)
+
             response.raise_for_status()
 
             token = await response.text()
@@ -49,18 +148,46 @@ class ConnectBox:
             self._credential = Credential(token)
             self._credential.validate()
 
+            if self._credential_store is not None:
+                self._credential_store.save(self._hostname, StoredCredential(token, self._credential.created_at, self._nonce))
+
             return token
 
+    def start_token_refresh(self, margin: timedelta = TOKEN_REFRESH_MARGIN, retry: bool = True) -> None:
+        """Refresh the credential in the background, `margin` before it expires.
+
+        Requests then never have to wait for a login. The refresh is stopped by `async_stop_token_refresh` or
+        `async_logout`. A failed login is retried every `TOKEN_REFRESH_RETRY_INTERVAL`; without `retry` the refresh
+        stops instead, until it is started again.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._async_refresh_credential(margin, retry))
+
+    async def async_stop_token_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
     async def async_logout(self) -> None:
+        await self.async_stop_token_refresh()
+
         credential = await self._async_get_credential()
 
         params = {"_n": self._nonce}
         cookies = {"credential": credential.token}
 
-        async with self._websession.get(f"{self._hostname}/logout", params=params, cookies=cookies) as response:
+        start = time.perf_counter()
+        async with self._async_get(f"{self._hostname}/logout", params=params, cookies=cookies) as response:
+            if self._instrumentation.enabled:
+                self._emit(LOGOUT, start, response.status, credential=credential)
+
             if response.status != 500:
                 response.raise_for_status()
-            self._credential = None
+            self._invalidate_credential(credential)
 
     async def async_get_connected_devices(self, retry_on_unauthorized: bool = True) -> List[Device]:
         """Get all connected devices.
@@ -68,22 +195,84 @@ class ConnectBox:
         A device is returned for every IP address. When a device has both a IPv4 and a IPv6 address it will appear
         twice in the returned list.
         """
+        response_text = await self._async_get_conn_devices(retry_on_unauthorized)
+
+        start = time.perf_counter()
+        if self._use_parse_executor(response_text):
+            devices = devices_from_raw_rows(await self._async_to_raw_rows(response_text))
+        else:
+            devices = to_devices(response_text)
+
+        if self._instrumentation.enabled:
+            self._emit(PARSE, start)
+
+        return devices
+
+    async def async_get_connected_devices_delta(self, retry_on_unauthorized: bool = True) -> DeviceDelta:
+        """Get the devices that were added, removed or changed since the previous call.
+
+        Devices are identified by their MAC address and IP address. The first call returns all devices as added.
+        Unchanged rows are detected on the raw values of the response, no Device is created for them.
+        """
+        response_text = await self._async_get_conn_devices(retry_on_unauthorized)
+
+        start = time.perf_counter()
+        delta = self._snapshot.update(await self._async_to_raw_rows(response_text))
+
+        if self._instrumentation.enabled:
+            self._emit(PARSE, start)
+
+        return delta
+
+    async def async_iter_connected_devices(self, retry_on_unauthorized: bool = True) -> AsyncIterator[Device]:
+        """Iterate over all connected devices while the response is being received.
+
+        The response is parsed in chunks and every device is yielded as soon as all its rows are received. This keeps
+        memory usage flat for large client tables. Like `async_get_connected_devices` a device is yielded for every IP
+        address.
+        """
+        async for device in self._async_iter_conn_devices(retry_on_unauthorized, is_retry=False):
+            yield device
+
+    async def _async_iter_conn_devices(self, retry_on_unauthorized: bool, is_retry: bool) -> AsyncIterator[Device]:
         credential = await self._async_get_credential()
 
         params = {"_n": self._nonce}
         cookies = {"credential": credential.token}
-        async with self._websession.get(f"{self._hostname}/getConnDevices", params=params, cookies=cookies) as response:
-            if retry_on_unauthorized is True and response.status == 401:
-                self._credential = None
-                return await self.async_get_connected_devices(False)
+        start = time.perf_counter()
+        async with self._async_get(f"{self._hostname}/getConnDevices", params=params, cookies=cookies) as response:
+            unauthorized = response.status == 401
+            response_bytes = 0
 
-            response.raise_for_status()
+            if not (retry_on_unauthorized is True and unauthorized):
+                response.raise_for_status()
 
-            response_text = await response.text()
+                parser = ConnDevicesParser()
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")()
+                recorded: List[str] = []
+
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    response_bytes += len(chunk)
+                    text = decoder.decode(chunk)
+                    if self._recorder is not None:
+                        recorded.append(text)
+                    for device in parser.feed(text):
+                        yield device
 
-            _LOGGER.debug("getConnDevices response: %s", response_text)
+                text = decoder.decode(b"", final=True)
+                if self._recorder is not None:
+                    self._recorder.record(GET_CONN_DEVICES, "", "".join(recorded) + text)
 
-            return to_devices(response_text)
+                for device in parser.feed(text) + parser.close():
+                    yield device
+
+            if self._instrumentation.enabled:
+                self._emit(GET_CONN_DEVICES, start, response.status, response_bytes, is_retry, credential)
+
+        if retry_on_unauthorized is True and unauthorized:
+            self._invalidate_credential(credential)
+            async for device in self._async_iter_conn_devices(False, is_retry=True):
+                yield device
 
     async def async_get_router_information(self) -> RouterInformation:
         oids = [
@@ -103,13 +292,326 @@ class ConnectBox:
         )
         return router_information
 
+    async def async_snmp_get_many(
+        self,
+        oids: Iterable[str],
+        max_url_length: int = SNMP_GET_MAX_URL_LENGTH,
+        max_concurrency: int = SNMP_GET_MAX_CONCURRENCY,
+        use_cache: bool = True,
+    ) -> SnmpGetResult:
+        """Get the values of many OIDs.
+
+        The OIDs are split in chunks that fit in a URL of `max_url_length` characters and the chunks are requested
+        concurrently. An invalid OID fails only itself: a chunk that is rejected with "Error in OID formatting!" is
+        split until the invalid OIDs are found, which are reported in the errors of the result. Connection errors are
+        reported for the OIDs of the chunk as well; other errors, like an `InvalidCredentialError`, are raised.
+
+        Without `use_cache` the SNMP cache is neither read nor updated, e.g. for counters that change all the time.
+        """
+        oids = list(dict.fromkeys(oids))
+        result = SnmpGetResult()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def async_get_chunk(chunk: List[str]) -> None:
+            try:
+                async with semaphore:
+                    if use_cache:
+                        values = await self._async_snmp_get(chunk)
+                    else:
+                        values = await self._async_snmp_get_uncached(chunk)
+            except InvalidOidError as exc:
+                if len(chunk) == 1:
+                    result.errors[chunk[0]] = str(exc)
+                    return
+
+                middle = len(chunk) // 2
+                await asyncio.gather(async_get_chunk(chunk[:middle]), async_get_chunk(chunk[middle:]))
+                return
+            except (ClientError, asyncio.TimeoutError) as exc:
+                result.errors.update((oid, repr(exc)) for oid in chunk)
+                return
+
+            result.values.update(values)
+
+            for oid in chunk:
+                if oid not in values:
+                    result.errors[oid] = "No value returned"
+
+        url_length = len(f"{self._hostname}/snmpGet?oids=&_n={self._nonce}")
+        await asyncio.gather(*(async_get_chunk(chunk) for chunk in _chunk_oids(oids, max_url_length - url_length)))
+
+        return result
+
+    async def async_walk_table(self, entry_oid: str, columns: Optional[Iterable[int]] = None) -> AsyncIterator[TableRow]:
+        """Iterate over the rows of an SNMP table, e.g. `ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID`.
+
+        Without columns the complete table entry is walked. With columns only those columns are walked and
+        downloaded. The router returns a table column by column, so a row is only complete after the last column is
+        received. When a single column is requested, rows are yielded while the response is being received.
+        """
+        if columns is None:
+            walk_oids = [entry_oid]
+        else:
+            walk_oids = [f"{entry_oid}.{column}" for column in columns]
+
+        single_column = columns is not None and len(walk_oids) == 1
+        rows: Dict[str, Dict[int, str]] = {}
+
+        for walk_oid in walk_oids:
+            async for key, value in self._async_iter_snmp_walk(walk_oid):
+                column_and_index = split_table_key(entry_oid, key)
+                if column_and_index is None:
+                    continue
+
+                column, index = column_and_index
+
+                if single_column:
+                    yield TableRow(index, {column: value})
+                else:
+                    rows.setdefault(index, {})[column] = value
+
+        for index, values in rows.items():
+            yield TableRow(index, values)
+
+    async def async_close(self) -> None:
+        """Stop the token refresh and close the websession, when it was created by the ConnectBox."""
+        await self.async_stop_token_refresh()
+
+        if self._owns_websession and self._websession is not None:
+            await self._websession.close()
+            self._websession = None
+
+    async def __aenter__(self) -> ConnectBox:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.async_close()
+
+    @asynccontextmanager
+    async def _async_get(self, url: Union[str, URL], **kwargs: Any) -> AsyncIterator[ClientResponse]:
+        """Send a GET request to the router.
+
+        The router closes idle connections. When it closed the connection the request was sent on before a response
+        was received, the request is sent again on a new connection.
+        """
+        if self._websession is None:
+            self._websession = create_websession()
+
+        try:
+            response = await self._websession.get(url, **kwargs)
+        except ServerDisconnectedError:
+            _LOGGER.debug("Router %s closed the connection, sending the request again", self._hostname)
+            response = await self._websession.get(url, **kwargs)
+
+        async with response:
+            yield response
+
+    def _use_parse_executor(self, response_text: str) -> bool:
+        return self._parse_executor is not None and len(response_text) >= self._parse_executor_threshold
+
+    async def _async_to_raw_rows(self, response_text: str) -> List[Tuple[str, RawRow]]:
+        if not self._use_parse_executor(response_text):
+            return to_raw_rows(response_text)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor, to_raw_rows, response_text)
+
+    async def _async_get_conn_devices(self, retry_on_unauthorized: bool, is_retry: bool = False) -> str:
+        credential = await self._async_get_credential()
+
+        params = {"_n": self._nonce}
+        cookies = {"credential": credential.token}
+        start = time.perf_counter()
+        async with self._async_get(f"{self._hostname}/getConnDevices", params=params, cookies=cookies) as response:
+            if retry_on_unauthorized is True and response.status == 401:
+                if self._instrumentation.enabled:
+                    self._emit(GET_CONN_DEVICES, start, response.status, 0, is_retry, credential)
+
+                self._invalidate_credential(credential)
+                return await self._async_get_conn_devices(False, is_retry=True)
+
+            response.raise_for_status()
+
+            response_text = await response.text()
+
+            if self._instrumentation.enabled:
+                self._emit(GET_CONN_DEVICES, start, response.status, len(response_text.encode()), is_retry, credential)
+
+            if self._body_logging is not None:
+                self._log_body(GET_CONN_DEVICES, response_text)
+            if self._recorder is not None:
+                self._recorder.record(GET_CONN_DEVICES, "", response_text)
+
+            return response_text
+
     async def _async_get_credential(self) -> Credential:
+        if self._credential is None and self._credential_store is not None:
+            self._load_stored_credential()
+
         if self._credential is None or self._credential.is_expired():
+            # Joins the login that is in progress, if any.
             await self.async_login()
 
         return self._credential  # type: ignore
 
+    async def _async_refresh_credential(self, margin: timedelta, retry: bool) -> None:
+        while True:
+            credential = self._credential
+
+            if credential is not None:
+                delay = (credential.expires_at - margin - datetime.now()).total_seconds()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+            try:
+                _LOGGER.debug("Refreshing credential for router %s", self._hostname)
+                await self.async_login()
+            except Exception as exc:
+                _LOGGER.warning("Failed to refresh credential for router %s: %s", self._hostname, exc)
+                if not retry:
+                    return
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_INTERVAL.total_seconds())
+
+    def _login_done(self, login_task: asyncio.Future[str]) -> None:
+        if self._login_task is login_task:
+            self._login_task = None
+
+    def _load_stored_credential(self) -> None:
+        stored_credential = self._credential_store.load(self._hostname)  # type: ignore
+
+        if stored_credential is None:
+            return
+
+        credential = Credential(stored_credential.token, stored_credential.created_at)
+
+        if not credential.is_expired():
+            _LOGGER.debug("Reusing stored credential for router %s", self._hostname)
+            self._credential = credential
+            self._nonce = stored_credential.nonce
+
+    def _invalidate_credential(self, credential: Credential) -> None:
+        """Forget the credential after the router rejected it.
+
+        Concurrent requests that were rejected with the same credential only invalidate it once, so they all share the
+        next login.
+        """
+        if self._credential is not credential:
+            return
+
+        self._credential = None
+
+        if self._credential_store is not None:
+            self._credential_store.delete(self._hostname)
+
+    async def _async_iter_snmp_walk(self, oid: str) -> AsyncIterator[Tuple[str, str]]:
+        credential = await self._async_get_credential()
+
+        # Manually create url like `_async_snmp_get`.
+        url = f"{self._hostname}/walk?oids={oid}&_n={self._nonce}"
+        cookies = {"credential": credential.token}
+
+        _LOGGER.debug("Walk SNMP table %s for router %s", oid, self._hostname)
+        start = time.perf_counter()
+        async with self._async_get(URL(url), cookies=cookies) as response:
+            response.raise_for_status()
+
+            reader = JsonPairReader()
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")()
+            first_text = ""
+            response_bytes = 0
+
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                response_bytes += len(chunk)
+                text = decoder.decode(chunk)
+
+                # Response starts with "Error in OID formatting!" when an invalid OID is requested.
+                if len(first_text) < 5:
+                    first_text += text
+                    if first_text.lstrip().startswith("Error"):
+                        raise InvalidOidError(first_text + (await response.text()))
+
+                for pair in reader.feed(text):
+                    yield pair
+
+            for pair in reader.feed(decoder.decode(b"", final=True)) + reader.close():
+                yield pair
+
+            if self._instrumentation.enabled:
+                self._emit(SNMP_WALK, start, response.status, response_bytes, credential=credential)
+
+    @property
+    def logged_in(self) -> bool:
+        """Whether the ConnectBox holds a credential that has not expired."""
+        return self._credential is not None and not self._credential.is_expired()
+
+    @property
+    def snmp_cache(self) -> Optional[SnmpCache]:
+        return self._snmp_cache
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self._instrumentation
+
+    def _log_body(self, operation: str, body: str) -> None:
+        body_logging = self._body_logging
+
+        if body_logging is None or not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        if body_logging.sample_rate < 1 and random.random() >= body_logging.sample_rate:
+            return
+
+        if len(body) > body_logging.max_length:
+            _LOGGER.debug(
+                "%s response (%d of %d characters): %s...",
+                operation,
+                body_logging.max_length,
+                len(body),
+                body[: body_logging.max_length],
+            )
+        else:
+            _LOGGER.debug("%s response: %s", operation, body)
+
+    def _emit(
+        self,
+        operation: str,
+        start: float,
+        status: Optional[int] = None,
+        response_bytes: int = 0,
+        retry: bool = False,
+        credential: Optional[Credential] = None,
+    ) -> None:
+        token_age = None if credential is None else (datetime.now() - credential.created_at).total_seconds()
+
+        self._instrumentation.emit(
+            RequestEvent(self._hostname, operation, time.perf_counter() - start, status, response_bytes, retry, token_age)
+        )
+
     async def _async_snmp_get(self, oids: List[str]) -> Any:
+        if self._snmp_cache is None:
+            return await self._async_snmp_get_uncached(oids)
+
+        result = {}
+        missing_oids = []
+
+        for oid in oids:
+            value = self._snmp_cache.get(oid)
+            if value is None:
+                missing_oids.append(oid)
+            else:
+                result[oid] = value
+
+        if missing_oids:
+            values = await self._async_snmp_get_uncached(missing_oids)
+
+            for oid, value in values.items():
+                self._snmp_cache.set(oid, value)
+            result.update(values)
+
+        return result
+
+    async def _async_snmp_get_uncached(self, oids: List[str]) -> Any:
         credential = await self._async_get_credential()
 
         # Manually create url because otherwise the semicolons are url encoded.
@@ -118,28 +620,58 @@ class ConnectBox:
         cookies = {"credential": credential.token}
 
         _LOGGER.debug("Get SNMP query %s results for router %s", oids, self._hostname)
-        async with self._websession.get(URL(url), cookies=cookies) as response:
+        start = time.perf_counter()
+        async with self._async_get(URL(url), cookies=cookies) as response:
             response.raise_for_status()
 
             data = await response.text()
 
+            if self._instrumentation.enabled:
+                self._emit(SNMP_GET, start, response.status, len(data.encode()), credential=credential)
+            if self._recorder is not None:
+                self._recorder.record(SNMP_GET, oids_joined, data)
+
             # Response starts with "Error in OID formatting!" when an invalid OID is requested.
             if data.startswith("Error"):
-                raise ConnectBoxError(data)
+                raise InvalidOidError(data)
 
-            _LOGGER.debug("snmpGet response: %s", data)
+            if self._body_logging is not None:
+                self._log_body(SNMP_GET, data)
 
             return json.loads(data)
 
 
+def _chunk_oids(oids: List[str], max_length: int) -> List[List[str]]:
+    """Split the OIDs in chunks of which the semicolon separated length does not exceed max_length."""
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    length = 0
+
+    for oid in oids:
+        oid_length = len(oid) + (1 if chunk else 0)
+
+        if chunk and length + oid_length > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = 0
+            oid_length = len(oid)
+
+        chunk.append(oid)
+        length += oid_length
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
 class Credential:
-    def __init__(self, token: str):
+    def __init__(self, token: str, created_at: Optional[datetime] = None):
         self._token = token
-        self._created_at = datetime.now()
+        self._created_at = created_at if created_at is not None else datetime.now()
 
     def is_expired(self) -> bool:
-        expires = self._created_at + TOKEN_EXPIRATION
-        return datetime.now() > expires
+        return datetime.now() > self.expires_at
 
     def validate(self) -> None:
         try:
@@ -158,6 +690,14 @@ class Credential:
     def token(self) -> str:
         return self._token
 
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @property
+    def expires_at(self) -> datetime:
+        return self._created_at + TOKEN_EXPIRATION
+
     def _is_logged_in(self) -> int:
         """Return if the user is already logged in.
 
@@ -193,3 +733,21 @@ class RouterInformation:
     hardware_version: str
     software_version: str
     serial_number: str
+
+
+@dataclass
+class BodyLogging:
+    """Logging of response bodies at debug level.
+
+    Bodies longer than `max_length` characters are truncated. With a `sample_rate` below 1 only that fraction of the
+    responses is logged.
+    """
+
+    max_length: int = 1000
+    sample_rate: float = 1.0
+
+
+@dataclass
+class SnmpGetResult:
+    values: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
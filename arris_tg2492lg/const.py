@@ -2,9 +2,49 @@ __version__ = "2.2.0"
 
 from datetime import timedelta
 
-
 USERNAME = "admin"
 TOKEN_EXPIRATION = timedelta(minutes=5)
+TOKEN_REFRESH_MARGIN = timedelta(seconds=30)
+TOKEN_REFRESH_RETRY_INTERVAL = timedelta(seconds=10)
+
+# Number of bytes that are read at once when a response is streamed.
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Connection settings of the sessions that are created by ConnectBox and ConnectBoxFleet. Idle connections are closed
+# before the router closes them, so a request is rarely sent on a connection that the router is closing. A few
+# connections per router allow a request while a response is streamed and concurrent snmpGet requests. A response
+# fails when no data is received for READ_TIMEOUT, so a long streamed response isn't cut off.
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT = timedelta(seconds=10)
+CONNECT_TIMEOUT = timedelta(seconds=10)
+READ_TIMEOUT = timedelta(seconds=60)
+DNS_CACHE_TTL = timedelta(minutes=5)
+
+# Intervals of ConnectBoxPoller.
+POLL_MIN_INTERVAL = timedelta(seconds=10)
+POLL_MAX_INTERVAL = timedelta(minutes=5)
+POLL_MAX_BACKOFF = timedelta(minutes=10)
+
+# Responses of at least this many characters are parsed in the parse executor of ConnectBox, when it has one.
+PARSE_EXECUTOR_THRESHOLD = 256 * 1024
+
+# Maximum length of a snmpGet URL and the number of snmpGet requests that are sent at once by async_snmp_get_many.
+SNMP_GET_MAX_URL_LENGTH = 2000
+SNMP_GET_MAX_CONCURRENCY = 4
+
+# Polls further apart than this are not connected in the PresenceHistory, the state in between is unknown.
+HISTORY_MAX_GAP = timedelta(minutes=10)
+
+# The open interval of a device that is no longer returned by the router is closed after this long, so devices that
+# left for good are no longer updated by every poll and their history can be pruned.
+HISTORY_MAX_ABSENCE = timedelta(days=1)
+
+# Number of samples that MetricsCollector keeps per router.
+METRICS_HISTORY = 360
+
+# Time to live of cached SNMP values, see SnmpCache.
+DEFAULT_SNMP_CACHE_TTL = timedelta(seconds=10)
+STATIC_SNMP_CACHE_TTL = timedelta(hours=24)
 
 # For an overview of all Arris OIDs see: https://mibs.observium.org/mib/ARRIS-ROUTER-DEVICE-MIB/#
 ARRIS_ROUTER_MIB = "1.3.6.1.4.1.4115.1.20.1"
@@ -26,3 +66,13 @@ CLIENT_ROW_STATUS_OID = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".13"
 CLIENT_ONLINE_OID = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".14"
 CLIENT_COMMENT_OID = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".15"
 CLIENT_DEVICE_NAME_OID = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".20"
+
+# Statistics of the cable modem, see IF-MIB (RFC 2863) and DOCS-IF-MIB (RFC 4546). On a cable modem interface 1 is the
+# LAN (CPE) interface, 2 the cable MAC interface, 3 the (primary) downstream and 4 the (primary) upstream channel.
+SYS_UPTIME_OID = "1.3.6.1.2.1.1.3.0"
+IF_HC_IN_OCTETS_OID = "1.3.6.1.2.1.31.1.1.1.6"
+IF_HC_OUT_OCTETS_OID = "1.3.6.1.2.1.31.1.1.1.10"
+IF_IN_ERRORS_OID = "1.3.6.1.2.1.2.2.1.14"
+DOCS_IF_DOWN_CHANNEL_POWER_OID = "1.3.6.1.2.1.10.127.1.1.1.1.6"
+DOCS_IF_SIG_Q_SIGNAL_NOISE_OID = "1.3.6.1.2.1.10.127.1.1.4.1.5"
+DOCS_IF_CM_STATUS_TX_POWER_OID = "1.3.6.1.2.1.10.127.1.2.2.1.3"
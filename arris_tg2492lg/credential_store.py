@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+if sys.platform != "win32":
+    import fcntl
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredCredential:
+    """A login session of a router that can be reused by another ConnectBox instance."""
+
+    token: str
+    created_at: datetime
+    nonce: str
+
+
+class CredentialStore(ABC):
+    """Keeps the login session of routers, keyed by hostname."""
+
+    @abstractmethod
+    def load(self, hostname: str) -> Optional[StoredCredential]:
+        """Return the stored credential of the router, if any."""
+
+    @abstractmethod
+    def save(self, hostname: str, credential: StoredCredential) -> None:
+        """Store the credential of the router, replacing a previously stored credential."""
+
+    @abstractmethod
+    def delete(self, hostname: str) -> None:
+        """Remove the stored credential of the router."""
+
+
+class MemoryCredentialStore(CredentialStore):
+    """Keeps credentials for the lifetime of the process, e.g. to share them between ConnectBox instances."""
+
+    def __init__(self) -> None:
+        self._credentials: Dict[str, StoredCredential] = {}
+
+    def load(self, hostname: str) -> Optional[StoredCredential]:
+        return self._credentials.get(hostname)
+
+    def save(self, hostname: str, credential: StoredCredential) -> None:
+        self._credentials[hostname] = credential
+
+    def delete(self, hostname: str) -> None:
+        self._credentials.pop(hostname, None)
+
+
+class FileCredentialStore(CredentialStore):
+    """Keeps credentials in a JSON file, so they survive a restart of the process.
+
+    The file is replaced atomically on every change and access is serialized between processes with an exclusive
+    lock on a separate lock file. Locking is not available on Windows.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike[str]]):
+        self._path = Path(path)
+        self._lock_path = self._path.with_name(self._path.name + ".lock")
+
+    def load(self, hostname: str) -> Optional[StoredCredential]:
+        with self._lock():
+            credential = self._read().get(hostname)
+
+        if credential is None:
+            return None
+
+        try:
+            return StoredCredential(credential["token"], datetime.fromisoformat(credential["created_at"]), credential["nonce"])
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid stored credential for router %s", hostname)
+            return None
+
+    def save(self, hostname: str, credential: StoredCredential) -> None:
+        with self._lock():
+            credentials = self._read()
+            credentials[hostname] = {
+                "token": credential.token,
+                "created_at": credential.created_at.isoformat(),
+                "nonce": credential.nonce,
+            }
+            self._write(credentials)
+
+    def delete(self, hostname: str) -> None:
+        with self._lock():
+            credentials = self._read()
+            if credentials.pop(hostname, None) is not None:
+                self._write(credentials)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if sys.platform == "win32":
+            yield
+            return
+
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            credentials = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            _LOGGER.warning("Ignoring invalid credential file %s", self._path)
+            return {}
+
+        return credentials if isinstance(credentials, dict) else {}
+
+    def _write(self, credentials: Dict[str, Any]) -> None:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self._path.parent, prefix=self._path.name + ".")
+
+        try:
+            # The file contains session tokens, so it is only readable by the owner (mkstemp creates it with 0600).
+            with os.fdopen(file_descriptor, "w") as temporary_file:
+                json.dump(credentials, temporary_file)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+
+            os.replace(temporary_path, self._path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
@@ -0,0 +1,128 @@
+"""Conversion of SNMP DateAndTime values, which the router returns as a "$" followed by the hexadecimal octets.
+
+A DateAndTime value has 8 octets (year in two octets, month, day, hour, minutes, seconds and deci-seconds),
+optionally followed by 3 octets with the offset from UTC: the direction ("+" or "-"), hours and minutes.
+"""
+
+import re
+import struct
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+_DATE_PATTERN = re.compile(r"\$[0-9A-Fa-f]+")
+_DATE_AND_OFFSET_PATTERN = re.compile(r"\$(?:[0-9A-Fa-f]{16}|[0-9A-Fa-f]{22})")
+
+# Patterns that validate many values at once, joined by newlines.
+_DATE_LIST_PATTERN = re.compile(r"(?:\$[0-9A-Fa-f]{16}\n)+")
+_DATE_AND_OFFSET_LIST_PATTERN = re.compile(r"(?:\$(?:[0-9A-Fa-f]{16}|[0-9A-Fa-f]{22})\n)+")
+
+_DATE_STRUCT = struct.Struct(">HBBBBBB")
+_OFFSET_STRUCT = struct.Struct(">cBB")
+_TWO_DIGITS = ["%02d" % number for number in range(256)]
+
+
+def format_date(value: str) -> str:
+    if not _DATE_PATTERN.fullmatch(value):
+        raise ValueError(f"Received invalid date value: {value}")
+
+    hex_array = bytes.fromhex(value[1:])
+
+    years = hex_array[0] * 256 + hex_array[1]
+    months = hex_array[2]
+    days = hex_array[3]
+
+    hours = hex_array[4]
+    minutes = hex_array[5]
+    seconds = hex_array[6]
+    micro_seconds = hex_array[7]
+
+    date = "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}:{:02d}".format(
+        years, months, days, hours, minutes, seconds, micro_seconds
+    )
+    return date
+
+
+def format_dates(values: List[str]) -> List[str]:
+    """Convert many DateAndTime values like `format_date`, raising the same error for the first invalid value.
+
+    All values are decoded with a single `bytes.fromhex` call. When a value is not exactly 8 octets, the values are
+    converted one by one.
+    """
+    if not values:
+        return []
+
+    joined = "\n".join(values) + "\n"
+
+    # A value that contains a newline changes the length, so it can't be mistaken for two valid values.
+    if len(joined) != 18 * len(values) or not _DATE_LIST_PATTERN.fullmatch(joined):
+        return [format_date(value) for value in values]
+
+    # fromhex skips the newlines between the values.
+    octets = bytes.fromhex(joined.replace("$", ""))
+    two_digits = _TWO_DIGITS
+
+    return [
+        f"{years:04d}-{two_digits[months]}-{two_digits[days]} "
+        f"{two_digits[hours]}:{two_digits[minutes]}:{two_digits[seconds]}:{two_digits[micro_seconds]}"
+        for years, months, days, hours, minutes, seconds, micro_seconds in _DATE_STRUCT.iter_unpack(octets)
+    ]
+
+
+def validate_date(value: str) -> None:
+    """Raise the error `format_date` raises for an invalid value, without decoding a valid value."""
+    if not _DATE_AND_OFFSET_PATTERN.fullmatch(value):
+        format_date(value)
+
+
+def validate_dates(values: List[str]) -> None:
+    """Raise the error `format_date` raises for the first invalid value, without decoding the valid values."""
+    if not values:
+        return
+
+    joined = "\n".join(values) + "\n"
+
+    if joined.count("\n") != len(values) or not _DATE_AND_OFFSET_LIST_PATTERN.fullmatch(joined):
+        for value in values:
+            format_date(value)
+
+
+def decode_date_and_time(value: str) -> Optional[datetime]:
+    """Convert a DateAndTime value to a datetime.
+
+    The datetime is timezone aware when the value contains the offset from UTC. A value with only zeros, which the
+    router returns for clients without a lease, is converted to None.
+    """
+    octets = bytes.fromhex(value[1:])
+
+    if len(octets) < 8:
+        raise ValueError(f"Received invalid date value: {value}")
+
+    years, months, days, hours, minutes, seconds, deci_seconds = _DATE_STRUCT.unpack_from(octets)
+
+    if years == months == days == 0:
+        return None
+
+    try:
+        tzinfo: Optional[timezone] = None
+
+        if len(octets) >= 11:
+            direction, offset_hours, offset_minutes = _OFFSET_STRUCT.unpack_from(octets, 8)
+            offset = timedelta(hours=offset_hours, minutes=offset_minutes)
+            tzinfo = timezone(-offset if direction == b"-" else offset)
+
+        return datetime(years, months, days, hours, minutes, seconds, deci_seconds * 100000, tzinfo)
+    except ValueError as exc:
+        raise ValueError(f"Received invalid date value: {value}") from exc
+
+
+def decode_lease_end(value: str) -> Optional[datetime]:
+    """Convert a DateAndTime value like `decode_date_and_time`, but return None for an invalid value.
+
+    The parser only checks the shape of a value, so a date with e.g. month 13 is only found when it is decoded. Like a
+    client without a lease, such a lease end is unknown; `format_date` still formats the raw value.
+    """
+    try:
+        return decode_date_and_time(value)
+    except ValueError:
+        return None
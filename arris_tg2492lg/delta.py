@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .device import Device
+from .mib_mapper import RawRow, device_from_raw_row
+
+# Position of the MAC address in a raw row, see `mib_mapper.CLIENT_COLUMN_OIDS`.
+_MAC_POSITION = 1
+
+
+@dataclass
+class DeviceChange:
+    """A device of which one or more attributes changed between two polls."""
+
+    previous: Device
+    current: Device
+
+    @property
+    def online_changed(self) -> bool:
+        return self.previous.online != self.current.online
+
+
+@dataclass
+class DeviceDelta:
+    """The differences between two polls of the connected devices."""
+
+    added: List[Device] = field(default_factory=list)
+    removed: List[Device] = field(default_factory=list)
+    changed: List[DeviceChange] = field(default_factory=list)
+
+    @property
+    def came_online(self) -> List[Device]:
+        """Changed devices that were offline and are online now."""
+        return [change.current for change in self.changed if change.online_changed and change.current.online]
+
+    @property
+    def went_offline(self) -> List[Device]:
+        """Changed devices that were online and are offline now."""
+        return [change.current for change in self.changed if change.online_changed and not change.current.online]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class DeviceSnapshot:
+    """The connected devices of the last poll, keyed by MAC address and IP address.
+
+    The raw values of every row are kept next to the Device. Rows with the same raw values as the previous poll are
+    skipped before a Device is created for them.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[Tuple[Optional[str], str], Tuple[RawRow, Device]] = {}
+
+    @property
+    def devices(self) -> List[Device]:
+        return [device for _, device in self._rows.values()]
+
+    def update(self, raw_rows: Iterable[Tuple[str, RawRow]]) -> DeviceDelta:
+        """Replace the snapshot by the given rows and return the differences with the previous rows."""
+        delta = DeviceDelta()
+        previous_rows = self._rows
+        rows: Dict[Tuple[Optional[str], str], Tuple[RawRow, Device]] = {}
+
+        for ip, raw_row in raw_rows:
+            key = (raw_row[_MAC_POSITION], ip)
+            previous = previous_rows.get(key)
+
+            if previous is None:
+                device = device_from_raw_row(ip, raw_row)
+                delta.added.append(device)
+            elif previous[0] == raw_row:
+                device = previous[1]
+            else:
+                device = device_from_raw_row(ip, raw_row)
+                delta.changed.append(DeviceChange(previous[1], device))
+
+            rows[key] = (raw_row, device)
+
+        delta.removed.extend(device for key, (_, device) in previous_rows.items() if key not in rows)
+        self._rows = rows
+
+        return delta
+
+    def clear(self) -> None:
+        self._rows = {}
@@ -1,24 +1,127 @@
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+
+from .date_and_time import decode_lease_end, format_date
 
 
 class Device:
+    """A connected device, one instance is created for every IP address of the device.
+
+    Devices are compared and hashed by the values of all their attributes. To keep the hash stable, only frozen Devices
+    can be hashed and setting an attribute of a frozen Device raises an AttributeError. The Devices returned by this
+    package are frozen once they are complete; a Device created directly is frozen with `freeze`.
+
+    The lease end is kept as the raw SNMP DateAndTime value in `raw_lease_end` and only decoded when `lease_end` is
+    read.
+    """
+
+    __slots__ = (
+        "ip",
+        "hostname",
+        "mac",
+        "adapter_type",
+        "type",
+        "raw_lease_end",
+        "row_status",
+        "online",
+        "comment",
+        "device_name",
+        "_lease_end",
+    )
+
     def __init__(self, ip: str) -> None:
         self.ip = ip
         self.hostname: Optional[str] = None
         self.mac: Optional[str] = None
         self.adapter_type: Optional[LanClientAdapterType] = None
         self.type: Optional[LanClientType] = None
-        self.lease_end: Optional[str] = None
+        self.raw_lease_end: Optional[str] = None
         self.row_status: Optional[str] = None
         self.online: Optional[bool] = None
         self.comment: Optional[str] = None
         self.device_name: Optional[str] = None
+        self._lease_end: Optional[Tuple[str, Optional[datetime]]] = None
+
+    @property
+    def lease_end(self) -> Optional[datetime]:
+        """The end of the DHCP lease, None for clients without a lease or when the router returned an invalid date.
+
+        The datetime is timezone aware when the router includes the offset from UTC.
+        """
+        raw_lease_end = self.raw_lease_end
+        if raw_lease_end is None:
+            return None
+
+        cached = self._lease_end
+        if cached is None or cached[0] is not raw_lease_end:
+            cached = self._lease_end = (raw_lease_end, decode_lease_end(raw_lease_end))
+
+        return cached[1]
+
+    @property
+    def lease_end_string(self) -> Optional[str]:
+        """The end of the DHCP lease formatted like "2019-11-03 16:51:04:00", as `lease_end` was before."""
+        return None if self.raw_lease_end is None else format_date(self.raw_lease_end)
+
+    def freeze(self) -> None:
+        """Make the Device immutable, so it can be hashed."""
+        # Switching the class keeps setting the attributes of a Device that is being built as fast as without freezing.
+        self.__class__ = _FrozenDevice
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Return the values of all public attributes, in the order of `__slots__`."""
+        return (
+            self.ip,
+            self.hostname,
+            self.mac,
+            self.adapter_type,
+            self.type,
+            self.raw_lease_end,
+            self.row_status,
+            self.online,
+            self.comment,
+            self.device_name,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Device):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        raise TypeError("unhashable Device, it must be frozen first")
+
+    def __setstate__(self, state: Tuple[None, Dict[str, Any]]) -> None:
+        # Copies and unpickled Devices are restored without calling __setattr__, which a frozen Device does not allow.
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return "Device(%s)" % ", ".join("%s=%r" % (name, value) for name, value in zip(Device.__slots__, self.as_tuple()))
 
     def __str__(self) -> str:
         return "ip: %s, hostname: %s" % (self.ip, self.hostname)
 
 
+class _FrozenDevice(Device):
+    """A Device after `Device.freeze`."""
+
+    __slots__ = ()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # The cache of the decoded lease end is filled when the lease end is read.
+        if name != "_lease_end":
+            raise AttributeError("cannot set %s of a frozen Device" % name)
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("cannot delete %s of a frozen Device" % name)
+
+
 class LanClientAdapterType(Enum):
     """The type of the adapter."""
 
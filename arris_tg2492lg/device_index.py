@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from .delta import DeviceDelta
+from .device import Device, LanClientAdapterType, LanClientType
+
+
+@dataclass
+class PhysicalDevice:
+    """A device with all its IP addresses, the router returns one row for every IPv4 and IPv6 address."""
+
+    mac: str
+    addresses: Dict[str, Device] = field(default_factory=dict)
+    online: bool = False
+    adapter_type: Optional[LanClientAdapterType] = None
+    type: Optional[LanClientType] = None
+
+    @property
+    def ips(self) -> List[str]:
+        return list(self.addresses)
+
+    @property
+    def hostname(self) -> Optional[str]:
+        return next((device.hostname for device in self.addresses.values() if device.hostname), None)
+
+
+class OnlineDeviceIndex:
+    """The connected devices keyed by MAC address, with the IPv4 and IPv6 addresses of a device merged.
+
+    The index is updated with the devices of every poll by `update`, or with the differences of every poll by
+    `apply_delta`. Only the devices that changed since the previous poll are re-indexed, so `is_online` and the filters
+    of `online_devices` don't scan all devices.
+
+    A device is online when one of its addresses is online. Devices without a MAC address are ignored. The last time
+    a device was seen online is kept after the router no longer returns the device.
+    """
+
+    def __init__(self) -> None:
+        self._devices: Dict[str, PhysicalDevice] = {}
+        self._online: Set[str] = set()
+        self._by_adapter_type: Dict[Optional[LanClientAdapterType], Set[str]] = {}
+        self._by_type: Dict[Optional[LanClientType], Set[str]] = {}
+        self._updated: Optional[datetime] = None
+
+        # The last update in which a device was online, for devices that are no longer online.
+        self._last_seen: Dict[str, Optional[datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, mac: object) -> bool:
+        return mac in self._devices
+
+    @property
+    def devices(self) -> List[PhysicalDevice]:
+        return list(self._devices.values())
+
+    def get(self, mac: str) -> Optional[PhysicalDevice]:
+        return self._devices.get(mac)
+
+    def is_online(self, mac: str) -> bool:
+        return mac in self._online
+
+    def last_seen(self, mac: str) -> Optional[datetime]:
+        """The time of the last update in which the device was online, None when it was never seen online."""
+        if mac in self._online:
+            return self._updated
+
+        return self._last_seen.get(mac)
+
+    def online_devices(
+        self, adapter_type: Optional[LanClientAdapterType] = None, type: Optional[LanClientType] = None
+    ) -> List[PhysicalDevice]:
+        """Return the online devices ordered by MAC address, optionally only those with the given adapter type and/or
+        client type.
+        """
+        macs = self._online
+
+        if adapter_type is not None:
+            macs = macs & self._by_adapter_type.get(adapter_type, set())
+        if type is not None:
+            macs = macs & self._by_type.get(type, set())
+
+        return [self._devices[mac] for mac in sorted(macs)]
+
+    def update(self, devices: Iterable[Device], now: Optional[datetime] = None) -> None:
+        """Update the index with all devices of a poll, as returned by `ConnectBox.async_get_connected_devices`.
+
+        Devices that are not in the poll are removed.
+        """
+        grouped: Dict[str, Dict[str, Device]] = {}
+        for device in devices:
+            if device.mac is not None:
+                grouped.setdefault(device.mac, {})[device.ip] = device
+
+        previous_updated = self._updated
+        self._updated = now or datetime.now(timezone.utc)
+
+        for mac in [mac for mac in self._devices if mac not in grouped]:
+            self._remove(mac, previous_updated)
+
+        for mac, addresses in grouped.items():
+            physical_device = self._devices.get(mac)
+            if physical_device is None or physical_device.addresses != addresses:
+                self._reindex(mac, addresses, previous_updated)
+
+    def apply_delta(self, delta: DeviceDelta, now: Optional[datetime] = None) -> None:
+        """Update the index with the differences of a poll, see `ConnectBox.async_get_connected_devices_delta`."""
+        previous_updated = self._updated
+        self._updated = now or datetime.now(timezone.utc)
+
+        changed: Dict[str, Dict[str, Device]] = {}
+
+        def addresses(mac: str) -> Dict[str, Device]:
+            if mac not in changed:
+                physical_device = self._devices.get(mac)
+                changed[mac] = {} if physical_device is None else dict(physical_device.addresses)
+            return changed[mac]
+
+        for device in delta.removed:
+            if device.mac is not None:
+                addresses(device.mac).pop(device.ip, None)
+
+        for device in [*delta.added, *(change.current for change in delta.changed)]:
+            if device.mac is not None:
+                addresses(device.mac)[device.ip] = device
+
+        for mac, mac_addresses in changed.items():
+            if mac_addresses:
+                self._reindex(mac, mac_addresses, previous_updated)
+            else:
+                self._remove(mac, previous_updated)
+
+    def clear(self) -> None:
+        self._devices = {}
+        self._online = set()
+        self._by_adapter_type = {}
+        self._by_type = {}
+        self._updated = None
+        self._last_seen = {}
+
+    def _reindex(self, mac: str, addresses: Dict[str, Device], previous_updated: Optional[datetime]) -> None:
+        physical_device = self._devices.get(mac)
+
+        if physical_device is None:
+            physical_device = self._devices[mac] = PhysicalDevice(mac)
+        else:
+            self._unindex(physical_device, previous_updated)
+
+        first = next(iter(addresses.values()))
+
+        physical_device.addresses = addresses
+        physical_device.online = any(device.online for device in addresses.values())
+        physical_device.adapter_type = first.adapter_type
+        physical_device.type = first.type
+
+        if physical_device.online:
+            self._online.add(mac)
+        self._by_adapter_type.setdefault(physical_device.adapter_type, set()).add(mac)
+        self._by_type.setdefault(physical_device.type, set()).add(mac)
+
+    def _remove(self, mac: str, previous_updated: Optional[datetime]) -> None:
+        self._unindex(self._devices.pop(mac), previous_updated)
+
+    def _unindex(self, physical_device: PhysicalDevice, previous_updated: Optional[datetime]) -> None:
+        mac = physical_device.mac
+
+        if mac in self._online:
+            # The device was online until the previous update.
+            self._last_seen[mac] = previous_updated
+            self._online.discard(mac)
+
+        self._by_adapter_type[physical_device.adapter_type].discard(mac)
+        self._by_type[physical_device.type].discard(mac)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, overload
+
+from .date_and_time import decode_lease_end, format_date
+from .device import Device, LanClientAdapterType, LanClientType
+
+# Integer columns use this value for attributes that are None.
+_MISSING = -1
+
+
+class DeviceTable(Sequence["DeviceRow"]):
+    """Immutable, columnar collection of devices.
+
+    Every attribute of `Device` is stored in its own column. Enum and boolean attributes are stored as bytes in an
+    `array`, the other attributes in tuples. This uses a fraction of the memory of a list of Devices, which makes it
+    suitable for keeping the results of many polls. Rows are returned as `DeviceRow` views on the columns.
+
+    The lease end dates are decoded once for the complete table, the first time the "lease_end" column is requested.
+    """
+
+    def __init__(self, devices: Iterable[Device]) -> None:
+        ip: List[str] = []
+        hostname: List[Optional[str]] = []
+        mac: List[Optional[str]] = []
+        adapter_type = array("b")
+        client_type = array("b")
+        raw_lease_end: List[Optional[str]] = []
+        row_status: List[Optional[str]] = []
+        online = array("b")
+        comment: List[Optional[str]] = []
+        device_name: List[Optional[str]] = []
+
+        for device in devices:
+            ip.append(device.ip)
+            hostname.append(device.hostname)
+            mac.append(device.mac)
+            adapter_type.append(_MISSING if device.adapter_type is None else device.adapter_type.value)
+            client_type.append(_MISSING if device.type is None else device.type.value)
+            raw_lease_end.append(device.raw_lease_end)
+            row_status.append(device.row_status)
+            online.append(_MISSING if device.online is None else int(device.online))
+            comment.append(device.comment)
+            device_name.append(device.device_name)
+
+        self._ip = tuple(ip)
+        self._hostname = tuple(hostname)
+        self._mac = tuple(mac)
+        self._adapter_type = adapter_type
+        self._type = client_type
+        self._raw_lease_end = tuple(raw_lease_end)
+        self._lease_end: Optional[Tuple[Optional[datetime], ...]] = None
+        self._row_status = tuple(row_status)
+        self._online = online
+        self._comment = tuple(comment)
+        self._device_name = tuple(device_name)
+
+        self._rows_by_ip: Dict[str, int] = {}
+        rows_by_mac: Dict[str, List[int]] = {}
+
+        for row, (row_ip, row_mac) in enumerate(zip(self._ip, self._mac)):
+            self._rows_by_ip[row_ip] = row
+            if row_mac is not None:
+                rows_by_mac.setdefault(row_mac, []).append(row)
+
+        self._rows_by_mac: Dict[str, Tuple[int, ...]] = {key: tuple(rows) for key, rows in rows_by_mac.items()}
+
+    def __len__(self) -> int:
+        return len(self._ip)
+
+    @overload
+    def __getitem__(self, index: int) -> DeviceRow:
+        """Return the row at the index."""
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[DeviceRow]:
+        """Return the rows in the slice."""
+
+    def __getitem__(self, index: int | slice) -> DeviceRow | Sequence[DeviceRow]:
+        if isinstance(index, slice):
+            return [DeviceRow(self, row) for row in range(len(self))[index]]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DeviceTable index out of range")
+
+        return DeviceRow(self, index)
+
+    def __iter__(self) -> Iterator[DeviceRow]:
+        return (DeviceRow(self, row) for row in range(len(self)))
+
+    def by_ip(self, ip: str) -> Optional[DeviceRow]:
+        """Return the row of the given IP address."""
+        row = self._rows_by_ip.get(ip)
+        return None if row is None else DeviceRow(self, row)
+
+    def by_mac(self, mac: str) -> List[DeviceRow]:
+        """Return the rows of all IP addresses of the given MAC address."""
+        return [DeviceRow(self, row) for row in self._rows_by_mac.get(mac, ())]
+
+    def macs(self) -> Iterable[str]:
+        """Return the unique MAC addresses in the table."""
+        return self._rows_by_mac.keys()
+
+    def column(self, name: str) -> Sequence[object]:
+        """Return all values of the given `Device` attribute, without copying.
+
+        Enum and boolean columns are returned as read-only memoryviews of their integer values, with -1 for missing
+        values.
+        """
+        if name == "lease_end":
+            return self._lease_ends()
+        if name not in Device.__slots__ or name.startswith("_"):
+            raise KeyError(name)
+
+        column: Sequence[object] = getattr(self, "_" + name)
+        if isinstance(column, array):
+            return memoryview(column).toreadonly()
+        return column
+
+    def _lease_ends(self) -> Tuple[Optional[datetime], ...]:
+        if self._lease_end is None:
+            self._lease_end = tuple(None if value is None else decode_lease_end(value) for value in self._raw_lease_end)
+        return self._lease_end
+
+    def to_devices(self) -> List[Device]:
+        return [row.to_device() for row in self]
+
+
+class DeviceRow:
+    """View on a single row of a `DeviceTable`, with the same attributes as `Device`."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: DeviceTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def ip(self) -> str:
+        return self._table._ip[self._row]
+
+    @property
+    def hostname(self) -> Optional[str]:
+        return self._table._hostname[self._row]
+
+    @property
+    def mac(self) -> Optional[str]:
+        return self._table._mac[self._row]
+
+    @property
+    def adapter_type(self) -> Optional[LanClientAdapterType]:
+        value = self._table._adapter_type[self._row]
+        return None if value == _MISSING else LanClientAdapterType(value)
+
+    @property
+    def type(self) -> Optional[LanClientType]:
+        value = self._table._type[self._row]
+        return None if value == _MISSING else LanClientType(value)
+
+    @property
+    def raw_lease_end(self) -> Optional[str]:
+        return self._table._raw_lease_end[self._row]
+
+    @property
+    def lease_end(self) -> Optional[datetime]:
+        return self._table._lease_ends()[self._row]
+
+    @property
+    def lease_end_string(self) -> Optional[str]:
+        raw_lease_end = self.raw_lease_end
+        return None if raw_lease_end is None else format_date(raw_lease_end)
+
+    @property
+    def row_status(self) -> Optional[str]:
+        return self._table._row_status[self._row]
+
+    @property
+    def online(self) -> Optional[bool]:
+        value = self._table._online[self._row]
+        return None if value == _MISSING else value == 1
+
+    @property
+    def comment(self) -> Optional[str]:
+        return self._table._comment[self._row]
+
+    @property
+    def device_name(self) -> Optional[str]:
+        return self._table._device_name[self._row]
+
+    def to_device(self) -> Device:
+        device = Device(self.ip)
+        device.hostname = self.hostname
+        device.mac = self.mac
+        device.adapter_type = self.adapter_type
+        device.type = self.type
+        device.raw_lease_end = self.raw_lease_end
+        device.row_status = self.row_status
+        device.online = self.online
+        device.comment = self.comment
+        device.device_name = self.device_name
+        device.freeze()
+        return device
+
+    def __str__(self) -> str:
+        return "ip: %s, hostname: %s" % (self.ip, self.hostname)
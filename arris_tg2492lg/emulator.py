@@ -0,0 +1,379 @@
+"""Emulation of the web API of an Arris TG2492LG, for load and soak testing without a real router."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import random
+import time
+import weakref
+
+from aiohttp import web
+from collections import Counter, defaultdict, deque
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from .const import (
+    ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID,
+    HARDWARE_VERSION_OID,
+    MAC_ADDRESS_OID,
+    SERIAL_NUMBER_OID,
+    SOFTWARE_VERSION_OID,
+    TOKEN_EXPIRATION,
+    USERNAME,
+)
+from .instrumentation import GET_CONN_DEVICES, SNMP_GET
+from .recorder import RecordedPayload, read_recording
+
+OID_ERROR = "Error in OID formatting!"
+
+ROUTER_INFORMATION: Dict[str, str] = {
+    MAC_ADDRESS_OID: "$1234567890ab",
+    HARDWARE_VERSION_OID: "10",
+    SOFTWARE_VERSION_OID: "9.1.2103.102",
+    SERIAL_NUMBER_OID: "ABCD12345678",
+}
+
+
+def generate_client_table(client_count: int, ipv6_share: float = 1.0) -> Dict[str, str]:
+    """Generate the cells of a LAN client table with an IPv4 address for every client.
+
+    The first `ipv6_share` fraction of the clients also gets an IPv6 address, like dual-stack devices do.
+    """
+    client_entry_oid = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID
+    ipv6_count = round(client_count * ipv6_share)
+    cells = {}
+
+    for client in range(client_count):
+        mac = "$%012X" % client
+        indices = ["200.1.4.10.0.%d.%d" % (client // 256, client % 256)]
+
+        if client < ipv6_count:
+            indices.append("200.2.16.32.1.28.18.8.214.187.0.176.246.133.90.13.205.%d.%d" % (client // 256, client % 256))
+
+        for index in indices:
+            cells[f"{client_entry_oid}.3.{index}"] = f"Device {client}"
+            cells[f"{client_entry_oid}.4.{index}"] = mac
+            cells[f"{client_entry_oid}.6.{index}"] = "5"
+            cells[f"{client_entry_oid}.7.{index}"] = "1"
+            cells[f"{client_entry_oid}.9.{index}"] = "$07e30b0310330400"
+            cells[f"{client_entry_oid}.13.{index}"] = "1"
+            cells[f"{client_entry_oid}.14.{index}"] = "1"
+            cells[f"{client_entry_oid}.15.{index}"] = ""
+            cells[f"{client_entry_oid}.20.{index}"] = "unknown device"
+
+    return cells
+
+
+def generate_conn_devices_payload(client_count: int, ipv6_share: float = 1.0) -> str:
+    """Generate a getConnDevices response, see `generate_client_table`."""
+    return _to_response(generate_client_table(client_count, ipv6_share))
+
+
+class RouterEmulator:
+    """A local HTTP server that behaves like the web API of a Connect Box.
+
+    It serves `/login`, `/logout`, `/getConnDevices`, `/snmpGet` and `/walk` like the router does:
+
+    - A wrong password is answered with 500.
+    - Only one admin session exists at a time. A login with another nonce (`_n`) while a session is active receives
+      a token that marks a multi-login and is rejected by every request. A login with the nonce of the active session
+      replaces the session.
+    - Requests with a missing, rejected or expired token (`session_timeout` after the login) are answered with 401.
+    - snmpGet answers "Error in OID formatting!" when an OID is requested that the emulator doesn't know.
+
+    Every response is delayed by `latency` seconds plus a random jitter of up to `jitter` seconds, and the first
+    response on a new connection by another `connection_latency` seconds, like the slow connection setup of the
+    router. Idle connections are closed after `keepalive_timeout` seconds. A `failure_rate` fraction of the requests
+    fails with 500, `fail_next` fails specific requests and `disconnect_next` closes the connection instead of
+    responding.
+
+    The emulator can be started as an async context manager, or its `app` can be served by a test client.
+    """
+
+    def __init__(
+        self,
+        password: str = "password",
+        client_count: int = 10,
+        ipv6_share: float = 0.5,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        connection_latency: float = 0.0,
+        keepalive_timeout: float = 75.0,
+        session_timeout: timedelta = TOKEN_EXPIRATION,
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.connection_latency = connection_latency
+        self.keepalive_timeout = keepalive_timeout
+        self.connection_count = 0
+        self.session_timeout = session_timeout
+        self.clock = clock
+        self.request_counts: Counter[str] = Counter()
+        self.snmp_values: Dict[str, str] = {**ROUTER_INFORMATION, **generate_client_table(client_count, ipv6_share)}
+
+        self._random = random.Random(seed)
+        self._failures: Dict[str, Deque[int]] = defaultdict(deque)
+        self._disconnects: Counter[str] = Counter()
+        self._connections: weakref.WeakSet[asyncio.BaseTransport] = weakref.WeakSet()
+        self._session: Optional[_Session] = None
+        self._session_count = 0
+        self._conn_devices_response: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/login", self._login)
+        self.app.router.add_get("/logout", self._logout)
+        self.app.router.add_get("/getConnDevices", self._get_conn_devices)
+        self.app.router.add_get("/snmpGet", self._snmp_get)
+        self.app.router.add_get("/walk", self._walk)
+
+    async def __aenter__(self) -> RouterEmulator:
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.async_close()
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Serve the emulator, on a free port by default."""
+        self._runner = web.AppRunner(self.app, keepalive_timeout=self.keepalive_timeout)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def async_close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def hostname(self) -> str:
+        """The URL of the running emulator, to pass as hostname to ConnectBox."""
+        if self._runner is None:
+            raise RuntimeError("Emulator is not started")
+
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, path: str, status: int = 500, count: int = 1) -> None:
+        """Answer the next `count` requests to the path (e.g. "/getConnDevices") with the given status."""
+        self._failures[path].extend([status] * count)
+
+    def disconnect_next(self, path: str, count: int = 1) -> None:
+        """Close the connection of the next `count` requests to the path without responding."""
+        self._disconnects[path] += count
+
+    def expire_sessions(self) -> None:
+        """End the active session, like the router does after `session_timeout`."""
+        self._session = None
+
+    def set_client_online(self, client: int, online: bool) -> None:
+        """Change the online state of a generated client, on all its addresses."""
+        mac = "$%012X" % client
+        mac_prefix = f"{ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID}.4."
+        online_prefix = f"{ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID}.14."
+
+        for oid, value in list(self.snmp_values.items()):
+            if oid.startswith(mac_prefix) and value == mac:
+                self.snmp_values[online_prefix + oid[len(mac_prefix) :]] = "1" if online else "0"
+
+        self._conn_devices_response = None
+
+    async def _handle(self, request: web.Request) -> Optional[web.Response]:
+        """Count and delay the request. Returns a response when the request fails."""
+        self.request_counts[request.path] += 1
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter > 0 else 0.0)
+
+        transport = request.transport
+        if transport is not None and transport not in self._connections:
+            self._connections.add(transport)
+            self.connection_count += 1
+            delay += self.connection_latency
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._disconnects[request.path] > 0:
+            self._disconnects[request.path] -= 1
+            if transport is not None:
+                transport.close()
+            return web.Response(status=500)
+
+        failures = self._failures.get(request.path)
+        if failures:
+            return web.Response(status=failures.popleft())
+
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            return web.Response(status=500)
+
+        return None
+
+    def _active_session(self) -> Optional[_Session]:
+        session = self._session
+
+        if session is not None and self.clock() - session.created_at > self.session_timeout.total_seconds():
+            session = self._session = None
+
+        return session
+
+    def _is_authorized(self, request: web.Request) -> bool:
+        session = self._active_session()
+        return session is not None and request.cookies.get("credential") == session.token
+
+    async def _login(self, request: web.Request) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        try:
+            username, _, password = base64.b64decode(request.query.get("arg", "")).decode("utf-8").partition(":")
+        except ValueError:
+            return web.Response(status=500)
+
+        if username != USERNAME or unquote(password) != self.password:
+            return web.Response(status=500)
+
+        nonce = request.query.get("_n", "")
+        session = self._active_session()
+
+        if session is not None and session.nonce != nonce:
+            # Another client is logged in, the router hands out a token that is not accepted.
+            return web.Response(text=_token({"name": USERNAME, "muti": "LAN", "conType": "LAN", "gwWan": "f"}))
+
+        self._session_count += 1
+        token = _token({"name": USERNAME, "session": self._session_count})
+        self._session = _Session(token, nonce, self.clock())
+
+        return web.Response(text=token)
+
+    async def _logout(self, request: web.Request) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        if self._is_authorized(request):
+            self._session = None
+
+        return web.Response()
+
+    async def _get_conn_devices(self, request: web.Request) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        if not self._is_authorized(request):
+            return web.Response(status=401)
+
+        if self._conn_devices_response is None:
+            prefix = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + "."
+            self._conn_devices_response = _to_response(
+                {oid: value for oid, value in self.snmp_values.items() if oid.startswith(prefix)}
+            )
+
+        return web.Response(text=self._conn_devices_response)
+
+    async def _snmp_get(self, request: web.Request) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        if not self._is_authorized(request):
+            return web.Response(status=401)
+
+        oids = [oid for oid in request.query.get("oids", "").split(";") if oid]
+
+        if not oids or any(oid not in self.snmp_values for oid in oids):
+            return web.Response(text=OID_ERROR)
+
+        return web.Response(text=json.dumps({oid: self.snmp_values[oid] for oid in oids}))
+
+    async def _walk(self, request: web.Request) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        if not self._is_authorized(request):
+            return web.Response(status=401)
+
+        prefix = request.query.get("oids", "") + "."
+
+        return web.Response(
+            text=_to_response({oid: value for oid, value in self.snmp_values.items() if oid.startswith(prefix)})
+        )
+
+
+class ReplayRouter(RouterEmulator):
+    """A router emulator that answers getConnDevices and snmpGet with the responses of a recording.
+
+    The responses of every request (snmpGet with the same OIDs) are returned in the recorded order. When no recorded
+    response is left the request is answered with 404, or with `repeat` the responses are returned again from the
+    start. Login, sessions and the injection of failures and latency work like `RouterEmulator`.
+    """
+
+    def __init__(
+        self,
+        recording: Union[str, Path, Iterable[RecordedPayload]],
+        password: str = "password",
+        repeat: bool = False,
+        **kwargs: Any,
+    ):
+        super().__init__(password, client_count=0, **kwargs)
+        self.repeat = repeat
+        self._responses: Dict[Tuple[str, str], Deque[str]] = defaultdict(deque)
+
+        payloads = read_recording(recording) if isinstance(recording, (str, Path)) else recording
+        for payload in payloads:
+            self._responses[(payload.operation, payload.query)].append(payload.body)
+
+    async def _get_conn_devices(self, request: web.Request) -> web.Response:
+        return await self._replay(request, (GET_CONN_DEVICES, ""))
+
+    async def _snmp_get(self, request: web.Request) -> web.Response:
+        return await self._replay(request, (SNMP_GET, request.query.get("oids", "")))
+
+    async def _replay(self, request: web.Request, key: Tuple[str, str]) -> web.Response:
+        response = await self._handle(request)
+        if response is not None:
+            return response
+
+        if not self._is_authorized(request):
+            return web.Response(status=401)
+
+        responses = self._responses.get(key)
+        if not responses:
+            return web.Response(status=404)
+
+        body = responses.popleft()
+        if self.repeat:
+            responses.append(body)
+
+        return web.Response(text=body)
+
+
+class _Session:
+    __slots__ = ("token", "nonce", "created_at")
+
+    def __init__(self, token: str, nonce: str, created_at: float) -> None:
+        self.token = token
+        self.nonce = nonce
+        self.created_at = created_at
+
+
+def _token(content: Dict[str, object]) -> str:
+    return base64.b64encode(json.dumps(content).encode("utf-8")).decode("ascii")
+
+
+def _to_response(cells: Dict[str, str]) -> str:
+    """Serialize cells like the router, which ends every table response with a "1": "Finish" entry."""
+    response: Dict[str, str] = dict(cells)
+    response["1"] = "Finish"
+    return json.dumps(response)
@@ -4,3 +4,7 @@ class ConnectBoxError(Exception):
 
 class InvalidCredentialError(ConnectBoxError):
     """Login credential is invalid."""
+
+
+class InvalidOidError(ConnectBoxError):
+    """The router rejected the requested OIDs with "Error in OID formatting!"."""
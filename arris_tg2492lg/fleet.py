@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from aiohttp import ClientSession
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from .connect_box import ConnectBox
+from .const import CONNECTION_LIMIT_PER_HOST, POLL_MAX_BACKOFF, POLL_MAX_INTERVAL, POLL_MIN_INTERVAL
+from .credential_store import CredentialStore
+from .device import Device
+from .poller import ConnectBoxPoller
+from .session import create_websession
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class FleetResult(Generic[T]):
+    """The result of a request to a single router of the fleet."""
+
+    hostname: str
+    result: Optional[T] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ConnectBoxFleet:
+    """Polls many Connect Boxes concurrently.
+
+    Every router keeps its own ConnectBox, so the login of a router is reused between polls. All routers share one
+    connection pool. At most `max_concurrency` routers are requested at the same time and a request that takes longer
+    than `timeout` seconds fails for that router only.
+
+    A `parse_executor` and a `credential_store` are shared by the ConnectBoxes of all routers, see `ConnectBox`.
+    """
+
+    def __init__(
+        self,
+        routers: Iterable[Tuple[str, str]],
+        websession: Optional[ClientSession] = None,
+        max_concurrency: int = 10,
+        timeout: float = 30.0,
+        limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+        parse_executor: Optional[Executor] = None,
+        credential_store: Optional[CredentialStore] = None,
+    ):
+        self._passwords = dict(routers)
+        self._websession = websession
+        self._owns_websession = websession is None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._timeout = timeout
+        self._limit_per_host = limit_per_host
+        self._parse_executor = parse_executor
+        self._credential_store = credential_store
+        self._connect_boxes: Dict[str, ConnectBox] = {}
+
+    async def __aenter__(self) -> ConnectBoxFleet:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.async_close()
+
+    @property
+    def hostnames(self) -> List[str]:
+        return list(self._passwords)
+
+    def get_connect_box(self, hostname: str) -> ConnectBox:
+        """Return the ConnectBox that is used for the given router."""
+        connect_box = self._connect_boxes.get(hostname)
+
+        if connect_box is None:
+            connect_box = ConnectBox(
+                self._get_websession(),
+                hostname,
+                self._passwords[hostname],
+                credential_store=self._credential_store,
+                parse_executor=self._parse_executor,
+            )
+            self._connect_boxes[hostname] = connect_box
+
+        return connect_box
+
+    def create_poller(
+        self,
+        hostname: str,
+        min_interval: timedelta = POLL_MIN_INTERVAL,
+        max_interval: timedelta = POLL_MAX_INTERVAL,
+        max_backoff: timedelta = POLL_MAX_BACKOFF,
+    ) -> ConnectBoxPoller:
+        """Return a ConnectBoxPoller for the given router, whose polls are limited by `max_concurrency` and `timeout`
+        like the requests of the fleet.
+        """
+        return ConnectBoxPoller(
+            self.get_connect_box(hostname),
+            min_interval,
+            max_interval,
+            max_backoff,
+            timeout=self._timeout,
+            semaphore=self._semaphore,
+        )
+
+    async def async_poll(self, request: Callable[[ConnectBox], Awaitable[T]]) -> AsyncIterator[FleetResult[T]]:
+        """Execute the request for every router and yield the results in the order they finish."""
+        tasks = [asyncio.ensure_future(self._async_request(hostname, request)) for hostname in self.hostnames]
+
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def async_get_connected_devices(self) -> AsyncIterator[FleetResult[List[Device]]]:
+        """Get the connected devices of every router, in the order the routers respond."""
+        return self.async_poll(lambda connect_box: connect_box.async_get_connected_devices())
+
+    async def async_logout(self) -> None:
+        """Logout of every router that is logged in, each within `timeout` seconds.
+
+        Routers without a session, e.g. because the login failed, are skipped, as logging out would login first.
+        """
+        await asyncio.gather(
+            *(
+                asyncio.wait_for(connect_box.async_logout(), self._timeout)
+                for connect_box in self._connect_boxes.values()
+                if connect_box.logged_in
+            ),
+            return_exceptions=True,
+        )
+
+    async def async_close(self) -> None:
+        """Close the connection pool, when it was created by the fleet."""
+        if self._owns_websession and self._websession is not None:
+            await self._websession.close()
+            self._websession = None
+            self._connect_boxes = {}
+
+    async def _async_request(self, hostname: str, request: Callable[[ConnectBox], Awaitable[T]]) -> FleetResult[T]:
+        async with self._semaphore:
+            start = time.monotonic()
+
+            try:
+                result = await asyncio.wait_for(request(self.get_connect_box(hostname)), self._timeout)
+            except Exception as exc:
+                _LOGGER.debug("Request to router %s failed: %r", hostname, exc)
+                return FleetResult(hostname, error=exc, elapsed=time.monotonic() - start)
+
+            return FleetResult(hostname, result=result, elapsed=time.monotonic() - start)
+
+    def _get_websession(self) -> ClientSession:
+        if self._websession is None:
+            self._websession = create_websession(self._limit_per_host)
+
+        return self._websession
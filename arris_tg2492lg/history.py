@@ -0,0 +1,293 @@
+"""History of the presence of devices, stored in SQLite.
+
+Every poll is reduced to the online state and the attributes of every MAC address. Only changes are stored:
+
+- `presence` contains intervals in which a device was online or offline. Every device has one open interval, that is
+  extended by every poll with a single UPDATE for all devices. A poll with another state closes the interval, as does
+  a device that is no longer returned by the router for `max_absence`.
+- `attributes` contains a row whenever the hostname, IP addresses, adapter type or client type of a device changed.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .const import HISTORY_MAX_ABSENCE, HISTORY_MAX_GAP
+from .device import Device, LanClientAdapterType, LanClientType
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presence (
+    mac TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    online INTEGER NOT NULL,
+    is_open INTEGER NOT NULL,
+    PRIMARY KEY (mac, start)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS presence_end ON presence (end);
+CREATE INDEX IF NOT EXISTS presence_open ON presence (mac) WHERE is_open;
+CREATE TABLE IF NOT EXISTS attributes (
+    mac TEXT NOT NULL,
+    time REAL NOT NULL,
+    hostname TEXT,
+    ips TEXT NOT NULL,
+    adapter_type INTEGER,
+    type INTEGER,
+    PRIMARY KEY (mac, time)
+) WITHOUT ROWID;
+"""
+
+# The hostname, IP addresses, adapter type and client type of a device.
+_Attributes = Tuple[Optional[str], str, Optional[int], Optional[int]]
+
+
+@dataclass
+class PresenceInterval:
+    """An interval in which a device was online or offline."""
+
+    mac: str
+    start: datetime
+    end: datetime
+    online: bool
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+
+@dataclass
+class AttributeChange:
+    """The attributes of a device from `time` until the next change."""
+
+    mac: str
+    time: datetime
+    hostname: Optional[str]
+    ips: List[str]
+    adapter_type: Optional[LanClientAdapterType]
+    type: Optional[LanClientType]
+
+
+class PresenceHistory:
+    """Stores the presence of devices over time in an SQLite database.
+
+    Call `record` with the devices of every poll. The IPv4 and IPv6 addresses of a device are merged by MAC address;
+    a device is online when one of its addresses is online. A device that is no longer returned by the router is
+    offline. When no poll was recorded for longer than `max_gap`, the state in between is unknown and new intervals
+    are started. When a device was not returned for longer than `max_absence`, its offline interval is closed and it
+    is no longer tracked, until it is returned again.
+
+    A year of polls only needs as many rows as there were changes. Old history is removed with `prune` and reduced
+    further with `downsample`.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        max_gap: timedelta = HISTORY_MAX_GAP,
+        max_absence: timedelta = HISTORY_MAX_ABSENCE,
+    ):
+        self._connection = sqlite3.connect(str(path))
+        self._max_gap = max_gap.total_seconds()
+        self._max_absence = max_absence.total_seconds()
+
+        with self._connection:
+            if str(path) != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+
+        (self._last_poll,) = self._connection.execute("SELECT MAX(end) FROM presence").fetchone()
+        self._open: Dict[str, bool] = {
+            mac: bool(online) for mac, online in self._connection.execute("SELECT mac, online FROM presence WHERE is_open")
+        }
+        # The last poll that returned the device, for every device with an open interval. After reopening, the devices
+        # count as returned by the last poll.
+        self._present: Dict[str, float] = {mac: self._last_poll for mac in self._open}
+        self._attributes: Dict[str, _Attributes] = {
+            mac: tuple(attributes)
+            for mac, *attributes in self._connection.execute(
+                "SELECT mac, hostname, ips, adapter_type, type FROM attributes AS a "
+                "WHERE time = (SELECT MAX(time) FROM attributes WHERE mac = a.mac)"
+            )
+        }
+
+    def __enter__(self) -> PresenceHistory:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def record(self, devices: Iterable[Device], now: Optional[datetime] = None) -> None:
+        """Record the devices of a poll, as returned by `ConnectBox.async_get_connected_devices`."""
+        timestamp = (now or datetime.now(timezone.utc)).timestamp()
+
+        online: Dict[str, bool] = {}
+        addresses: Dict[str, List[Device]] = {}
+        for device in devices:
+            if device.mac is not None:
+                online[device.mac] = online.get(device.mac, False) or bool(device.online)
+                addresses.setdefault(device.mac, []).append(device)
+
+        gap = self._last_poll is None or timestamp - self._last_poll > self._max_gap
+        closed = []
+        opened = []
+
+        for mac in online:
+            self._present[mac] = timestamp
+
+        for mac in [mac for mac in self._open if timestamp - self._present[mac] > self._max_absence]:
+            closed.append((mac,))
+            del self._open[mac]
+            del self._present[mac]
+
+        for mac in self._open.keys() | online.keys():
+            state = online.get(mac, False)
+            if gap or self._open.get(mac) is not state:
+                if mac in self._open:
+                    closed.append((mac,))
+                opened.append((mac, timestamp, timestamp, state, True))
+                self._open[mac] = state
+
+        attribute_changes = []
+        for mac, mac_devices in addresses.items():
+            attributes = _attributes(mac_devices)
+            if self._attributes.get(mac) != attributes:
+                attribute_changes.append((mac, timestamp, *attributes))
+                self._attributes[mac] = attributes
+
+        with self._connection:
+            if not gap:
+                # The intervals of devices that changed state end at this poll.
+                self._connection.execute("UPDATE presence SET end = ? WHERE is_open", (timestamp,))
+            self._connection.executemany("UPDATE presence SET is_open = 0 WHERE mac = ? AND is_open", closed)
+            self._connection.executemany("INSERT INTO presence VALUES (?, ?, ?, ?, ?)", opened)
+            self._connection.executemany("INSERT INTO attributes VALUES (?, ?, ?, ?, ?, ?)", attribute_changes)
+
+        self._last_poll = timestamp
+
+    def intervals(self, mac: str, start: datetime, end: datetime) -> List[PresenceInterval]:
+        """Return the intervals of the device that overlap with the range, clipped to the range."""
+        rows = self._connection.execute(
+            "SELECT start, end, online FROM presence WHERE mac = ? AND start < ? AND end > ? ORDER BY start",
+            (mac, end.timestamp(), start.timestamp()),
+        )
+
+        return [
+            PresenceInterval(
+                mac,
+                max(_to_datetime(interval_start), start),
+                min(_to_datetime(interval_end), end),
+                bool(online),
+            )
+            for interval_start, interval_end, online in rows
+        ]
+
+    def last_online(self, mac: str) -> Optional[datetime]:
+        """Return the end of the last interval in which the device was online: the poll that saw it offline, or the last
+        poll when it is still online. None when it was never seen online.
+        """
+        (end,) = self._connection.execute("SELECT MAX(end) FROM presence WHERE mac = ? AND online = 1", (mac,)).fetchone()
+        return None if end is None else _to_datetime(end)
+
+    def online_time(self, mac: str, start: datetime, end: datetime) -> timedelta:
+        """Return how long the device was online within the range."""
+        return sum((interval.duration for interval in self.intervals(mac, start, end) if interval.online), timedelta())
+
+    def online_time_per_day(self, mac: str, start: date, end: date, tz: tzinfo = timezone.utc) -> Dict[date, timedelta]:
+        """Return how long the device was online on every day from start up to and including end, in timezone tz."""
+        result = {}
+        day = start
+
+        while day <= end:
+            day_start = datetime(day.year, day.month, day.day, tzinfo=tz)
+            result[day] = self.online_time(mac, day_start, day_start + timedelta(days=1))
+            day += timedelta(days=1)
+
+        return result
+
+    def attribute_changes(self, mac: str, start: datetime, end: datetime) -> List[AttributeChange]:
+        """Return the attributes of the device that were current within the range."""
+        rows = self._connection.execute(
+            "SELECT time, hostname, ips, adapter_type, type FROM attributes WHERE mac = ? AND time < ? "
+            "AND time >= COALESCE((SELECT MAX(time) FROM attributes WHERE mac = ? AND time <= ?), 0) ORDER BY time",
+            (mac, end.timestamp(), mac, start.timestamp()),
+        )
+
+        return [
+            AttributeChange(
+                mac,
+                _to_datetime(time),
+                hostname,
+                ips.split(",") if ips else [],
+                None if adapter_type is None else LanClientAdapterType(adapter_type),
+                None if type is None else LanClientType(type),
+            )
+            for time, hostname, ips, adapter_type, type in rows
+        ]
+
+    def prune(self, before: datetime) -> None:
+        """Remove the history before the given time, except the open intervals and the last known attributes of every
+        device.
+        """
+        timestamp = before.timestamp()
+
+        with self._connection:
+            self._connection.execute("DELETE FROM presence WHERE end < ? AND NOT is_open", (timestamp,))
+            self._connection.execute(
+                "DELETE FROM attributes AS a WHERE time < ? AND time < (SELECT MAX(time) FROM attributes WHERE mac = a.mac)",
+                (timestamp,),
+            )
+
+    def downsample(self, before: datetime, resolution: timedelta) -> None:
+        """Reduce the closed intervals that ended before the given time to the given resolution.
+
+        An interval shorter than `resolution` is added to the interval before it, after which adjacent intervals with
+        the same state are merged. A device that was offline for a few seconds, or flapped, no longer takes a row.
+        """
+        step = resolution.total_seconds()
+        rows = self._connection.execute(
+            "SELECT mac, start, end, online FROM presence WHERE end <= ? AND NOT is_open ORDER BY mac, start",
+            (before.timestamp(),),
+        ).fetchall()
+
+        inserted: List[Tuple[str, float, float, int]] = []
+
+        for mac, start, end, online in rows:
+            if inserted and inserted[-1][0] == mac and inserted[-1][2] == start:
+                if inserted[-1][3] == online or end - start < step:
+                    inserted[-1] = (mac, inserted[-1][1], end, inserted[-1][3])
+                    continue
+
+            inserted.append((mac, start, end, online))
+
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM presence WHERE mac = ? AND start = ?", [(mac, start) for mac, start, _, _ in rows]
+            )
+            self._connection.executemany("INSERT INTO presence VALUES (?, ?, ?, ?, 0)", inserted)
+
+    def vacuum(self) -> None:
+        """Release the space of removed rows to the file system."""
+        self._connection.execute("VACUUM")
+
+
+def _attributes(devices: List[Device]) -> _Attributes:
+    first = devices[0]
+
+    return (
+        next((device.hostname for device in devices if device.hostname), None),
+        ",".join(sorted(device.ip for device in devices)),
+        None if first.adapter_type is None else first.adapter_type.value,
+        None if first.type is None else first.type.value,
+    )
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
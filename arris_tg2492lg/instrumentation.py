@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Operations that are reported by ConnectBox.
+LOGIN = "login"
+LOGOUT = "logout"
+GET_CONN_DEVICES = "getConnDevices"
+SNMP_GET = "snmpGet"
+SNMP_WALK = "walk"
+PARSE = "parse"
+
+
+@dataclass
+class RequestEvent:
+    """Timing of a single operation of a ConnectBox.
+
+    Requests to the router report the HTTP status, the size of the response and the age of the credential that was
+    used. A request that is retried after a 401 has `retry` set. Parsing a response is reported as a separate "parse"
+    operation.
+    """
+
+    hostname: str
+    operation: str
+    duration: float
+    status: Optional[int] = None
+    response_bytes: int = 0
+    retry: bool = False
+    token_age: Optional[float] = None
+
+
+class Instrumentation:
+    """Distributes RequestEvents to subscribers.
+
+    ConnectBox only creates events when there is at least one subscriber, so instrumentation costs (almost) nothing
+    when it is not used. One instance can be shared by many ConnectBox instances.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Callable[[RequestEvent], None]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[RequestEvent], None]) -> Callable[[], None]:
+        """Call the callback for every event. Returns a function that cancels the subscription."""
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def emit(self, event: RequestEvent) -> None:
+        for callback in self._subscribers:
+            callback(event)
+
+
+class _OperationMetrics:
+    __slots__ = ("count", "duration", "response_bytes", "unauthorized", "retries")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.response_bytes = 0
+        self.unauthorized = 0
+        self.retries = 0
+
+
+class PrometheusExporter:
+    """Aggregates RequestEvents and renders them in the Prometheus text exposition format.
+
+    The rendered text can be served on a metrics endpoint, no Prometheus client library is required.
+    """
+
+    def __init__(self, instrumentation: Instrumentation, prefix: str = "arris_tg2492lg"):
+        self._prefix = prefix
+        self._operations: Dict[Tuple[str, str], _OperationMetrics] = {}
+        self._token_ages: Dict[str, float] = {}
+        self.unsubscribe = instrumentation.subscribe(self._handle_event)
+
+    def _handle_event(self, event: RequestEvent) -> None:
+        key = (event.hostname, event.operation)
+        metrics = self._operations.get(key)
+
+        if metrics is None:
+            metrics = self._operations[key] = _OperationMetrics()
+
+        metrics.count += 1
+        metrics.duration += event.duration
+        metrics.response_bytes += event.response_bytes
+
+        if event.status == 401:
+            metrics.unauthorized += 1
+        if event.retry:
+            metrics.retries += 1
+        if event.token_age is not None:
+            self._token_ages[event.hostname] = event.token_age
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def add_metric(name: str, metric_type: str, description: str, samples: List[Tuple[str, float]]) -> None:
+            lines.append(f"# HELP {self._prefix}_{name} {description}")
+            lines.append(f"# TYPE {self._prefix}_{name} {metric_type}")
+            lines.extend(f"{self._prefix}_{name}{{{labels}}} {value}" for labels, value in samples)
+
+        operations = sorted(self._operations.items())
+
+        def samples(attribute: str) -> List[Tuple[str, float]]:
+            return [
+                (_labels(hostname, operation), getattr(metrics, attribute)) for (hostname, operation), metrics in operations
+            ]
+
+        add_metric("requests_total", "counter", "Number of operations.", samples("count"))
+        add_metric("request_duration_seconds_total", "counter", "Total duration of operations.", samples("duration"))
+        add_metric("response_bytes_total", "counter", "Total size of the responses.", samples("response_bytes"))
+        add_metric("unauthorized_total", "counter", "Number of requests rejected with 401.", samples("unauthorized"))
+        add_metric("retries_total", "counter", "Number of requests retried after a 401.", samples("retries"))
+        add_metric(
+            "token_age_seconds",
+            "gauge",
+            "Age of the credential used by the last request.",
+            [(f'hostname="{_escape(hostname)}"', age) for hostname, age in sorted(self._token_ages.items())],
+        )
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(hostname: str, operation: str) -> str:
+    return f'hostname="{_escape(hostname)}",operation="{_escape(operation)}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
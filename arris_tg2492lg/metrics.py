@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .connect_box import ConnectBox
+from .const import (
+    DOCS_IF_CM_STATUS_TX_POWER_OID,
+    DOCS_IF_DOWN_CHANNEL_POWER_OID,
+    DOCS_IF_SIG_Q_SIGNAL_NOISE_OID,
+    IF_HC_IN_OCTETS_OID,
+    IF_HC_OUT_OCTETS_OID,
+    IF_IN_ERRORS_OID,
+    METRICS_HISTORY,
+    SYS_UPTIME_OID,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MetricType(Enum):
+    """The SNMP type of a metric, counters are converted to rates."""
+
+    GAUGE = 0
+    COUNTER32 = 32
+    COUNTER64 = 64
+
+
+@dataclass(frozen=True)
+class Metric:
+    """An SNMP value that is sampled by `MetricsCollector`, its value is multiplied by `scale`."""
+
+    name: str
+    oid: str
+    type: MetricType = MetricType.GAUGE
+    scale: float = 1.0
+
+
+METRIC_CATALOG: List[Metric] = [
+    Metric("uptime_seconds", SYS_UPTIME_OID, scale=0.01),
+    Metric("wan_received_bytes", IF_HC_IN_OCTETS_OID + ".2", MetricType.COUNTER64),
+    Metric("wan_sent_bytes", IF_HC_OUT_OCTETS_OID + ".2", MetricType.COUNTER64),
+    Metric("wan_receive_errors", IF_IN_ERRORS_OID + ".2", MetricType.COUNTER32),
+    Metric("lan_received_bytes", IF_HC_IN_OCTETS_OID + ".1", MetricType.COUNTER64),
+    Metric("lan_sent_bytes", IF_HC_OUT_OCTETS_OID + ".1", MetricType.COUNTER64),
+    Metric("downstream_power_dbmv", DOCS_IF_DOWN_CHANNEL_POWER_OID + ".3", scale=0.1),
+    Metric("downstream_snr_db", DOCS_IF_SIG_Q_SIGNAL_NOISE_OID + ".3", scale=0.1),
+    Metric("upstream_power_dbmv", DOCS_IF_CM_STATUS_TX_POWER_OID + ".2", scale=0.1),
+]
+
+
+@dataclass
+class MetricSample:
+    """The values of one sample and, for counters, the rates per second since the previous sample.
+
+    `timestamp` is the `time.monotonic()` at which the response was received.
+    """
+
+    timestamp: float
+    values: Dict[str, float] = field(default_factory=dict)
+    rates: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class MetricsCollector:
+    """Samples the metrics of a router and keeps the last `history` samples.
+
+    The OIDs of all metrics are requested with a single snmpGet request per sample (when they fit in one URL), bypassing
+    the SNMP cache. Rates are computed from the difference with the previous sample; a counter that is lower than
+    before wrapped around once. When `uptime_seconds` decreased the router restarted and no rates are computed.
+    """
+
+    def __init__(self, connect_box: ConnectBox, metrics: Iterable[Metric] = METRIC_CATALOG, history: int = METRICS_HISTORY):
+        self._connect_box = connect_box
+        self._metrics = {metric.oid: metric for metric in metrics}
+        self._samples: Deque[MetricSample] = deque(maxlen=history)
+        self._raw_values: Dict[str, int] = {}
+
+    @property
+    def samples(self) -> List[MetricSample]:
+        """The samples, oldest first."""
+        return list(self._samples)
+
+    @property
+    def latest(self) -> Optional[MetricSample]:
+        return self._samples[-1] if self._samples else None
+
+    async def async_sample(self) -> MetricSample:
+        """Sample all metrics and add the sample to the history."""
+        result = await self._connect_box.async_snmp_get_many(self._metrics, use_cache=False)
+        sample = MetricSample(time.monotonic())
+
+        raw_values = {}
+        for oid, value in result.values.items():
+            metric = self._metrics[oid]
+            try:
+                raw_values[oid] = int(value)
+            except ValueError:
+                sample.errors[metric.name] = f"Received invalid value: {value}"
+                continue
+
+            sample.values[metric.name] = raw_values[oid] * metric.scale
+
+        for oid, error in result.errors.items():
+            sample.errors[self._metrics[oid].name] = error
+
+        previous = self.latest
+        if previous is not None and not self._restarted(previous, sample):
+            self._add_rates(sample, raw_values, sample.timestamp - previous.timestamp)
+
+        if sample.errors:
+            _LOGGER.debug("Failed to sample metrics of router: %s", sample.errors)
+
+        self._raw_values = raw_values
+        self._samples.append(sample)
+
+        return sample
+
+    def _add_rates(self, sample: MetricSample, raw_values: Dict[str, int], elapsed: float) -> None:
+        if elapsed <= 0:
+            return
+
+        for oid, value in raw_values.items():
+            metric = self._metrics[oid]
+            previous_value = self._raw_values.get(oid)
+
+            if metric.type is MetricType.GAUGE or previous_value is None:
+                continue
+
+            difference = value - previous_value
+            if difference < 0:
+                difference += 2**metric.type.value
+
+            sample.rates[metric.name] = difference * metric.scale / elapsed
+
+    @staticmethod
+    def _restarted(previous: MetricSample, sample: MetricSample) -> bool:
+        previous_uptime = previous.values.get("uptime_seconds")
+        uptime = sample.values.get("uptime_seconds")
+
+        return previous_uptime is not None and uptime is not None and uptime < previous_uptime
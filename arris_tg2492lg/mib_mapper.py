@@ -2,9 +2,11 @@ import ipaddress
 import json
 import logging
 import re
-from typing import List, cast
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
 
 from .const import (
+    ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID,
     CLIENT_ADAPTER_TYPE_OID,
     CLIENT_COMMENT_OID,
     CLIENT_DEVICE_NAME_OID,
@@ -15,94 +17,526 @@ from .const import (
     CLIENT_ROW_STATUS_OID,
     CLIENT_TYPE_OID,
 )
+
+# format_date and format_dates moved to date_and_time, they are imported here for backwards compatibility.
+from .date_and_time import format_date, format_dates, validate_date, validate_dates  # noqa: F401
 from .device import Device, LanClientAdapterType, LanClientType
 
 _LOGGER = logging.getLogger(__name__)
 
+# The raw values of the columns of a LAN client table row.
+RawRow = Tuple[Optional[str], ...]
+
 
 def to_devices(json_string: str) -> List[Device]:
     """Maps JSON result from router to Devices."""
     return cast(List[Device], json.loads(json_string, object_pairs_hook=to_devices_2))
 
 
-def to_devices_2(list_of_pairs: List[tuple[str, str]]) -> List[Device]:
+def to_devices_2(list_of_pairs: List[Tuple[str, str]]) -> List[Device]:
     """Maps JSON result from router to Devices."""
-    devices: List[Device] = []
-    current_device: Device | None = None
+    builder = DeviceBuilder()
+    devices = builder.add_pairs(list_of_pairs)
 
-    for key, value in list_of_pairs:
-        split_key = key.split(".")
+    last_device = builder.finish()
+    if last_device is not None:
+        devices.append(last_device)
+
+    return devices
+
+
+def to_raw_rows(json_string: str) -> List[Tuple[str, RawRow]]:
+    """Maps JSON result from router to the unconverted values of every row.
+
+    Every row is returned as a tuple of the IP address and the raw values of the columns, in the order of
+    `CLIENT_COLUMN_OIDS`. Columns without a value are None. Use `device_from_raw_row` to convert a row to a Device.
+    """
+    return cast(List[Tuple[str, RawRow]], json.loads(json_string, object_pairs_hook=to_raw_rows_2))
 
-        if len(split_key) < 19:
-            _LOGGER.warning("Found non-OID key: %s, with value: %s", key, value)
+
+def to_raw_rows_2(list_of_pairs: List[Tuple[str, str]]) -> List[Tuple[str, RawRow]]:
+    """Maps JSON result from router to the unconverted values of every row."""
+    rows: List[Tuple[str, RawRow]] = []
+    current_ip: Optional[str] = None
+    current_values: List[Optional[str]] = []
+    ignored_keys = _IgnoredKeys()
+
+    for key, value in list_of_pairs:
+        column_and_index = _split_key(key)
+        if column_and_index is None:
+            ignored_keys.add_non_oid_key(key)
             continue
 
-        oid = ".".join(split_key[:16])
-
-        # ip address, either ipv4 or ipv6. ip version is specified by "split_key[17:19]", which can be ignored.
-        ip_split = split_key[19:]
-        ip_bytes = bytes(map(int, ip_split))
-        ip = str(ipaddress.ip_address(ip_bytes))
-
-        if current_device is None or current_device.ip != ip:
-            current_device = Device(ip)
-            devices.append(current_device)
-
-        if oid == CLIENT_HOST_NAME_OID:
-            current_device.hostname = value
-        elif oid == CLIENT_MAC_OID:
-            current_device.mac = format_mac(value)
-        elif oid == CLIENT_ADAPTER_TYPE_OID:
-            current_device.adapter_type = LanClientAdapterType(int(value))
-        elif oid == CLIENT_TYPE_OID:
-            current_device.type = LanClientType(int(value))
-        elif oid == CLIENT_LEASE_END_OID:
-            current_device.lease_end = format_date(value)
-        elif oid == CLIENT_ROW_STATUS_OID:
-            current_device.row_status = value
-        elif oid == CLIENT_ONLINE_OID:
-            current_device.online = value == "1"
-        elif oid == CLIENT_COMMENT_OID:
-            current_device.comment = value
-        elif oid == CLIENT_DEVICE_NAME_OID:
-            current_device.device_name = value
+        column, index = column_and_index
+        ip = index_to_ip(index)
+
+        if current_ip != ip:
+            if current_ip is not None:
+                rows.append((current_ip, tuple(current_values)))
+            current_ip = ip
+            current_values = [None] * len(_COLUMN_POSITIONS)
+
+        position = _COLUMN_POSITIONS.get(column)
+        if position is None:
+            ignored_keys.add_unknown_oid(key)
         else:
-            _LOGGER.warn("Unknown OID: %s", key)
+            current_values[position] = value
 
-    return devices
+    if current_ip is not None:
+        rows.append((current_ip, tuple(current_values)))
 
+    ignored_keys.log()
+
+    return rows
+
+
+def devices_from_raw_rows(raw_rows: Iterable[Tuple[str, RawRow]]) -> List[Device]:
+    """Convert the rows returned by `to_raw_rows` to Devices, converting the MAC addresses in bulk."""
+    return DeviceBuilder().add_raw_rows(raw_rows)
+
+
+def device_from_raw_row(ip: str, raw_row: RawRow) -> Device:
+    """Convert a row returned by `to_raw_rows` to a frozen Device."""
+    device = Device(ip)
+
+    for setter, value in zip(_COLUMN_SETTERS.values(), raw_row):
+        if value is not None:
+            setter(device, value)
+
+    device.freeze()
+    return device
+
+
+class DeviceBuilder:
+    """Builds Devices from the key/value pairs of a getConnDevices response.
+
+    The router returns the rows of the LAN client table ordered by IP address, so a device is complete as soon as a
+    key for another IP address is encountered.
+
+    With `defer_conversion` the MAC addresses are collected and converted in bulk, and the lease end dates validated
+    in bulk, once for all devices that are completed by a call to `add_pairs` or `finish`. Lease end dates are only
+    decoded when `Device.lease_end` is read.
+
+    The returned devices are complete, so they are frozen.
+    """
+
+    def __init__(self, defer_conversion: bool = True) -> None:
+        self._current_device: Optional[Device] = None
+        self._ignored_keys = _IgnoredKeys()
+        self._setters = dict(_COLUMN_SETTERS)
+        self._deferred: List[Tuple[Device, Callable[[Device, str], None], str]] = []
+
+        if defer_conversion:
+            self._setters[_column(CLIENT_MAC_OID)] = self._defer_mac
+            self._setters[_column(CLIENT_LEASE_END_OID)] = self._defer_lease_end
+
+    def add_pairs(self, list_of_pairs: Iterable[Tuple[str, str]]) -> List[Device]:
+        """Add key/value pairs and return the devices that are completed by them."""
+        devices: List[Device] = []
+        current_device = self._current_device
+
+        for key, value in list_of_pairs:
+            column_and_index = _split_key(key)
+            if column_and_index is None:
+                self._ignored_keys.add_non_oid_key(key)
+                continue
+
+            column, index = column_and_index
+            ip = index_to_ip(index)
+
+            if current_device is None or current_device.ip != ip:
+                if current_device is not None:
+                    devices.append(current_device)
+                current_device = Device(ip)
+
+            setter = self._setters.get(column)
+            if setter is None:
+                self._ignored_keys.add_unknown_oid(key)
+                continue
+
+            try:
+                setter(current_device, value)
+            except (IndexError, ValueError):
+                self._raise_first_error()
+                raise
+
+        self._current_device = current_device
+
+        if self._deferred:
+            self._convert_deferred(current_device)
+
+        for device in devices:
+            device.freeze()
+
+        return devices
+
+    def add_raw_rows(self, raw_rows: Iterable[Tuple[str, RawRow]]) -> List[Device]:
+        """Convert complete rows, as returned by `to_raw_rows`, to Devices."""
+        devices: List[Device] = []
+        setters = [self._setters[column] for column in _COLUMN_POSITIONS]
+
+        for ip, raw_row in raw_rows:
+            device = Device(ip)
+
+            for setter, value in zip(setters, raw_row):
+                if value is not None:
+                    try:
+                        setter(device, value)
+                    except (IndexError, ValueError):
+                        self._raise_first_error()
+                        raise
+
+            devices.append(device)
+
+        if self._deferred:
+            self._convert_deferred(self._current_device)
+
+        for device in devices:
+            device.freeze()
+
+        return devices
+
+    def finish(self) -> Optional[Device]:
+        """Return the last device, which is completed because no more pairs will follow."""
+        device = self._current_device
+        self._current_device = None
+
+        if self._deferred:
+            self._convert_deferred(None)
+
+        self._ignored_keys.log()
+
+        if device is not None:
+            device.freeze()
+        return device
+
+    def _defer_mac(self, device: Device, value: str) -> None:
+        self._deferred.append((device, _set_mac, value))
+
+    def _defer_lease_end(self, device: Device, value: str) -> None:
+        self._deferred.append((device, _set_lease_end, value))
+
+    def _raise_first_error(self) -> None:
+        """Convert all deferred values before the error of an invalid value that isn't deferred is raised.
+
+        The deferred values come earlier in the response, so the error of an invalid deferred value is raised instead.
+        """
+        if self._deferred:
+            self._convert_deferred(None)
+
+    def _convert_deferred(self, current_device: Optional[Device]) -> None:
+        """Convert the deferred values of all devices except the current device, which may still receive values."""
+        deferred = self._deferred
+        end = len(deferred)
+
+        while end > 0 and deferred[end - 1][0] is current_device:
+            end -= 1
+
+        if end == 0:
+            return
+
+        completed = deferred[:end]
+        self._deferred = deferred[end:]
+
+        mac_values = [(device, value) for device, setter, value in completed if setter is _set_mac]
+        lease_end_values = [(device, value) for device, setter, value in completed if setter is _set_lease_end]
+
+        try:
+            macs = format_macs([value for _, value in mac_values])
+            validate_dates([value for _, value in lease_end_values])
+        except (IndexError, ValueError):
+            # Convert the values one by one, in the order of the response, so the error of the first invalid value is
+            # raised.
+            for device, setter, value in completed:
+                setter(device, value)
+            raise
+
+        for (device, _), mac in zip(mac_values, macs):
+            device.mac = mac
+        for device, value in lease_end_values:
+            device.raw_lease_end = value
+
+
+class _IgnoredKeys:
+    """Collects the keys that are skipped while mapping a response, so they are logged once per response.
+
+    Every response contains non-OID keys like "routerCurrentTime" and "1": "Finish", so these are only logged at debug
+    level. Unknown OIDs are logged as a warning.
+    """
+
+    __slots__ = ("non_oid_keys", "non_oid_key_count", "unknown_oids", "unknown_oid_count")
+
+    def __init__(self) -> None:
+        self.non_oid_keys: List[str] = []
+        self.non_oid_key_count = 0
+        self.unknown_oids: List[str] = []
+        self.unknown_oid_count = 0
+
+    def add_non_oid_key(self, key: str) -> None:
+        self.non_oid_key_count += 1
+        if len(self.non_oid_keys) < _MAX_LOGGED_KEYS:
+            self.non_oid_keys.append(key)
+
+    def add_unknown_oid(self, key: str) -> None:
+        self.unknown_oid_count += 1
+        if len(self.unknown_oids) < _MAX_LOGGED_KEYS:
+            self.unknown_oids.append(key)
+
+    def log(self) -> None:
+        if self.unknown_oid_count:
+            _LOGGER.warning(
+                "Found %d unknown OIDs: %s", self.unknown_oid_count, _format_keys(self.unknown_oids, self.unknown_oid_count)
+            )
+        if self.non_oid_key_count:
+            _LOGGER.debug(
+                "Found %d non-OID keys: %s", self.non_oid_key_count, _format_keys(self.non_oid_keys, self.non_oid_key_count)
+            )
+
+        self.non_oid_keys = []
+        self.non_oid_key_count = 0
+        self.unknown_oids = []
+        self.unknown_oid_count = 0
 
-def format_mac(value: str) -> str:
-    if not re.fullmatch(r"^\$[0-9A-Fa-f]{12}$", value):
-        raise ValueError(f"Received invalid MAC value: {value}")
 
-    value = value[1:]
-    mac = ""
+def _format_keys(keys: List[str], count: int) -> str:
+    return ", ".join(keys) + (", ..." if count > len(keys) else "")
 
-    for i in range(6):
-        mac += value[i * 2 : i * 2 + 2]
-        if i + 1 < 6:
-            mac += ":"
 
-    return mac
+class ConnDevicesParser:
+    """Incremental parser for the JSON response of getConnDevices.
+
+    Text can be fed in arbitrary chunks and devices are returned as soon as all their rows are received, so the
+    complete response never has to be kept in memory.
+    """
+
+    def __init__(self) -> None:
+        self._reader = JsonPairReader()
+        self._builder = DeviceBuilder()
+
+    def feed(self, text: str) -> List[Device]:
+        """Feed the next chunk of the response and return the devices that are completed by it."""
+        return self._builder.add_pairs(self._reader.feed(text))
+
+    def close(self) -> List[Device]:
+        """Signal the end of the response and return the remaining devices."""
+        devices = self._builder.add_pairs(self._reader.close())
+
+        last_device = self._builder.finish()
+        if last_device is not None:
+            devices.append(last_device)
+
+        return devices
+
+
+class JsonPairReader:
+    """Incremental reader of the key/value pairs of a flat JSON object, as returned by the router."""
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        self._expect_separator = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Feed the next chunk of text and return the pairs that are completed by it."""
+        self._buffer += text
+        return self._read_pairs(final=False)
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Signal the end of the text and return the remaining pairs."""
+        pairs = self._read_pairs(final=True)
+
+        if not self._finished or self._buffer.strip():
+            raise ValueError("Received incomplete JSON response")
+
+        return pairs
+
+    def _read_pairs(self, final: bool) -> List[Tuple[str, Any]]:
+        buffer = self._buffer
+        length = len(buffer)
+        position = 0
+        pairs: List[Tuple[str, Any]] = []
+
+        if not self._started:
+            position = _skip_whitespace(buffer, position)
+            if position == length:
+                return pairs
+            if buffer[position] != "{":
+                raise ValueError("Expected response to be a JSON object")
+            position += 1
+            self._started = True
+
+        while not self._finished:
+            pair_start = position
+            position = _skip_whitespace(buffer, position)
+
+            if position == length:
+                break
+
+            if buffer[position] == "}":
+                position += 1
+                self._finished = True
+                break
+
+            try:
+                if self._expect_separator:
+                    if buffer[position] != ",":
+                        raise ValueError(f"Expected ',' at position {position} of response")
+                    position = _skip_whitespace(buffer, position + 1)
+
+                key, position = self._decoder.raw_decode(buffer, position)
+                position = _skip_whitespace(buffer, position)
+                if position < length and buffer[position] != ":":
+                    raise ValueError(f"Expected ':' at position {position} of response")
+                value, position = self._decoder.raw_decode(buffer, _skip_whitespace(buffer, position + 1))
+            except (IndexError, json.JSONDecodeError):
+                # The pair is not complete yet, it is read again when more text is fed.
+                position = pair_start
+                if final:
+                    raise ValueError("Received incomplete JSON response")
+                break
+
+            # A value at the end of the buffer could still continue in the next chunk (e.g. a number).
+            if position == length and not final:
+                position = pair_start
+                break
+
+            pairs.append((key, value))
+            self._expect_separator = True
+
+        self._buffer = buffer[position:]
+
+        return pairs
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    return _WHITESPACE.match(text, position).end()  # type: ignore
+
+
+def _split_key(key: str) -> Optional[Tuple[str, str]]:
+    """Split an OID key of the LAN client table into its column and index.
+
+    The column is empty for OIDs outside of the LAN client table. None is returned for keys that are not an OID.
+    """
+    if key.startswith(_CLIENT_ENTRY_PREFIX):
+        column, _, index = key[_CLIENT_ENTRY_PREFIX_LENGTH:].partition(".")
+
+        # The index consists of the interface, the ip version, the address length and the address itself.
+        if index.count(".") >= 2:
+            return column, index
+    else:
+        split_key = key.split(".")
+
+        if len(split_key) >= 19:
+            return "", ".".join(split_key[16:])
+
+    return None
+
+
+@lru_cache(maxsize=4096)
+def index_to_ip(index: str) -> str:
+    """Convert the index of a LAN client table row to an IP address.
+
+    The index is formatted as "<interface>.<ip version>.<address length>.<address bytes>". The ip version can be
+    ignored because the address length already determines if it is an IPv4 or IPv6 address.
+    """
+    ip_bytes = bytes(map(int, index.split(".")[3:]))
+    return str(ipaddress.ip_address(ip_bytes))
+
+
+def _set_hostname(device: Device, value: str) -> None:
+    device.hostname = value
+
+
+def _set_mac(device: Device, value: str) -> None:
+    device.mac = format_mac(value)
+
+
+def _set_adapter_type(device: Device, value: str) -> None:
+    device.adapter_type = LanClientAdapterType(int(value))
+
+
+def _set_type(device: Device, value: str) -> None:
+    device.type = LanClientType(int(value))
+
+
+def _set_lease_end(device: Device, value: str) -> None:
+    validate_date(value)
+    device.raw_lease_end = value
+
+
+def _set_row_status(device: Device, value: str) -> None:
+    device.row_status = value
+
+
+def _set_online(device: Device, value: str) -> None:
+    device.online = value == "1"
+
+
+def _set_comment(device: Device, value: str) -> None:
+    device.comment = value
+
+
+def _set_device_name(device: Device, value: str) -> None:
+    device.device_name = value
+
+
+# Maximum number of ignored keys that are included in the log message of a response.
+_MAX_LOGGED_KEYS = 5
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_CLIENT_ENTRY_PREFIX = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + "."
+_CLIENT_ENTRY_PREFIX_LENGTH = len(_CLIENT_ENTRY_PREFIX)
+
+
+def _column(oid: str) -> str:
+    return oid[_CLIENT_ENTRY_PREFIX_LENGTH:]
+
+
+# Maps the column number of the LAN client table to the function that stores its value on a Device.
+_COLUMN_SETTERS: Dict[str, Callable[[Device, str], None]] = {
+    _column(CLIENT_HOST_NAME_OID): _set_hostname,
+    _column(CLIENT_MAC_OID): _set_mac,
+    _column(CLIENT_ADAPTER_TYPE_OID): _set_adapter_type,
+    _column(CLIENT_TYPE_OID): _set_type,
+    _column(CLIENT_LEASE_END_OID): _set_lease_end,
+    _column(CLIENT_ROW_STATUS_OID): _set_row_status,
+    _column(CLIENT_ONLINE_OID): _set_online,
+    _column(CLIENT_COMMENT_OID): _set_comment,
+    _column(CLIENT_DEVICE_NAME_OID): _set_device_name,
+}
+
+# Position of every column in a raw row.
+_COLUMN_POSITIONS: Dict[str, int] = {column: position for position, column in enumerate(_COLUMN_SETTERS)}
+
+# The OIDs of the columns of a raw row, in order.
+CLIENT_COLUMN_OIDS: Tuple[str, ...] = tuple(_CLIENT_ENTRY_PREFIX + column for column in _COLUMN_SETTERS)
+
+
+_MAC_PATTERN = re.compile(r"\$[0-9A-Fa-f]{12}")
+
+# Validates many MAC values at once, joined by newlines.
+_MAC_LIST_PATTERN = re.compile(r"(?:\$[0-9A-Fa-f]{12}\n)+")
+
+
+def format_mac(value: str) -> str:
+    if not _MAC_PATTERN.fullmatch(value):
+        raise ValueError(f"Received invalid MAC value: {value}")
 
+    return f"{value[1:3]}:{value[3:5]}:{value[5:7]}:{value[7:9]}:{value[9:11]}:{value[11:13]}"
 
-def format_date(value: str) -> str:
-    if not re.fullmatch(r"^\$[0-9A-Fa-f]+$", value):
-        raise ValueError(f"Received invalid date value: {value}")
 
-    hex_array = bytes.fromhex(value[1:])
+def format_macs(values: List[str]) -> List[str]:
+    """Convert many MAC values like `format_mac`, raising the same error for the first invalid value."""
+    if not values:
+        return []
 
-    years = hex_array[0] * 256 + hex_array[1]
-    months = hex_array[2]
-    days = hex_array[3]
+    joined = "\n".join(values) + "\n"
 
-    hours = hex_array[4]
-    minutes = hex_array[5]
-    seconds = hex_array[6]
-    micro_seconds = hex_array[7]
+    # A value that contains a newline changes the length, so it can't be mistaken for two valid values.
+    if len(joined) != 14 * len(values) or not _MAC_LIST_PATTERN.fullmatch(joined):
+        return [format_mac(value) for value in values]
 
-    date = "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}:{:02d}".format(
-        years, months, days, hours, minutes, seconds, micro_seconds
-    )
-    return date
+    return [f"{value[1:3]}:{value[3:5]}:{value[5:7]}:{value[7:9]}:{value[9:11]}:{value[11:13]}" for value in values]
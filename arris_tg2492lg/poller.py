@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import AsyncIterator, List, Optional
+
+from .connect_box import ConnectBox
+from .const import POLL_MAX_BACKOFF, POLL_MAX_INTERVAL, POLL_MIN_INTERVAL
+from .delta import DeviceDelta
+
+_LOGGER = logging.getLogger(__name__)
+
+# Factor by which the interval grows after a poll without changes.
+_INTERVAL_INCREASE = 1.5
+
+# The interval is at least this many times the response time of the router, so a slow router is polled less often.
+_LATENCY_FACTOR = 10
+
+
+@dataclass
+class PollUpdate:
+    """The result of a single poll of a `ConnectBoxPoller`."""
+
+    delta: Optional[DeviceDelta] = None
+    error: Optional[Exception] = None
+    latency: float = 0.0
+    next_interval: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AdaptiveInterval:
+    """Computes the time until the next poll.
+
+    After a poll with changes the interval drops to `min_interval`. Every poll without changes increases the interval
+    by half, up to `max_interval`. The interval is never shorter than ten times the response time of the router.
+    After a failed poll the next poll is delayed exponentially, up to `max_backoff`, with a random jitter so that many
+    pollers don't retry at the same time.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta = POLL_MIN_INTERVAL,
+        max_interval: timedelta = POLL_MAX_INTERVAL,
+        max_backoff: timedelta = POLL_MAX_BACKOFF,
+        seed: Optional[int] = None,
+    ):
+        self._min_interval = min_interval.total_seconds()
+        self._max_interval = max_interval.total_seconds()
+        self._max_backoff = max_backoff.total_seconds()
+        self._random = random.Random(seed)
+        self._interval = self._min_interval
+        self.failures = 0
+
+    def success(self, changed: bool, latency: float) -> float:
+        """Return the interval after a successful poll that took `latency` seconds."""
+        self.failures = 0
+
+        if changed:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * _INTERVAL_INCREASE, self._max_interval)
+
+        return max(self._interval, latency * _LATENCY_FACTOR)
+
+    def failure(self) -> float:
+        """Return the delay after a failed poll."""
+        self.failures += 1
+
+        backoff = min(self._min_interval * 2 ** min(self.failures, 32), self._max_backoff)
+        return self._random.uniform(backoff / 2, backoff)
+
+
+class ConnectBoxPoller:
+    """Polls the connected devices of a router with an interval that adapts to the router.
+
+    A router with changing devices is polled every `min_interval`, an idle router less and less often, up to every
+    `max_interval`. Failed polls, including polls that are rejected with 401 after logging in again, are retried with
+    an exponential backoff. See `AdaptiveInterval`.
+
+    Updates are received by iterating over `subscribe()`.
+
+    A poll that takes longer than `timeout` seconds fails. Pollers that share a `semaphore` don't poll more routers at
+    the same time than the semaphore allows, see `ConnectBoxFleet.create_poller`.
+    """
+
+    def __init__(
+        self,
+        connect_box: ConnectBox,
+        min_interval: timedelta = POLL_MIN_INTERVAL,
+        max_interval: timedelta = POLL_MAX_INTERVAL,
+        max_backoff: timedelta = POLL_MAX_BACKOFF,
+        timeout: Optional[float] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ):
+        self._connect_box = connect_box
+        self._interval = AdaptiveInterval(min_interval, max_interval, max_backoff)
+        self._timeout = timeout
+        self._semaphore = semaphore
+        self._subscribers: List[asyncio.Queue[Optional[PollUpdate]]] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def __aenter__(self) -> ConnectBoxPoller:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.async_stop()
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop polling and end the iteration of all subscribers."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    async def async_poll(self) -> PollUpdate:
+        """Poll the router once and publish the update to the subscribers."""
+        if self._semaphore is None:
+            return await self._async_poll()
+
+        async with self._semaphore:
+            return await self._async_poll()
+
+    async def _async_poll(self) -> PollUpdate:
+        start = time.monotonic()
+
+        try:
+            delta = await asyncio.wait_for(self._connect_box.async_get_connected_devices_delta(), self._timeout)
+        except Exception as exc:
+            next_interval = self._interval.failure()
+            _LOGGER.warning("Failed to poll router, retrying in %.0f seconds: %s", next_interval, exc)
+            update = PollUpdate(error=exc, latency=time.monotonic() - start, next_interval=next_interval)
+        else:
+            latency = time.monotonic() - start
+            update = PollUpdate(delta, latency=latency, next_interval=self._interval.success(bool(delta), latency))
+
+        for queue in self._subscribers:
+            queue.put_nowait(update)
+
+        return update
+
+    async def subscribe(self, include_unchanged: bool = False) -> AsyncIterator[PollUpdate]:
+        """Iterate over the updates of polls with changes or errors, until the poller is stopped.
+
+        With `include_unchanged` the updates of polls without changes are included as well.
+        """
+        queue: asyncio.Queue[Optional[PollUpdate]] = asyncio.Queue()
+        self._subscribers.append(queue)
+
+        try:
+            while True:
+                update = await queue.get()
+                if update is None:
+                    return
+                if include_unchanged or update.delta is None or update.delta:
+                    yield update
+        finally:
+            self._subscribers.remove(queue)
+
+    async def _async_run(self) -> None:
+        while True:
+            update = await self.async_poll()
+            await asyncio.sleep(update.next_interval)
@@ -0,0 +1,110 @@
+"""Recording of raw router responses, to reproduce parse problems and replay real payloads without a router.
+
+A recording is an append-only file that starts with `_MAGIC`, followed by one record per response:
+
+- a header with the time of the response, the length of the key and the length of the compressed body;
+- the key, the operation and query of the request joined by "?", e.g. "snmpGet?1.3.6.1.2.1.1.3.0";
+- the body, compressed with zlib.
+
+Every record is compressed on its own, so records can be appended to an existing recording and a recording that was
+cut off by a crash can be read up to the last complete record.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import time
+import zlib
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+_MAGIC = b"ATGREC1\n"
+_HEADER = struct.Struct("<dHI")
+
+
+@dataclass
+class RecordedPayload:
+    """A response body of the router, `timestamp` is the time of the response in seconds since the epoch."""
+
+    timestamp: float
+    operation: str
+    query: str
+    body: str
+
+
+class PayloadRecorder:
+    """Appends the getConnDevices and snmpGet responses of a ConnectBox to a recording.
+
+    Pass the recorder as `recorder` to ConnectBox. Responses are compressed and written when they are received, so
+    recording adds some work to every request; it is meant to be enabled while investigating a problem.
+    """
+
+    def __init__(self, path: Union[str, Path], compression_level: int = 6):
+        self._path = Path(path)
+        self._compression_level = compression_level
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> PayloadRecorder:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(self, operation: str, query: str, body: str, timestamp: Optional[float] = None) -> None:
+        """Append a response to the recording."""
+        if self._file is None:
+            self._file = open(self._path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_MAGIC)
+
+        key = f"{operation}?{query}".encode("utf-8")
+        compressed = zlib.compress(body.encode("utf-8"), self._compression_level)
+        header = _HEADER.pack(time.time() if timestamp is None else timestamp, len(key), len(compressed))
+
+        # A single write per record, so a crash doesn't leave a header without its body behind a complete record.
+        self._file.write(b"".join((header, key, compressed)))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_recording(path: Union[str, Path], operation: Optional[str] = None) -> Iterator[RecordedPayload]:
+    """Iterate over the responses in a recording, optionally only those of one operation.
+
+    The recording is memory-mapped and every body is decompressed straight from the mapping, so reading a large
+    recording doesn't load it into memory. A cut off record at the end of the recording is ignored.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a payload recording: {path}")
+
+        size = file.seek(0, 2)
+        if size == len(_MAGIC):
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping, memoryview(mapping) as view:
+            offset = len(_MAGIC)
+
+            while offset + _HEADER.size <= size:
+                timestamp, key_length, body_length = _HEADER.unpack_from(view, offset)
+                key_start = offset + _HEADER.size
+                body_start = key_start + key_length
+                offset = body_start + body_length
+
+                if offset > size:
+                    return
+
+                record_operation, _, query = bytes(view[key_start:body_start]).decode("utf-8").partition("?")
+                if operation is not None and record_operation != operation:
+                    continue
+
+                with view[body_start:offset] as compressed:
+                    body = zlib.decompress(compressed).decode("utf-8")
+
+                yield RecordedPayload(timestamp, record_operation, query, body)
@@ -0,0 +1,25 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from .const import CONNECT_TIMEOUT, CONNECTION_LIMIT_PER_HOST, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, READ_TIMEOUT
+
+
+def create_websession(limit_per_host: int = CONNECTION_LIMIT_PER_HOST) -> ClientSession:
+    """Create a ClientSession that is tuned for the web server of the router.
+
+    Connections are kept alive and reused, at most `limit_per_host` per router, so login, data requests and logout
+    share a connection instead of paying the (slow) connection setup of the router for every request. More than one
+    connection lets other requests proceed while a response is streamed, and lets snmpGet requests run concurrently.
+    Idle connections are closed by the client before the router closes them. Resolved host names are cached.
+
+    There is no limit on the total duration of a request, only on the time to connect and the time between received
+    data, so a large streamed response isn't cut off.
+    """
+    connector = TCPConnector(
+        limit=0,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_TIMEOUT.total_seconds(),
+        ttl_dns_cache=int(DNS_CACHE_TTL.total_seconds()),
+    )
+    timeout = ClientTimeout(total=None, connect=CONNECT_TIMEOUT.total_seconds(), sock_read=READ_TIMEOUT.total_seconds())
+
+    return ClientSession(connector=connector, timeout=timeout)
@@ -0,0 +1,55 @@
+from typing import Dict, Optional, Tuple
+
+from .mib_mapper import index_to_ip
+
+
+class TableRow:
+    """A row of an SNMP table, returned by `ConnectBox.async_walk_table`.
+
+    The values are keyed by column number. The index is the OID suffix that identifies the row, e.g.
+    "200.1.4.192.168.178.2" for a row of the LAN client table.
+    """
+
+    __slots__ = ("index", "values")
+
+    def __init__(self, index: str, values: Dict[int, str]) -> None:
+        self.index = index
+        self.values = values
+
+    @property
+    def ip(self) -> str:
+        """The IP address of a row that is indexed by interface, ip version, address length and address."""
+        return index_to_ip(self.index)
+
+    def get(self, column: int, default: Optional[str] = None) -> Optional[str]:
+        return self.values.get(column, default)
+
+    def __getitem__(self, column: int) -> str:
+        return self.values[column]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TableRow):
+            return NotImplemented
+        return self.index == other.index and self.values == other.values
+
+    def __repr__(self) -> str:
+        return "TableRow(%r, %r)" % (self.index, self.values)
+
+
+def split_table_key(entry_oid: str, key: str) -> Optional[Tuple[int, str]]:
+    """Split the OID of a table cell in its column number and row index.
+
+    None is returned for keys that are not part of the table, like the "1": "Finish" entry the router adds to every
+    response.
+    """
+    prefix = entry_oid + "."
+
+    if not key.startswith(prefix):
+        return None
+
+    column, _, index = key[len(prefix) :].partition(".")
+
+    if not column.isdigit() or not index:
+        return None
+
+    return int(column), index
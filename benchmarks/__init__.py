@@ -0,0 +1,5 @@
+"""Performance benchmarks of arris_tg2492lg.
+
+Run them with `python -m benchmarks --output results.json` and compare two runs with
+`python -m benchmarks --output new.json --baseline old.json`.
+"""
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import platform
+import sys
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from arris_tg2492lg.const import __version__
+
+from .client import async_benchmark_body_logging, async_benchmark_end_to_end, async_benchmark_login
+from .connection import async_benchmark_connection
+from .fleet import async_benchmark_fleet
+from .loop_stall import async_benchmark_loop_stall
+from .parsing import benchmark_format, benchmark_mapper, benchmark_parse
+
+CLIENT_COUNTS = [10, 100, 1000, 10000]
+QUICK_CLIENT_COUNTS = [10, 100, 1000]
+IPV6_SHARES = [0.0, 0.5, 1.0]
+LATENCIES = [0.0, 0.005, 0.05]
+CONNECTION_LATENCIES = [0.0, 0.02]
+
+# Client count of the comparison with the mapper as it was before the OID dispatch table.
+MAPPER_CLIENTS = 1000
+
+# Client count of the benchmark of response body logging.
+BODY_LOGGING_CLIENTS = 1000
+
+# Number of routers and the concurrency limits of the fleet benchmark.
+FLEET_ROUTERS = 8
+FLEET_CONCURRENCIES = [1, 8]
+
+# Client count, number of routers and number of polls of the loop stall benchmark.
+LOOP_STALL = (5000, 4, 5)
+QUICK_LOOP_STALL = (1000, 2, 3)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark parsing, client throughput and login overhead of arris_tg2492lg.")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare the results with the JSON results of an earlier run")
+    parser.add_argument("--quick", action="store_true", help="use smaller payloads and shorter measurements")
+    parser.add_argument("--clients", type=int, nargs="+", help="number of clients in the generated payloads")
+    parser.add_argument("--latency", type=float, nargs="+", help="latency in seconds of the stand-in router")
+    parser.add_argument("--calls", type=int, default=50, help="number of calls per client measurement")
+    parser.add_argument("--concurrency", type=int, default=5, help="number of concurrent calls")
+    args = parser.parse_args()
+
+    client_counts = args.clients or (QUICK_CLIENT_COUNTS if args.quick else CLIENT_COUNTS)
+    latencies = args.latency or LATENCIES
+    calls = 10 if args.quick and args.calls == 50 else args.calls
+    min_time = 0.05 if args.quick else 0.2
+
+    results = {
+        "metadata": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "parse": benchmark_parse(client_counts, IPV6_SHARES, min_time),
+        "mapper": benchmark_mapper(MAPPER_CLIENTS, min_time),
+        "format": benchmark_format(min_time),
+        "end_to_end": asyncio.run(async_benchmark_end_to_end(client_counts, latencies, calls, args.concurrency)),
+        "login": asyncio.run(async_benchmark_login(latencies, calls)),
+        "body_logging": asyncio.run(async_benchmark_body_logging(BODY_LOGGING_CLIENTS, calls)),
+        "connection": asyncio.run(async_benchmark_connection(CONNECTION_LATENCIES, calls)),
+        "fleet": asyncio.run(async_benchmark_fleet(FLEET_ROUTERS, latencies, FLEET_CONCURRENCIES, 3 if args.quick else 10)),
+        "loop_stall": asyncio.run(async_benchmark_loop_stall(*(QUICK_LOOP_STALL if args.quick else LOOP_STALL))),
+    }
+
+    text = json.dumps(results, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            print_comparison(json.load(baseline_file), results)
+
+
+def print_comparison(baseline: Dict[str, Any], results: Dict[str, Any]) -> None:
+    """Print the measurements that are present in both runs, with the relative change."""
+    baseline_values = dict(_flatten(baseline))
+
+    for name, value in _flatten(results):
+        baseline_value = baseline_values.get(name)
+
+        if not baseline_value:
+            continue
+
+        print(
+            f"{name}: {baseline_value:.6g} -> {value:.6g} ({(value - baseline_value) / baseline_value:+.1%})", file=sys.stderr
+        )
+
+
+def _flatten(results: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    """Yield the measurements with a name that identifies the measurement and its parameters."""
+    for section, section_results in results.items():
+        if section == "metadata":
+            continue
+
+        entries: List[Tuple[str, Dict[str, Any]]]
+        if isinstance(section_results, dict):
+            entries = list(section_results.items())
+        else:
+            entries = [(_parameters(entry), entry) for entry in section_results]
+
+        for parameters, entry in entries:
+            for key, value in entry.items():
+                if key.endswith(("_second", "_seconds", "_bytes")):
+                    yield f"{section}[{parameters}].{key}", value
+
+
+def _parameters(entry: Dict[str, Any]) -> str:
+    return ",".join(
+        f"{key}={entry[key]}"
+        for key in ("mode", "clients", "ipv6_share", "latency", "connection_latency", "routers", "max_concurrency")
+        if key in entry
+    )
+
+
+if __name__ == "__main__":
+    main()
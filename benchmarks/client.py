@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+
+from aiohttp import ClientSession
+from typing import Any, Dict, List, Sequence
+
+from arris_tg2492lg import BodyLogging, ConnectBox
+from arris_tg2492lg.emulator import RouterEmulator
+
+from .timing import async_measure
+
+PASSWORD = "password"
+
+
+async def async_benchmark_end_to_end(
+    client_counts: Sequence[int], latencies: Sequence[float], calls: int, concurrency: int
+) -> List[Dict[str, Any]]:
+    """Measure `async_get_connected_devices` against a router emulator.
+
+    Calls are made one after the other and `concurrency` at a time. The login happens before the measurement.
+    """
+    results = []
+
+    for client_count in client_counts:
+        for latency in latencies:
+            emulator = RouterEmulator(PASSWORD, client_count, latency=latency)
+
+            async with emulator, ClientSession() as session:
+                connect_box = ConnectBox(session, emulator.hostname, PASSWORD)
+                await connect_box.async_get_connected_devices()
+
+                sequential = await async_measure(connect_box.async_get_connected_devices, calls)
+
+                start = time.perf_counter()
+                for _ in range(max(calls // concurrency, 1)):
+                    await asyncio.gather(*(connect_box.async_get_connected_devices() for _ in range(concurrency)))
+                elapsed = time.perf_counter() - start
+
+                results.append(
+                    {
+                        "clients": client_count,
+                        "latency": latency,
+                        "sequential_calls_per_second": sequential["calls_per_second"],
+                        "concurrency": concurrency,
+                        "concurrent_calls_per_second": max(calls // concurrency, 1) * concurrency / elapsed,
+                    }
+                )
+
+    return results
+
+
+async def async_benchmark_login(latencies: Sequence[float], calls: int) -> List[Dict[str, Any]]:
+    """Measure the cost of a login and of a request that is rejected with 401 and retried after logging in again."""
+    results = []
+
+    for latency in latencies:
+        emulator = RouterEmulator(PASSWORD, latency=latency)
+
+        async with emulator, ClientSession() as session:
+            connect_box = ConnectBox(session, emulator.hostname, PASSWORD)
+
+            login = await async_measure(connect_box.async_login, calls)
+            request = await async_measure(connect_box.async_get_connected_devices, calls)
+
+            async def get_connected_devices_after_expiry() -> None:
+                emulator.expire_sessions()
+                await connect_box.async_get_connected_devices()
+
+            logins = emulator.request_counts["/login"]
+            relogin = await async_measure(get_connected_devices_after_expiry, calls)
+
+            results.append(
+                {
+                    "latency": latency,
+                    "login_seconds": login["seconds_per_call"],
+                    "request_seconds": request["seconds_per_call"],
+                    "request_with_relogin_seconds": relogin["seconds_per_call"],
+                    "relogin_overhead_seconds": relogin["seconds_per_call"] - request["seconds_per_call"],
+                    "logins_per_relogin_request": (emulator.request_counts["/login"] - logins) / calls,
+                }
+            )
+
+    return results
+
+
+async def async_benchmark_body_logging(client_count: int, calls: int) -> List[Dict[str, Any]]:
+    """Measure `async_get_connected_devices` with debug logging enabled, without and with logging of the full body.
+
+    The log records are formatted and written to the null device, like a debug log that is written to a file.
+    """
+    logger = logging.getLogger("arris_tg2492lg")
+    level = logger.level
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    results = []
+
+    try:
+        for mode in ("disabled", "enabled"):
+            emulator = RouterEmulator(PASSWORD, client_count)
+
+            async with emulator, ClientSession() as session:
+                connect_box = ConnectBox(
+                    session,
+                    emulator.hostname,
+                    PASSWORD,
+                    body_logging=BodyLogging(max_length=2**31) if mode == "enabled" else None,
+                )
+                await connect_box.async_get_connected_devices()
+
+                request = await async_measure(connect_box.async_get_connected_devices, calls)
+
+            results.append({"mode": mode, "clients": client_count, "request_seconds": request["seconds_per_call"]})
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+        handler.close()
+
+    return results
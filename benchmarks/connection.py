@@ -0,0 +1,45 @@
+from aiohttp import ClientSession, TCPConnector
+from typing import Any, Dict, List, Optional, Sequence
+
+from arris_tg2492lg import ConnectBox
+from arris_tg2492lg.emulator import RouterEmulator
+
+from .timing import async_measure
+
+PASSWORD = "password"
+
+
+async def async_benchmark_connection(connection_latencies: Sequence[float], calls: int) -> List[Dict[str, Any]]:
+    """Measure the latency per call when every request opens a new connection and with the session of ConnectBox.
+
+    The router emulator delays the first response on every connection by the connection latency, like the slow
+    connection setup of the router.
+    """
+    results = []
+
+    for connection_latency in connection_latencies:
+        for mode in ("new_connection", "persistent_connection"):
+            emulator = RouterEmulator(PASSWORD, connection_latency=connection_latency)
+
+            async with emulator:
+                websession: Optional[ClientSession] = None
+                if mode == "new_connection":
+                    websession = ClientSession(connector=TCPConnector(force_close=True))
+
+                async with ConnectBox(websession, emulator.hostname, PASSWORD) as connect_box:
+                    await connect_box.async_login()
+                    request = await async_measure(connect_box.async_get_connected_devices, calls)
+
+                if websession is not None:
+                    await websession.close()
+
+            results.append(
+                {
+                    "mode": mode,
+                    "connection_latency": connection_latency,
+                    "request_seconds": request["seconds_per_call"],
+                    "connections": emulator.connection_count,
+                }
+            )
+
+    return results
@@ -0,0 +1,53 @@
+import time
+
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Sequence
+
+from arris_tg2492lg import ConnectBoxFleet
+from arris_tg2492lg.emulator import RouterEmulator
+
+PASSWORD = "password"
+
+
+async def async_benchmark_fleet(
+    router_count: int, latencies: Sequence[float], concurrencies: Sequence[int], polls: int
+) -> List[Dict[str, Any]]:
+    """Measure the wall clock time of polling the connected devices of many routers with different concurrency limits.
+
+    The routers are logged in before the measurement.
+    """
+    results = []
+
+    for latency in latencies:
+        for max_concurrency in concurrencies:
+            async with AsyncExitStack() as stack:
+                emulators = [
+                    await stack.enter_async_context(RouterEmulator(PASSWORD, latency=latency)) for _ in range(router_count)
+                ]
+                fleet = await stack.enter_async_context(
+                    ConnectBoxFleet([(emulator.hostname, PASSWORD) for emulator in emulators], max_concurrency=max_concurrency)
+                )
+
+                await _async_poll(fleet)
+
+                start = time.perf_counter()
+                for _ in range(polls):
+                    await _async_poll(fleet)
+                elapsed = time.perf_counter() - start
+
+            results.append(
+                {
+                    "routers": router_count,
+                    "latency": latency,
+                    "max_concurrency": max_concurrency,
+                    "poll_seconds": elapsed / polls,
+                }
+            )
+
+    return results
+
+
+async def _async_poll(fleet: ConnectBoxFleet) -> None:
+    async for result in fleet.async_get_connected_devices():
+        if result.error is not None:
+            raise result.error
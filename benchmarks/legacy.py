@@ -0,0 +1,61 @@
+import ipaddress
+
+from typing import List, Optional, Tuple
+
+from arris_tg2492lg.const import (
+    CLIENT_ADAPTER_TYPE_OID,
+    CLIENT_COMMENT_OID,
+    CLIENT_DEVICE_NAME_OID,
+    CLIENT_HOST_NAME_OID,
+    CLIENT_LEASE_END_OID,
+    CLIENT_MAC_OID,
+    CLIENT_ONLINE_OID,
+    CLIENT_ROW_STATUS_OID,
+    CLIENT_TYPE_OID,
+)
+from arris_tg2492lg.device import Device, LanClientAdapterType, LanClientType
+from arris_tg2492lg.mib_mapper import format_date, format_mac
+
+
+def legacy_to_devices(list_of_pairs: List[Tuple[str, str]]) -> List[Device]:
+    """The mapper as it was implemented before the OID dispatch table, kept as reference.
+
+    Use it as `object_pairs_hook` of `json.loads`.
+    """
+    devices = []
+    current_device: Optional[Device] = None
+
+    for key, value in list_of_pairs:
+        split_key = key.split(".")
+
+        if len(split_key) < 19:
+            continue
+
+        oid = ".".join(split_key[:16])
+        ip = str(ipaddress.ip_address(bytes(map(int, split_key[19:]))))
+
+        if current_device is None or current_device.ip != ip:
+            current_device = Device(ip)
+            devices.append(current_device)
+
+        if oid == CLIENT_HOST_NAME_OID:
+            current_device.hostname = value
+        elif oid == CLIENT_MAC_OID:
+            current_device.mac = format_mac(value)
+        elif oid == CLIENT_ADAPTER_TYPE_OID:
+            current_device.adapter_type = LanClientAdapterType(int(value))
+        elif oid == CLIENT_TYPE_OID:
+            current_device.type = LanClientType(int(value))
+        elif oid == CLIENT_LEASE_END_OID:
+            format_date(value)
+            current_device.raw_lease_end = value
+        elif oid == CLIENT_ROW_STATUS_OID:
+            current_device.row_status = value
+        elif oid == CLIENT_ONLINE_OID:
+            current_device.online = value == "1"
+        elif oid == CLIENT_COMMENT_OID:
+            current_device.comment = value
+        elif oid == CLIENT_DEVICE_NAME_OID:
+            current_device.device_name = value
+
+    return devices
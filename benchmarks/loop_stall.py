@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from aiohttp import ClientSession
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional
+
+from arris_tg2492lg import ConnectBox
+from arris_tg2492lg.emulator import RouterEmulator
+
+PASSWORD = "password"
+
+# Interval of the ticker that measures how late the event loop runs it.
+TICK_INTERVAL = 0.001
+
+
+async def async_benchmark_loop_stall(client_count: int, router_count: int, polls: int) -> List[Dict[str, Any]]:
+    """Measure how long the event loop is blocked while routers with large client tables are polled.
+
+    A ticker that sleeps for 1 ms records how late it is woken up. The routers are polled with the responses parsed
+    in the event loop, in a thread pool and in a process pool.
+    """
+    results = []
+
+    for mode in ("inline", "thread", "process"):
+        executor: Optional[Executor] = None
+        if mode == "thread":
+            executor = ThreadPoolExecutor()
+        elif mode == "process":
+            executor = ProcessPoolExecutor()
+
+        try:
+            results.append(await _async_measure_stalls(mode, executor, client_count, router_count, polls))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    return results
+
+
+async def _async_measure_stalls(
+    mode: str, executor: Optional[Executor], client_count: int, router_count: int, polls: int
+) -> Dict[str, Any]:
+    async with AsyncExitStack() as stack:
+        session = await stack.enter_async_context(ClientSession())
+        connect_boxes = []
+
+        for _ in range(router_count):
+            emulator = await stack.enter_async_context(RouterEmulator(PASSWORD, client_count))
+            connect_boxes.append(ConnectBox(session, emulator.hostname, PASSWORD, parse_executor=executor))
+
+        # Login and start the workers of the executor before measuring.
+        await asyncio.gather(*(connect_box.async_get_connected_devices() for connect_box in connect_boxes))
+
+        stalls: List[float] = []
+        ticker = asyncio.ensure_future(_async_tick(stalls))
+
+        start = time.perf_counter()
+        for _ in range(polls):
+            await asyncio.gather(*(connect_box.async_get_connected_devices() for connect_box in connect_boxes))
+        elapsed = time.perf_counter() - start
+
+        ticker.cancel()
+
+    stalls.sort()
+
+    return {
+        "mode": mode,
+        "clients": client_count,
+        "routers": router_count,
+        "max_stall_seconds": stalls[-1] if stalls else 0.0,
+        "p99_stall_seconds": stalls[int(len(stalls) * 0.99)] if stalls else 0.0,
+        "polls_per_second": polls * router_count / elapsed,
+    }
+
+
+async def _async_tick(stalls: List[float]) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        stalls.append(max(time.perf_counter() - start - TICK_INTERVAL, 0.0))
@@ -0,0 +1,82 @@
+import gc
+import json
+import tracemalloc
+
+from typing import Any, Dict, List, Sequence
+
+from arris_tg2492lg.emulator import generate_conn_devices_payload
+from arris_tg2492lg.mib_mapper import format_date, format_dates, format_mac, format_macs, to_devices
+
+from .legacy import legacy_to_devices
+from .timing import measure
+
+# Number of values that are converted one by one and in bulk by the format benchmark.
+FORMAT_VALUES = 2000
+
+
+def benchmark_parse(client_counts: Sequence[int], ipv6_shares: Sequence[float], min_time: float) -> List[Dict[str, Any]]:
+    """Measure throughput and memory of `to_devices` for payloads of different sizes."""
+    results = []
+
+    for client_count in client_counts:
+        for ipv6_share in ipv6_shares:
+            payload = generate_conn_devices_payload(client_count, ipv6_share)
+            devices = to_devices(payload)
+
+            timing = measure(lambda: to_devices(payload), min_time)
+
+            results.append(
+                {
+                    "clients": client_count,
+                    "ipv6_share": ipv6_share,
+                    "devices": len(devices),
+                    "payload_bytes": len(payload.encode()),
+                    **timing,
+                    "devices_per_second": len(devices) * timing["calls_per_second"],
+                    "megabytes_per_second": len(payload.encode()) * timing["calls_per_second"] / 1e6,
+                    **_measure_memory(payload),
+                }
+            )
+
+    return results
+
+
+def benchmark_mapper(client_count: int, min_time: float) -> Dict[str, Dict[str, float]]:
+    """Measure `to_devices` against the mapper as it was before the OID dispatch table."""
+    payload = generate_conn_devices_payload(client_count)
+
+    return {
+        "legacy": measure(lambda: json.loads(payload, object_pairs_hook=legacy_to_devices), min_time),
+        "dispatch_table": measure(lambda: to_devices(payload), min_time),
+    }
+
+
+def benchmark_format(min_time: float) -> Dict[str, Dict[str, float]]:
+    """Measure the conversion of single MAC and date values, and of a table of values one by one and in bulk."""
+    macs = ["$%012X" % client for client in range(FORMAT_VALUES)]
+    dates = ["$07e30b0310330400"] * FORMAT_VALUES
+
+    return {
+        "format_mac": measure(lambda: format_mac("$0123456789AB"), min_time),
+        "format_date": measure(lambda: format_date("$07e30b0310330400"), min_time),
+        "format_mac_one_by_one": measure(lambda: [format_mac(mac) for mac in macs], min_time),
+        "format_macs": measure(lambda: format_macs(macs), min_time),
+        "format_date_one_by_one": measure(lambda: [format_date(date) for date in dates], min_time),
+        "format_dates": measure(lambda: format_dates(dates), min_time),
+    }
+
+
+def _measure_memory(payload: str) -> Dict[str, int]:
+    """Return the peak memory used while parsing and the memory that is retained by the result."""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        devices = to_devices(payload)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del devices
+
+    return {"peak_memory_bytes": peak, "retained_memory_bytes": retained}
@@ -0,0 +1,36 @@
+import time
+
+from typing import Awaitable, Callable, Dict
+
+
+def measure(function: Callable[[], object], min_time: float = 0.2, repeat: int = 3) -> Dict[str, float]:
+    """Call the function until `min_time` seconds passed, `repeat` times, and return the best time per call."""
+    best = float("inf")
+    calls = 0
+
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+
+        best = min(best, elapsed / calls)
+
+    return {"seconds_per_call": best, "calls_per_second": 1 / best}
+
+
+async def async_measure(function: Callable[[], Awaitable[object]], calls: int) -> Dict[str, float]:
+    """Await the function `calls` times and return the mean time per call."""
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        await function()
+
+    elapsed = time.perf_counter() - start
+
+    return {"seconds_per_call": elapsed / calls, "calls_per_second": calls / elapsed}
@@ -6,14 +6,14 @@ from aiohttp.client_exceptions import ClientResponseError
 from argparse import ArgumentParser
 
 try:
-    from arris_tg2492lg import ConnectBox  # The typical way to import arris_tg2492lg
+    from arris_tg2492lg import ConnectBox, OnlineDeviceIndex  # The typical way to import arris_tg2492lg
 except ImportError:
     # Path hack allows examples to be run without installation.
     import os
     parentdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     os.sys.path.insert(0, parentdir)
 
-    from arris_tg2492lg import ConnectBox
+    from arris_tg2492lg import ConnectBox, OnlineDeviceIndex
 
 
 async def main():
@@ -31,18 +31,11 @@ async def main():
         connect_box = ConnectBox(session, args.host, args.password)
 
         try:
-            all_devices = await connect_box.async_get_connected_devices()
+            index = OnlineDeviceIndex()
+            index.update(await connect_box.async_get_connected_devices())
 
-            devices = []
-            mac_addresses = set()
-
-            for device in all_devices:
-                if device.online and device.mac not in mac_addresses:
-                    devices.append(device)
-                    mac_addresses.add(device.mac)
-
-            for device in devices:
-                print(device.mac + " " + device.hostname)
+            for device in index.online_devices():
+                print(f"{device.mac} {device.hostname or ''}")
 
             await connect_box.async_logout()
         except ClientResponseError as exc:
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from arris_tg2492lg.cache import SnmpCache
+from arris_tg2492lg.const import MAC_ADDRESS_OID
+
+
+def test_cache_hit_and_miss():
+    cache = SnmpCache()
+
+    assert cache.get("1.2.3") is None
+
+    cache.set("1.2.3", "value")
+
+    assert cache.get("1.2.3") == "value"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_expires_values(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("arris_tg2492lg.cache.time.monotonic", lambda: now)
+    cache = SnmpCache(default_ttl=timedelta(seconds=10))
+
+    cache.set("1.2.3", "counter")
+    cache.set(MAC_ADDRESS_OID, "$1234567890ab")
+
+    now += 11
+
+    assert cache.get("1.2.3") is None
+    assert cache.get(MAC_ADDRESS_OID) == "$1234567890ab"
+
+
+def test_cache_ttl_for_subtree():
+    cache = SnmpCache(default_ttl=timedelta(seconds=10), ttls={"1.2": timedelta(minutes=1), "1.2.3": timedelta(0)})
+
+    assert cache.ttl_for("1.2.4.1") == 60
+    assert cache.ttl_for("1.3") == 10
+
+    cache.set("1.2.3.1", "not cached")
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SnmpCache(max_size=2)
+
+    cache.set("1.1", "a")
+    cache.set("1.2", "b")
+    cache.get("1.1")
+    cache.set("1.3", "c")
+
+    assert cache.get("1.2") is None
+    assert cache.get("1.1") == "a"
+    assert cache.get("1.3") == "c"
+
+
+def test_cache_invalidate():
+    cache = SnmpCache()
+    cache.set("1.2.1", "a")
+    cache.set("1.2.2", "b")
+    cache.set("1.20", "c")
+
+    cache.invalidate("1.2")
+
+    assert len(cache) == 1
+    assert cache.get("1.20") == "c"
+
+    cache.invalidate()
+
+    assert len(cache) == 0
@@ -0,0 +1,160 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+
+from datetime import timedelta
+from arris_tg2492lg.cli import async_main, parse_args
+from arris_tg2492lg.const import MAC_ADDRESS_OID
+from arris_tg2492lg.emulator import RouterEmulator
+
+
+@pytest.fixture
+async def emulators():
+    async with RouterEmulator("secret", client_count=2, ipv6_share=0.0) as first, RouterEmulator(
+        "other", client_count=3, ipv6_share=0.0
+    ) as second:
+        yield first, second
+
+
+async def _run(argv):
+    output = io.StringIO()
+    exit_code = await async_main(parse_args(argv), output)
+    return exit_code, output.getvalue()
+
+
+async def test_devices_of_many_hosts(emulators, tmp_path):
+    first, second = emulators
+    first.set_client_online(1, False)
+    hosts_file = tmp_path / "hosts"
+    hosts_file.write_text(f"# routers\n{second.hostname} other\n")
+
+    exit_code, output = await _run(
+        ["--host", first.hostname, "--password", "secret", "--hosts-file", str(hosts_file), "devices"]
+    )
+    rows = [json.loads(line) for line in output.splitlines()]
+
+    assert exit_code == 0
+    assert sorted((row["host"], row["ip"], row["online"]) for row in rows) == sorted(
+        [
+            (first.hostname, "10.0.0.0", True),
+            (first.hostname, "10.0.0.1", False),
+            (second.hostname, "10.0.0.0", True),
+            (second.hostname, "10.0.0.1", True),
+            (second.hostname, "10.0.0.2", True),
+        ]
+    )
+    assert rows[0]["type"] == "DYNAMIC"
+    assert first.request_counts["/logout"] == 1
+
+
+async def test_devices_as_csv(emulators):
+    first, _ = emulators
+    first.set_client_online(1, False)
+
+    exit_code, output = await _run(["--host", first.hostname, "--password", "secret", "--format", "csv", "devices", "--online"])
+    rows = list(csv.DictReader(io.StringIO(output)))
+
+    assert exit_code == 0
+    assert [(row["ip"], row["mac"], row["online"]) for row in rows] == [("10.0.0.0", "00:00:00:00:00:00", "True")]
+
+
+async def test_info_and_snmp_get(emulators):
+    first, _ = emulators
+
+    exit_code, output = await _run(["--host", first.hostname, "--password", "secret", "info"])
+
+    assert exit_code == 0
+    assert json.loads(output)["mac_address"] == "12:34:56:78:90:ab"
+
+    exit_code, output = await _run(["--host", first.hostname, "--password", "secret", "snmp-get", MAC_ADDRESS_OID, "1.2.3"])
+
+    assert exit_code == 1
+    assert [json.loads(line) for line in output.splitlines()] == [
+        {"host": first.hostname, "oid": MAC_ADDRESS_OID, "value": "$1234567890ab", "error": None},
+        {"host": first.hostname, "oid": "1.2.3", "value": None, "error": "Error in OID formatting!"},
+    ]
+
+
+async def test_failing_host(emulators):
+    first, _ = emulators
+
+    exit_code, output = await _run(["--host", first.hostname, "--password", "wrong", "devices"])
+
+    assert exit_code == 1
+    assert output == ""
+
+
+async def test_credentials_are_reused(emulators, tmp_path):
+    first, _ = emulators
+    argv = ["--host", first.hostname, "--password", "secret", "--credentials", str(tmp_path / "credentials.json"), "info"]
+
+    await _run(argv)
+    await _run(argv)
+
+    assert first.request_counts["/login"] == 1
+    assert first.request_counts["/logout"] == 0
+
+
+async def test_watch_writes_changes(emulators):
+    first, _ = emulators
+    argv = ["--host", first.hostname, "--password", "secret", "watch", "--min-interval", "0.01", "--max-interval", "0.02"]
+    args = parse_args(argv + ["--duration", "0.5"])
+    output = io.StringIO()
+
+    async def change_client():
+        while not output.getvalue():
+            await asyncio.sleep(0.01)
+        first.set_client_online(1, False)
+
+    change_task = asyncio.ensure_future(change_client())
+    exit_code = await async_main(args, output)
+    await change_task
+
+    events = [(row["event"], row["ip"], row["online"]) for row in map(json.loads, output.getvalue().splitlines())]
+
+    assert exit_code == 0
+    assert events == [("added", "10.0.0.0", True), ("added", "10.0.0.1", True), ("changed", "10.0.0.1", False)]
+    assert first.request_counts["/login"] == 1
+
+
+async def test_watch_applies_timeout(emulators):
+    first, _ = emulators
+    first.latency = 0.2
+    argv = ["--host", first.hostname, "--password", "secret", "--timeout", "0.05", "watch", "--min-interval", "0.01"]
+    output = io.StringIO()
+
+    exit_code = await async_main(parse_args(argv + ["--duration", "0.3"]), output)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert exit_code == 0
+    assert rows and all(row["event"] == "error" and "TimeoutError" in row["error"] for row in rows)
+
+
+async def test_watch_does_not_refresh_rejected_login(emulators, monkeypatch):
+    monkeypatch.setattr("arris_tg2492lg.connect_box.TOKEN_REFRESH_RETRY_INTERVAL", timedelta(seconds=0.01))
+    first, _ = emulators
+    argv = ["--host", first.hostname, "--password", "wrong", "watch", "--min-interval", "0.05"]
+    output = io.StringIO()
+
+    exit_code = await async_main(parse_args(argv + ["--duration", "0.3"]), output)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert exit_code == 0
+    assert rows and all(row["event"] == "error" for row in rows)
+    # Only the polls login, the token refresh isn't started for a router that rejects the password.
+    assert first.request_counts["/login"] == len(rows)
+
+
+def test_parse_args_requires_router_and_password(monkeypatch):
+    monkeypatch.delenv("ARRIS_TG2492LG_PASSWORD", raising=False)
+
+    with pytest.raises(SystemExit):
+        parse_args(["devices"])
+    with pytest.raises(SystemExit):
+        parse_args(["--host", "192.168.178.1", "devices"])
+
+    assert parse_args(["--host", "192.168.178.1", "--password", "secret", "info"]).routers == [
+        ("http://192.168.178.1", "secret")
+    ]
@@ -1,12 +1,20 @@
+import asyncio
 import base64
+import json
+import logging
 import os
 import pytest
 
 from aiohttp import web, ClientResponseError
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
 from pathlib import Path
 
-from arris_tg2492lg.connect_box import ConnectBox
-from arris_tg2492lg.exception import InvalidCredentialError
+from arris_tg2492lg.cache import SnmpCache
+from arris_tg2492lg.connect_box import BodyLogging, ConnectBox
+from arris_tg2492lg.const import ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID
+from arris_tg2492lg.emulator import RouterEmulator, generate_conn_devices_payload
+from arris_tg2492lg.exception import ConnectBoxError, InvalidCredentialError
 
 
 async def test_async_login_ok(aiohttp_client):
@@ -171,6 +179,201 @@ async def test_get_connected_devices_throws_401_twice(aiohttp_client):
     assert conn_devices_result.call_count == 2
 
 
+async def test_iter_connected_devices_streams_chunked_response(aiohttp_client):
+    first_device_received = asyncio.Event()
+
+    async def chunked_conn_devices_result(request):
+        response_text = _get_mock_data_text()
+        half = len(response_text) // 2
+
+        response = web.StreamResponse()
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        await response.write(response_text[:half].encode("utf-8"))
+        await first_device_received.wait()
+        await response.write(response_text[half:].encode("utf-8"))
+        await response.write_eof()
+
+        return response
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", chunked_conn_devices_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+
+    async def collect_devices():
+        devices = []
+        async for device in connect_box.async_iter_connected_devices():
+            # The second half of the response is only sent after the first device is received.
+            first_device_received.set()
+            devices.append(device)
+        return devices
+
+    devices = await asyncio.wait_for(collect_devices(), timeout=5)
+
+    assert [device.ip for device in devices] == [
+        "192.168.178.2",
+        "192.168.178.3",
+        "2001:1c12:8d6:bb00:b0f6:855a:dcd:5528",
+        "2001:1c12:8d6:bb00:b0f6:855a:dcd:5529",
+    ]
+
+
+async def test_iter_connected_devices_throws_401_once(aiohttp_client):
+    async def login_result(request):
+        login_result.call_count += 1
+        return await _get_credential(request)
+
+    async def conn_devices_result(request):
+        conn_devices_result.call_count += 1
+        if conn_devices_result.call_count == 1:
+            return web.Response(status=401)
+        else:
+            return await _get_mock_data(request)
+
+    login_result.call_count = 0
+    conn_devices_result.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", login_result)
+    app.router.add_get("/getConnDevices", conn_devices_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    connected_devices = [device async for device in connect_box.async_iter_connected_devices()]
+
+    assert len(connected_devices) == 4
+
+    assert login_result.call_count == 2
+    assert conn_devices_result.call_count == 2
+
+
+async def test_get_connected_devices_delta(aiohttp_client):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+
+    first_delta = await connect_box.async_get_connected_devices_delta()
+    second_delta = await connect_box.async_get_connected_devices_delta()
+
+    assert len(first_delta.added) == 4
+    assert not second_delta
+
+
+async def test_token_refresh_logs_in_before_expiration(aiohttp_client, monkeypatch):
+    monkeypatch.setattr("arris_tg2492lg.connect_box.TOKEN_EXPIRATION", timedelta(seconds=0.6))
+
+    async def slow_login_result(request):
+        slow_login_result.call_count += 1
+        await asyncio.sleep(0.15)
+        return await _get_credential(request)
+
+    slow_login_result.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", slow_login_result)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    connect_box.start_token_refresh(margin=timedelta(seconds=0.3))
+
+    try:
+        await asyncio.sleep(0.3)
+
+        for _ in range(8):
+            await asyncio.sleep(0.1)
+
+            # The credential was refreshed before it expired, so the request doesn't have to wait for a login.
+            assert not connect_box._credential.is_expired()
+            assert len(await connect_box.async_get_connected_devices()) == 4
+    finally:
+        await connect_box.async_stop_token_refresh()
+
+    assert slow_login_result.call_count >= 3
+
+
+async def test_token_refresh_without_retry_stops_after_failed_login(aiohttp_client):
+    async def failing_login(request):
+        failing_login.call_count += 1
+        return web.Response(status=500)
+
+    failing_login.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", failing_login)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    connect_box.start_token_refresh(retry=False)
+
+    await asyncio.wait_for(connect_box._refresh_task, 5)
+
+    assert failing_login.call_count == 1
+
+
+async def test_concurrent_calls_share_single_login(aiohttp_client):
+    async def slow_login_result(request):
+        slow_login_result.call_count += 1
+        await asyncio.sleep(0.1)
+        return await _get_credential(request)
+
+    slow_login_result.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", slow_login_result)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    app.router.add_get("/snmpGet", _get_mock_router_information)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+
+    results = await asyncio.gather(
+        *(connect_box.async_get_router_information() if i % 2 else connect_box.async_get_connected_devices() for i in range(50))
+    )
+
+    assert len(results) == 50
+    assert slow_login_result.call_count == 1
+
+
+async def test_concurrent_401_responses_share_single_login(aiohttp_client):
+    async def login_result(request):
+        login_result.call_count += 1
+        token = f'{{"name": "admin", "login": {login_result.call_count}}}'
+        return web.Response(text=base64.b64encode(token.encode("utf-8")).decode("ascii"))
+
+    async def conn_devices_result(request):
+        token = json.loads(base64.b64decode(request.cookies["credential"]))
+
+        # The token of the first login expired on the router.
+        if token["login"] == 1:
+            await asyncio.sleep(0.05)
+            return web.Response(status=401)
+
+        return await _get_mock_data(request)
+
+    login_result.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", login_result)
+    app.router.add_get("/getConnDevices", conn_devices_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    await connect_box.async_login()
+
+    results = await asyncio.gather(*(connect_box.async_get_connected_devices() for _ in range(20)))
+
+    assert all(len(devices) == 4 for devices in results)
+    assert login_result.call_count == 2
+
+
 async def test_logout_accepts_http_status_500(aiohttp_client):
     async def get_logout_success(request):
         get_logout_success.call_count += 1
@@ -224,6 +427,312 @@ async def test_get_router_information(aiohttp_client):
     assert router_information.serial_number == "ABCD12345678"
 
 
+async def test_get_router_information_uses_snmp_cache(aiohttp_client):
+    async def snmp_get_result(request):
+        snmp_get_result.call_count += 1
+        return await _get_mock_router_information(request)
+
+    snmp_get_result.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/snmpGet", snmp_get_result)
+    client = await aiohttp_client(app)
+
+    snmp_cache = SnmpCache()
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret", snmp_cache=snmp_cache)
+
+    for _ in range(3):
+        router_information = await connect_box.async_get_router_information()
+        assert router_information.serial_number == "ABCD12345678"
+
+    assert snmp_get_result.call_count == 1
+    assert snmp_cache.hits == 8
+    assert snmp_cache.misses == 4
+
+
+async def test_snmp_get_many_chunks_oids_and_reports_invalid_oids(aiohttp_client):
+    invalid_oids = {"1.3.6.1.4.1.4115.1.20.1.1.5.17", "1.3.6.1.4.1.4115.1.20.1.1.5.85"}
+    oids = [f"1.3.6.1.4.1.4115.1.20.1.1.5.{i}" for i in range(100)]
+
+    async def snmp_get_result(request):
+        snmp_get_result.url_lengths.append(len(str(request.url)))
+        snmp_get_result.active += 1
+        snmp_get_result.max_active = max(snmp_get_result.max_active, snmp_get_result.active)
+
+        await asyncio.sleep(0.01)
+        snmp_get_result.active -= 1
+
+        query = dict(parameter.split("=", 1) for parameter in request.query_string.split("&"))
+        requested_oids = query["oids"].split(";")
+
+        if invalid_oids.intersection(requested_oids):
+            return web.Response(text="Error in OID formatting!")
+
+        return web.Response(text=json.dumps({oid: f"value {oid}" for oid in requested_oids}))
+
+    snmp_get_result.url_lengths = []
+    snmp_get_result.active = 0
+    snmp_get_result.max_active = 0
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/snmpGet", snmp_get_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    result = await connect_box.async_snmp_get_many(oids, max_url_length=500, max_concurrency=3)
+
+    assert set(result.errors) == invalid_oids
+    assert result.errors["1.3.6.1.4.1.4115.1.20.1.1.5.17"] == "Error in OID formatting!"
+    assert len(result.values) == 98
+    assert result.values["1.3.6.1.4.1.4115.1.20.1.1.5.42"] == "value 1.3.6.1.4.1.4115.1.20.1.1.5.42"
+    assert max(snmp_get_result.url_lengths) <= 500
+    assert snmp_get_result.max_active == 3
+
+
+async def test_snmp_get_many_raises_invalid_credential(aiohttp_client):
+    async def get_html_response(request):
+        get_html_response.call_count += 1
+        return web.Response(text="<!DOCTYPE html><html><body>hello</body></html>")
+
+    get_html_response.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", get_html_response)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    oids = [f"1.3.6.1.4.1.4115.1.20.1.1.5.{i}" for i in range(100)]
+
+    with pytest.raises(InvalidCredentialError):
+        await connect_box.async_snmp_get_many(oids, max_url_length=500)
+
+    # The chunks are not split and the concurrent chunks share a single login attempt.
+    assert get_html_response.call_count == 1
+
+
+async def test_walk_table(aiohttp_client):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/walk", _walk_mock_data)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    rows = [row async for row in connect_box.async_walk_table(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID)]
+
+    assert len(rows) == 4
+    assert rows[0].ip == "192.168.178.2"
+    assert rows[0].values[3] == "My Device"
+    assert rows[0].values[4] == "$1234567890AB"
+    assert len(rows[0].values) == 9
+
+
+async def test_walk_table_with_column_projection(aiohttp_client):
+    async def walk_result(request):
+        walk_result.oids.append(request.query["oids"])
+        return await _walk_mock_data(request)
+
+    walk_result.oids = []
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/walk", walk_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    rows = [row async for row in connect_box.async_walk_table(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, columns=[3, 14])]
+
+    assert walk_result.oids == [ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".3", ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".14"]
+    assert [row.values for row in rows[:2]] == [{3: "My Device", 14: "1"}, {3: "My Device 2", 14: "1"}]
+
+
+async def test_walk_table_invalid_oid(aiohttp_client):
+    async def walk_result(request):
+        return web.Response(text="Error in OID formatting!")
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/walk", walk_result)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+
+    with pytest.raises(ConnectBoxError):
+        [row async for row in connect_box.async_walk_table("1.2.3")]
+
+
+async def test_response_body_is_not_logged_by_default(aiohttp_client, caplog):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    client = await aiohttp_client(app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+
+    with caplog.at_level(logging.DEBUG, logger="arris_tg2492lg.connect_box"):
+        await connect_box.async_get_connected_devices()
+
+    assert not any("getConnDevices response" in record.getMessage() for record in caplog.records)
+
+
+async def test_response_body_logging_is_truncated(aiohttp_client, caplog):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    client = await aiohttp_client(app)
+
+    body_logging = BodyLogging(max_length=20)
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret", body_logging=body_logging)
+
+    with caplog.at_level(logging.DEBUG, logger="arris_tg2492lg.connect_box"):
+        await connect_box.async_get_connected_devices()
+
+    messages = [record.getMessage() for record in caplog.records if "getConnDevices response" in record.getMessage()]
+    response_length = len(_get_mock_data_text())
+    assert messages == [f"getConnDevices response (20 of {response_length} characters): {_get_mock_data_text()[:20]}..."]
+
+
+async def test_body_logging_of_large_response(aiohttp_client, caplog):
+    payload = generate_conn_devices_payload(1000)
+
+    async def conn_devices_result(request):
+        return web.Response(text=payload)
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", conn_devices_result)
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+
+    with caplog.at_level(logging.DEBUG, logger="arris_tg2492lg"):
+        for body_logging in (None, BodyLogging(max_length=len(payload))):
+            connect_box = ConnectBox(client.session, hostname, "secret", body_logging=body_logging)
+            for _ in range(3):
+                await connect_box.async_get_connected_devices()
+
+    messages = [record.getMessage() for record in caplog.records if "getConnDevices response" in record.getMessage()]
+
+    assert len(messages) == 3
+    assert all(payload in message for message in messages)
+
+
+async def test_owned_websession_reuses_one_connection():
+    async with RouterEmulator("secret") as emulator:
+        async with ConnectBox(None, emulator.hostname, "secret") as connect_box:
+            await connect_box.async_get_connected_devices()
+            await connect_box.async_get_router_information()
+            await connect_box.async_logout()
+
+            websession = connect_box._websession
+
+        assert websession.closed
+        assert emulator.connection_count == 1
+
+
+async def test_owned_websession_allows_requests_while_streaming():
+    # The response is larger than the read buffer, so its connection is in use until all devices are iterated.
+    async with RouterEmulator("secret", client_count=5000) as emulator:
+        async with ConnectBox(None, emulator.hostname, "secret") as connect_box:
+            devices = connect_box.async_iter_connected_devices()
+            await devices.__anext__()
+            try:
+                router_information = await asyncio.wait_for(connect_box.async_get_router_information(), 5)
+            finally:
+                await devices.aclose()
+
+        assert router_information.serial_number is not None
+
+
+async def test_request_is_resent_when_router_closes_connection():
+    async with RouterEmulator("secret") as emulator, ConnectBox(None, emulator.hostname, "secret") as connect_box:
+        await connect_box.async_login()
+        emulator.disconnect_next("/getConnDevices")
+
+        devices = await connect_box.async_get_connected_devices()
+
+        assert len(devices) == 15
+        assert emulator.request_counts["/getConnDevices"] == 2
+        assert emulator.connection_count == 2
+
+
+async def test_idle_connection_closed_by_router_is_replaced():
+    async with RouterEmulator("secret", keepalive_timeout=0.05) as emulator:
+        async with ConnectBox(None, emulator.hostname, "secret") as connect_box:
+            await connect_box.async_get_connected_devices()
+            await asyncio.sleep(0.2)
+            await connect_box.async_get_connected_devices()
+
+        assert emulator.connection_count == 2
+
+
+async def test_provided_websession_is_not_closed(aiohttp_client):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    client = await aiohttp_client(app)
+
+    async with ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret") as connect_box:
+        await connect_box.async_login()
+
+    assert not client.session.closed
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submit_count = 0
+
+    def submit(self, *args, **kwargs):
+        self.submit_count += 1
+        return super().submit(*args, **kwargs)
+
+
+async def test_parse_executor_is_used_for_large_responses(aiohttp_client):
+    payload = generate_conn_devices_payload(100)
+
+    async def conn_devices_result(request):
+        return web.Response(text=payload)
+
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", conn_devices_result)
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+
+    with _CountingExecutor() as executor:
+        connect_box = ConnectBox(
+            client.session, hostname, "secret", parse_executor=executor, parse_executor_threshold=len(payload)
+        )
+
+        devices = await connect_box.async_get_connected_devices()
+        delta = await connect_box.async_get_connected_devices_delta()
+
+        assert executor.submit_count == 2
+        assert devices == await ConnectBox(client.session, hostname, "secret").async_get_connected_devices()
+        assert delta.added == devices
+
+        connect_box = ConnectBox(
+            client.session, hostname, "secret", parse_executor=executor, parse_executor_threshold=len(payload) + 1
+        )
+        await connect_box.async_get_connected_devices()
+
+        assert executor.submit_count == 2
+
+
+async def test_parse_executor_can_be_a_process_pool(aiohttp_client):
+    app = web.Application()
+    app.router.add_get("/login", _get_credential)
+    app.router.add_get("/getConnDevices", _get_mock_data)
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        connect_box = ConnectBox(client.session, hostname, "secret", parse_executor=executor, parse_executor_threshold=0)
+        devices = await connect_box.async_get_connected_devices()
+
+    assert devices == await ConnectBox(client.session, hostname, "secret").async_get_connected_devices()
+
+
 async def _get_credential(request):
     dummy_token = base64.b64encode('{"name": "admin"}'.encode("utf-8")).decode("ascii")
 
@@ -231,10 +740,14 @@ async def _get_credential(request):
 
 
 async def _get_mock_data(request):
+    return web.Response(text=_get_mock_data_text())
+
+
+def _get_mock_data_text():
     current_path = Path(os.path.dirname(os.path.realpath(__file__)))
     test_data_path = current_path / "getConnDevices-response.json"
 
-    return web.Response(text=test_data_path.read_text())
+    return test_data_path.read_text()
 
 
 async def _get_mock_router_information(request):
@@ -242,3 +755,11 @@ async def _get_mock_router_information(request):
     test_data_path = current_path / "snmpGet-response.json"
 
     return web.Response(text=test_data_path.read_text())
+
+
+async def _walk_mock_data(request):
+    """Return the cells of the LAN client table below the walked OID."""
+    oid = request.query["oids"]
+    cells = {key: value for key, value in json.loads(_get_mock_data_text()).items() if key.startswith(oid + ".")}
+
+    return web.Response(text=json.dumps({**cells, "1": "Finish"}))
@@ -0,0 +1,114 @@
+import base64
+import json
+
+from aiohttp import web
+from datetime import datetime, timedelta
+
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.credential_store import FileCredentialStore, MemoryCredentialStore, StoredCredential
+
+
+def test_memory_credential_store():
+    store = MemoryCredentialStore()
+    credential = StoredCredential("token", datetime.now(), "12345")
+
+    store.save("http://router", credential)
+
+    assert store.load("http://router") == credential
+    assert store.load("http://other-router") is None
+
+    store.delete("http://router")
+
+    assert store.load("http://router") is None
+
+
+def test_file_credential_store(tmp_path):
+    path = tmp_path / "credentials.json"
+    credential = StoredCredential("token", datetime(2024, 1, 2, 3, 4, 5), "12345")
+
+    FileCredentialStore(path).save("http://router", credential)
+    FileCredentialStore(path).save("http://other-router", StoredCredential("token2", datetime.now(), "54321"))
+
+    assert FileCredentialStore(path).load("http://router") == credential
+    assert set(json.loads(path.read_text())) == {"http://router", "http://other-router"}
+    assert (path.stat().st_mode & 0o777) == 0o600
+
+    FileCredentialStore(path).delete("http://router")
+
+    assert FileCredentialStore(path).load("http://router") is None
+    assert FileCredentialStore(path).load("http://other-router").token == "token2"
+
+
+def test_file_credential_store_ignores_invalid_file(tmp_path):
+    path = tmp_path / "credentials.json"
+    path.write_text("not json")
+
+    assert FileCredentialStore(path).load("http://router") is None
+
+
+async def test_stored_credential_is_reused_after_restart(aiohttp_client, tmp_path):
+    app, requests = _create_app()
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+    store = FileCredentialStore(tmp_path / "credentials.json")
+
+    await ConnectBox(client.session, hostname, "secret", credential_store=store).async_get_connected_devices()
+    await ConnectBox(client.session, hostname, "secret", credential_store=store).async_get_connected_devices()
+
+    assert [path for path, _ in requests] == ["/login", "/getConnDevices", "/getConnDevices"]
+    assert len({nonce for _, nonce in requests}) == 1
+
+
+async def test_expired_stored_credential_is_not_reused(aiohttp_client):
+    app, requests = _create_app()
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+    store = MemoryCredentialStore()
+    store.save(hostname, StoredCredential(_create_token(), datetime.now() - timedelta(minutes=10), "12345"))
+
+    await ConnectBox(client.session, hostname, "secret", credential_store=store).async_get_connected_devices()
+
+    assert [path for path, _ in requests] == ["/login", "/getConnDevices"]
+    assert store.load(hostname).created_at > datetime.now() - timedelta(minutes=1)
+
+
+async def test_logout_deletes_stored_credential(aiohttp_client):
+    app, requests = _create_app()
+    client = await aiohttp_client(app)
+    hostname = f"http://{client.host}:{client.port}"
+    store = MemoryCredentialStore()
+
+    connect_box = ConnectBox(client.session, hostname, "secret", credential_store=store)
+    await connect_box.async_login()
+    assert store.load(hostname) is not None
+
+    await connect_box.async_logout()
+    assert store.load(hostname) is None
+
+
+def _create_token():
+    return base64.b64encode('{"name": "admin"}'.encode("utf-8")).decode("ascii")
+
+
+def _create_app():
+    requests = []
+
+    @web.middleware
+    async def log_requests(request, handler):
+        requests.append((request.path, request.query.get("_n")))
+        return await handler(request)
+
+    async def get_credential(request):
+        return web.Response(text=_create_token())
+
+    async def get_conn_devices(request):
+        return web.Response(text="{}")
+
+    async def logout(request):
+        return web.Response(status=500)
+
+    app = web.Application(middlewares=[log_requests])
+    app.router.add_get("/login", get_credential)
+    app.router.add_get("/logout", logout)
+    app.router.add_get("/getConnDevices", get_conn_devices)
+    return app, requests
@@ -0,0 +1,68 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+
+from arris_tg2492lg.date_and_time import decode_date_and_time, decode_lease_end, format_date, validate_date, validate_dates
+from arris_tg2492lg.device import Device
+
+
+def test_decode_date_and_time():
+    assert decode_date_and_time("$07e30b0310330400") == datetime(2019, 11, 3, 16, 51, 4)
+    assert decode_date_and_time("$07e30b0310330405") == datetime(2019, 11, 3, 16, 51, 4, 500000)
+
+
+def test_decode_date_and_time_with_utc_offset():
+    assert decode_date_and_time("$07e30b03103304002b0100") == datetime(
+        2019, 11, 3, 16, 51, 4, tzinfo=timezone(timedelta(hours=1))
+    )
+    assert decode_date_and_time("$07e30b03103304002d051e") == datetime(
+        2019, 11, 3, 16, 51, 4, tzinfo=timezone(-timedelta(hours=5, minutes=30))
+    )
+
+
+def test_decode_date_and_time_without_lease():
+    assert decode_date_and_time("$0000000000000000") is None
+
+
+@pytest.mark.parametrize("value", ["$07e30d0310330400", "$07e30b03", "$07e30b0310330400ff6400"])
+def test_decode_date_and_time_error(value):
+    with pytest.raises(ValueError, match="Received invalid date value"):
+        decode_date_and_time(value)
+
+
+@pytest.mark.parametrize("invalid_value", ["invalid_value", "$07e30b031033040", "$07e30b03", "$07e30b0310330400\n"])
+def test_validate_dates_raises_error_of_format_date(invalid_value):
+    with pytest.raises((IndexError, ValueError)) as expected:
+        format_date(invalid_value)
+
+    with pytest.raises(expected.type) as actual:
+        validate_dates(["$07e30b0310330400", "$07e30b03103304002b0100", invalid_value, "other_invalid_value"])
+
+    assert str(actual.value) == str(expected.value)
+
+    with pytest.raises(expected.type):
+        validate_date(invalid_value)
+
+
+def test_device_lease_end_is_decoded_once():
+    device = Device("192.168.178.2")
+    assert device.lease_end is None
+
+    device.raw_lease_end = "$07e30b0310330400"
+    lease_end = device.lease_end
+
+    assert lease_end == datetime(2019, 11, 3, 16, 51, 4)
+    assert device.lease_end is lease_end
+    assert device.lease_end_string == "2019-11-03 16:51:04:00"
+
+    device.raw_lease_end = "$07e40b0310330400"
+    assert device.lease_end == datetime(2020, 11, 3, 16, 51, 4)
+
+
+def test_device_lease_end_with_invalid_date_is_none():
+    device = Device("192.168.178.2")
+    device.raw_lease_end = "$07e30d0310330400"
+
+    assert decode_lease_end(device.raw_lease_end) is None
+    assert device.lease_end is None
+    assert device.lease_end_string == "2019-13-03 16:51:04:00"
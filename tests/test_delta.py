@@ -0,0 +1,67 @@
+import os
+
+from pathlib import Path
+
+from arris_tg2492lg.delta import DeviceSnapshot
+from arris_tg2492lg.mib_mapper import to_raw_rows
+
+
+def _get_raw_rows():
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    test_data_path = current_path / "getConnDevices-response.json"
+
+    return to_raw_rows(test_data_path.read_text())
+
+
+def test_first_update_adds_all_devices():
+    snapshot = DeviceSnapshot()
+
+    delta = snapshot.update(_get_raw_rows())
+
+    assert len(delta.added) == 4
+    assert delta.removed == []
+    assert delta.changed == []
+    assert len(snapshot.devices) == 4
+
+
+def test_unchanged_rows_are_skipped():
+    snapshot = DeviceSnapshot()
+    snapshot.update(_get_raw_rows())
+    devices = snapshot.devices
+
+    delta = snapshot.update(_get_raw_rows())
+
+    assert not delta
+    assert all(device is previous for device, previous in zip(snapshot.devices, devices))
+
+
+def test_online_flip_is_reported_as_change():
+    snapshot = DeviceSnapshot()
+    snapshot.update(_get_raw_rows())
+
+    rows = _get_raw_rows()
+    ip, raw_row = rows[1]
+    rows[1] = (ip, raw_row[:6] + ("0",) + raw_row[7:])
+
+    delta = snapshot.update(rows)
+
+    assert delta.added == [] and delta.removed == []
+    assert [change.current.ip for change in delta.changed] == ["192.168.178.3"]
+    assert delta.changed[0].previous.online is True
+    assert [device.ip for device in delta.went_offline] == ["192.168.178.3"]
+    assert delta.came_online == []
+
+    delta = snapshot.update(_get_raw_rows())
+
+    assert [device.ip for device in delta.came_online] == ["192.168.178.3"]
+
+
+def test_removed_and_added_devices():
+    snapshot = DeviceSnapshot()
+    snapshot.update(_get_raw_rows()[:3])
+
+    delta = snapshot.update(_get_raw_rows()[1:])
+
+    assert [device.ip for device in delta.removed] == ["192.168.178.2"]
+    assert [device.ip for device in delta.added] == ["2001:1c12:8d6:bb00:b0f6:855a:dcd:5529"]
+    assert delta.changed == []
@@ -0,0 +1,133 @@
+import json
+
+from datetime import datetime, timedelta, timezone
+
+from arris_tg2492lg.delta import DeviceSnapshot
+from arris_tg2492lg.device import Device, LanClientAdapterType, LanClientType
+from arris_tg2492lg.device_index import OnlineDeviceIndex
+from arris_tg2492lg.emulator import generate_client_table
+from arris_tg2492lg.mib_mapper import to_devices, to_raw_rows
+
+ONLINE_OID = "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.14"
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+T1 = T0 + timedelta(seconds=10)
+T2 = T1 + timedelta(seconds=10)
+
+
+def _device(ip, mac, online=True, adapter_type=LanClientAdapterType.ETHERNET, type=LanClientType.DYNAMIC):
+    device = Device(ip)
+    device.mac = mac
+    device.hostname = "host-" + mac[-2:]
+    device.online = online
+    device.adapter_type = adapter_type
+    device.type = type
+    return device
+
+
+def test_update_merges_addresses_by_mac():
+    index = OnlineDeviceIndex()
+    index.update(
+        [
+            _device("192.168.178.2", "AA:00:00:00:00:01"),
+            _device("fe80::1", "AA:00:00:00:00:01", online=False),
+            _device("192.168.178.3", "AA:00:00:00:00:02", online=False),
+        ],
+        T0,
+    )
+
+    assert len(index) == 2
+    assert index.is_online("AA:00:00:00:00:01")
+    assert not index.is_online("AA:00:00:00:00:02")
+    assert not index.is_online("AA:00:00:00:00:03")
+    assert index.get("AA:00:00:00:00:01").ips == ["192.168.178.2", "fe80::1"]
+    assert [device.mac for device in index.online_devices()] == ["AA:00:00:00:00:01"]
+
+
+def test_update_tracks_last_seen():
+    index = OnlineDeviceIndex()
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01")], T0)
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01")], T1)
+
+    assert index.last_seen("AA:00:00:00:00:01") == T1
+
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01", online=False)], T2)
+
+    assert not index.is_online("AA:00:00:00:00:01")
+    assert index.last_seen("AA:00:00:00:00:01") == T1
+
+    index.update([], T2)
+
+    assert "AA:00:00:00:00:01" not in index
+    assert index.last_seen("AA:00:00:00:00:01") == T1
+    assert index.last_seen("AA:00:00:00:00:02") is None
+
+
+def test_last_seen_outlives_removal():
+    index = OnlineDeviceIndex()
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01")], T0)
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01")], T1)
+    index.update([], T2)
+
+    assert "AA:00:00:00:00:01" not in index
+    assert index.last_seen("AA:00:00:00:00:01") == T1
+
+    index.update([_device("192.168.178.2", "AA:00:00:00:00:01")], T2 + timedelta(seconds=10))
+
+    assert index.last_seen("AA:00:00:00:00:01") == T2 + timedelta(seconds=10)
+
+
+def test_online_devices_filters():
+    index = OnlineDeviceIndex()
+    index.update(
+        [
+            _device("192.168.178.2", "AA:00:00:00:00:01"),
+            _device("192.168.178.3", "AA:00:00:00:00:02", adapter_type=LanClientAdapterType.WIRELESS1),
+            _device("192.168.178.4", "AA:00:00:00:00:03", type=LanClientType.STATIC),
+        ]
+    )
+
+    assert [device.mac for device in index.online_devices(adapter_type=LanClientAdapterType.ETHERNET)] == [
+        "AA:00:00:00:00:01",
+        "AA:00:00:00:00:03",
+    ]
+    assert [device.mac for device in index.online_devices(type=LanClientType.STATIC)] == ["AA:00:00:00:00:03"]
+    assert index.online_devices(adapter_type=LanClientAdapterType.WIRELESS1, type=LanClientType.STATIC) == []
+
+    index.update([_device("192.168.178.3", "AA:00:00:00:00:02", adapter_type=LanClientAdapterType.ETHERNET)])
+
+    assert [device.mac for device in index.online_devices(adapter_type=LanClientAdapterType.WIRELESS1)] == []
+    assert [device.mac for device in index.online_devices(adapter_type=LanClientAdapterType.ETHERNET)] == ["AA:00:00:00:00:02"]
+
+
+def test_apply_delta_matches_update():
+    table = generate_client_table(4, ipv6_share=1.0)
+    snapshot = DeviceSnapshot()
+    delta_index = OnlineDeviceIndex()
+    full_index = OnlineDeviceIndex()
+
+    delta_index.apply_delta(snapshot.update(to_raw_rows(json.dumps(table))), T0)
+    full_index.update(to_devices(json.dumps(table)), T0)
+
+    # Client 1 goes offline with its IPv4 address only, client 2 with both addresses and client 3
+    # loses its IPv4 address.
+    table = {oid: value for oid, value in table.items() if not oid.endswith(".4.10.0.0.3")}
+    table[f"{ONLINE_OID}.200.1.4.10.0.0.1"] = "0"
+    table[f"{ONLINE_OID}.200.1.4.10.0.0.2"] = "0"
+    for oid in table:
+        if oid.startswith(ONLINE_OID + ".200.2.") and oid.endswith(".0.2"):
+            table[oid] = "0"
+
+    delta_index.apply_delta(snapshot.update(to_raw_rows(json.dumps(table))), T1)
+    full_index.update(to_devices(json.dumps(table)), T1)
+
+    for index in (delta_index, full_index):
+        assert [device.mac for device in index.online_devices()] == [
+            "00:00:00:00:00:00",
+            "00:00:00:00:00:01",
+            "00:00:00:00:00:03",
+        ]
+        assert len(index) == 4
+        assert index.last_seen("00:00:00:00:00:02") == T0
+        assert index.last_seen("00:00:00:00:00:01") == T1
+        assert len(index.get("00:00:00:00:00:03").ips) == 1
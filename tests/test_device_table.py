@@ -0,0 +1,127 @@
+import copy
+import os
+import pytest
+
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+from arris_tg2492lg.device import Device, LanClientAdapterType, LanClientType
+from arris_tg2492lg.device_table import DeviceTable
+from arris_tg2492lg.mib_mapper import to_devices
+
+
+def _get_devices():
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    test_data_path = current_path / "getConnDevices-response.json"
+
+    return to_devices(test_data_path.read_text())
+
+
+def test_device_is_slotted_and_hashable():
+    devices = _get_devices()
+
+    assert not hasattr(devices[0], "__dict__")
+    assert devices[0] == _get_devices()[0]
+    assert devices[0] != devices[3]
+    assert len({*devices, *_get_devices()}) == 4
+
+
+def test_device_is_frozen_before_hashing():
+    device = Device("192.168.178.10")
+    device.hostname = "My Device"
+
+    with pytest.raises(TypeError):
+        hash(device)
+
+    device.freeze()
+    devices = {device}
+
+    with pytest.raises(AttributeError):
+        device.hostname = "Other Device"
+    assert device in devices
+
+    with pytest.raises(AttributeError):
+        _get_devices()[0].mac = None
+    assert DeviceTable([device])[0].to_device() in devices
+    assert repr(device).startswith("Device(ip='192.168.178.10', hostname='My Device',")
+    assert copy.deepcopy(device) in devices
+
+
+def test_device_table_rows_match_devices():
+    devices = _get_devices()
+    table = DeviceTable(devices)
+
+    assert len(table) == 4
+    assert table.to_devices() == devices
+
+    row = table[0]
+    assert row.ip == "192.168.178.2"
+    assert row.mac == "12:34:56:78:90:AB"
+    assert row.adapter_type == LanClientAdapterType.WIRELESS1
+    assert row.type == LanClientType.DYNAMIC
+    assert row.online is True
+    assert row.lease_end == datetime(2019, 11, 3, 16, 51, 4)
+    assert row.lease_end_string == "2019-11-03 16:51:04:00"
+
+
+def test_device_table_lease_end_column():
+    table = DeviceTable(_get_devices())
+
+    assert table.column("lease_end") == (datetime(2019, 11, 3, 16, 51, 4), None, None, datetime(2019, 11, 3, 16, 51, 4))
+    assert table.column("lease_end") is table.column("lease_end")
+    assert table.column("raw_lease_end")[1] == "$0000000000000000"
+
+
+def test_device_table_lookup_by_ip_and_mac():
+    table = DeviceTable(_get_devices())
+
+    assert table.by_ip("192.168.178.3").hostname == "My Device 2"
+    assert table.by_ip("10.0.0.1") is None
+
+    rows = table.by_mac("12:34:56:78:90:AB")
+    assert [row.ip for row in rows] == ["192.168.178.2", "2001:1c12:8d6:bb00:b0f6:855a:dcd:5529"]
+    assert table.by_mac("00:00:00:00:00:00") == []
+    assert len(list(table.macs())) == 3
+
+
+def test_device_table_is_a_sequence():
+    devices = _get_devices()
+    table = DeviceTable(devices)
+
+    assert isinstance(table, Sequence)
+    assert [row.to_device() for row in table[1:3]] == devices[1:3]
+    assert [row.to_device() for row in table[::-1]] == devices[::-1]
+    assert [row.to_device() for row in reversed(table)] == devices[::-1]
+    assert table[4:] == []
+
+
+def test_device_table_missing_values():
+    table = DeviceTable([Device("192.168.178.10")])
+
+    row = table[-1]
+    assert row.adapter_type is None
+    assert row.type is None
+    assert row.online is None
+    assert table.column("online").tolist() == [-1]
+
+
+def test_device_table_columns_are_read_only():
+    devices = _get_devices()
+    table = DeviceTable(devices)
+
+    with pytest.raises(TypeError):
+        table.column("online")[0] = 0
+    with pytest.raises(TypeError):
+        table.column("hostname")[0] = "other"
+
+    assert table.to_devices() == devices
+
+
+def test_device_table_lease_end_column_with_invalid_date():
+    devices = _get_devices()
+    invalid_device = Device(devices[0].ip)
+    invalid_device.raw_lease_end = "$07e30d0310330400"
+    table = DeviceTable([invalid_device, *devices[1:]])
+
+    assert table.column("lease_end") == (None, None, None, datetime(2019, 11, 3, 16, 51, 4))
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+
+from aiohttp import ClientResponseError, ClientSession
+
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.const import ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, MAC_ADDRESS_OID
+from arris_tg2492lg.emulator import OID_ERROR, RouterEmulator
+
+
+async def test_emulator_serves_connected_devices_and_router_information():
+    async with RouterEmulator("secret", client_count=4, ipv6_share=0.5) as emulator, ClientSession() as session:
+        connect_box = ConnectBox(session, emulator.hostname, "secret")
+
+        devices = await connect_box.async_get_connected_devices()
+        router_information = await connect_box.async_get_router_information()
+
+    assert [device.ip for device in devices] == [
+        "10.0.0.0",
+        "2001:1c12:8d6:bb00:b0f6:855a:dcd:0",
+        "10.0.0.1",
+        "2001:1c12:8d6:bb00:b0f6:855a:dcd:1",
+        "10.0.0.2",
+        "10.0.0.3",
+    ]
+    assert router_information.mac_address == "12:34:56:78:90:ab"
+    assert emulator.request_counts["/login"] == 1
+
+
+async def test_emulator_rejects_wrong_password(aiohttp_client):
+    emulator = RouterEmulator("secret")
+    client = await aiohttp_client(emulator.app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "wrong")
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        await connect_box.async_login()
+
+    assert exc_info.value.status == 500
+
+
+async def test_emulator_expires_session(aiohttp_client):
+    now = [0.0]
+    emulator = RouterEmulator("secret", clock=lambda: now[0])
+    client = await aiohttp_client(emulator.app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    await connect_box.async_get_connected_devices()
+
+    now[0] += 301
+    await connect_box.async_get_connected_devices()
+
+    assert emulator.request_counts["/login"] == 2
+    assert emulator.request_counts["/getConnDevices"] == 3
+
+
+async def test_emulator_allows_single_admin_session(aiohttp_client):
+    emulator = RouterEmulator("secret")
+    client = await aiohttp_client(emulator.app)
+    hostname = f"http://{client.host}:{client.port}"
+
+    first_connect_box = ConnectBox(client.session, hostname, "secret")
+    second_connect_box = ConnectBox(client.session, hostname, "secret")
+
+    await first_connect_box.async_get_connected_devices()
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        await second_connect_box.async_get_connected_devices()
+
+    assert exc_info.value.status == 401
+
+    # The first session is not affected and the second client can login after it logged out.
+    await first_connect_box.async_get_connected_devices()
+    await first_connect_box.async_logout()
+    await second_connect_box.async_get_connected_devices()
+
+
+async def test_emulator_replies_oid_error(aiohttp_client):
+    emulator = RouterEmulator("secret")
+    client = await aiohttp_client(emulator.app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    result = await connect_box.async_snmp_get_many([MAC_ADDRESS_OID, "1.2.3"])
+
+    assert result.values == {MAC_ADDRESS_OID: "$1234567890ab"}
+    assert result.errors == {"1.2.3": OID_ERROR}
+
+
+async def test_emulator_injects_failures(aiohttp_client):
+    emulator = RouterEmulator("secret")
+    client = await aiohttp_client(emulator.app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    emulator.fail_next("/getConnDevices", status=503)
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        await connect_box.async_get_connected_devices()
+
+    assert exc_info.value.status == 503
+    assert len(await connect_box.async_get_connected_devices()) == 15
+
+    emulator.failure_rate = 1.0
+
+    with pytest.raises(ClientResponseError):
+        await connect_box.async_get_connected_devices()
+
+
+async def test_emulator_delays_responses(aiohttp_client, monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr("arris_tg2492lg.emulator.asyncio.sleep", record_sleep)
+
+    emulator = RouterEmulator("secret", latency=0.05, jitter=0.05, seed=1)
+    client = await aiohttp_client(emulator.app)
+
+    await ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret").async_login()
+
+    assert len(delays) == 1
+    assert 0.05 <= delays[0] <= 0.1
+
+
+async def test_emulator_changes_online_state(aiohttp_client):
+    emulator = RouterEmulator("secret", client_count=2, ipv6_share=1.0)
+    client = await aiohttp_client(emulator.app)
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    emulator.set_client_online(1, False)
+
+    devices = await connect_box.async_get_connected_devices()
+    rows = [row async for row in connect_box.async_walk_table(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, [14])]
+
+    assert [device.online for device in devices] == [True, True, False, False]
+    assert [row[14] for row in rows] == ["1", "1", "0", "0"]
@@ -0,0 +1,105 @@
+import asyncio
+import base64
+import os
+
+from aiohttp import web
+from pathlib import Path
+
+from arris_tg2492lg.emulator import RouterEmulator
+from arris_tg2492lg.fleet import ConnectBoxFleet
+
+ROUTER_LATENCY = 0.2
+
+
+def _create_router(latency=ROUTER_LATENCY, login_status=200, in_flight=None):
+    async def get_credential(request):
+        if login_status != 200:
+            return web.Response(status=login_status)
+
+        dummy_token = base64.b64encode('{"name": "admin"}'.encode("utf-8")).decode("ascii")
+        return web.Response(text=dummy_token)
+
+    async def get_conn_devices(request):
+        if in_flight is not None:
+            in_flight.start()
+        try:
+            await asyncio.sleep(latency)
+        finally:
+            if in_flight is not None:
+                in_flight.stop()
+
+        current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+        return web.Response(text=(current_path / "getConnDevices-response.json").read_text())
+
+    app = web.Application()
+    app.router.add_get("/login", get_credential)
+    app.router.add_get("/getConnDevices", get_conn_devices)
+    return app
+
+
+class _InFlight:
+    """Counts the requests that are handled at the same time by all routers."""
+
+    def __init__(self):
+        self.current = 0
+        self.maximum = 0
+
+    def start(self):
+        self.current += 1
+        self.maximum = max(self.maximum, self.current)
+
+    def stop(self):
+        self.current -= 1
+
+
+async def _start_routers(aiohttp_server, apps):
+    servers = [await aiohttp_server(app) for app in apps]
+    return [(f"http://{server.host}:{server.port}", "secret") for server in servers]
+
+
+async def _poll(routers, max_concurrency):
+    async with ConnectBoxFleet(routers, max_concurrency=max_concurrency) as fleet:
+        results = [result async for result in fleet.async_get_connected_devices()]
+
+    assert all(result.ok and len(result.result) == 4 for result in results)
+    assert sorted(result.hostname for result in results) == sorted(hostname for hostname, _ in routers)
+
+
+async def test_fleet_requests_are_limited_by_concurrency(aiohttp_server):
+    in_flight = _InFlight()
+    routers = await _start_routers(aiohttp_server, [_create_router(in_flight=in_flight) for _ in range(8)])
+
+    await _poll(routers, max_concurrency=1)
+    assert in_flight.maximum == 1
+
+    in_flight.maximum = 0
+    await _poll(routers, max_concurrency=8)
+    assert in_flight.maximum == 8
+
+
+async def test_fleet_failed_and_slow_routers_do_not_block_others(aiohttp_server):
+    routers = await _start_routers(
+        aiohttp_server, [_create_router(), _create_router(login_status=500), _create_router(latency=10)]
+    )
+
+    async with ConnectBoxFleet(routers, timeout=1) as fleet:
+        results = [result async for result in fleet.async_get_connected_devices()]
+
+    assert [result.hostname for result in results] == [routers[1][0], routers[0][0], routers[2][0]]
+    assert results[0].error is not None
+    assert results[1].ok
+    assert isinstance(results[2].error, asyncio.TimeoutError)
+
+
+async def test_fleet_logout_skips_routers_without_session():
+    async with RouterEmulator("secret") as good, RouterEmulator("other") as wrong_password:
+        async with ConnectBoxFleet([(good.hostname, "secret"), (wrong_password.hostname, "secret")]) as fleet:
+            results = {result.hostname: result async for result in fleet.async_get_connected_devices()}
+            await fleet.async_logout()
+
+        assert results[good.hostname].ok
+        assert results[wrong_password.hostname].error is not None
+
+    assert good.request_counts["/logout"] == 1
+    assert wrong_password.request_counts["/login"] == 1
+    assert wrong_password.request_counts["/logout"] == 0
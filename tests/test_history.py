@@ -0,0 +1,193 @@
+from datetime import date, datetime, timedelta, timezone
+
+from arris_tg2492lg.device import Device, LanClientAdapterType, LanClientType
+from arris_tg2492lg.history import PresenceHistory, PresenceInterval
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+POLL = timedelta(seconds=30)
+MAC = "AA:00:00:00:00:01"
+OTHER_MAC = "AA:00:00:00:00:02"
+
+
+def _device(ip, mac=MAC, online=True, hostname="laptop"):
+    device = Device(ip)
+    device.mac = mac
+    device.hostname = hostname
+    device.online = online
+    device.adapter_type = LanClientAdapterType.WIRELESS1
+    device.type = LanClientType.DYNAMIC
+    return device
+
+
+def _poll(history, start, polls, devices):
+    for poll in range(polls):
+        history.record(devices, start + poll * POLL)
+
+
+def _row_count(history, table):
+    return history._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_record_stores_intervals():
+    history = PresenceHistory()
+
+    _poll(history, T0, 100, [_device("192.168.178.2"), _device("fe80::1", online=False)])
+    _poll(history, T0 + 100 * POLL, 100, [_device("192.168.178.2", online=False)])
+    _poll(history, T0 + 200 * POLL, 100, [_device("192.168.178.2", online=False, mac=OTHER_MAC)])
+
+    assert history.intervals(MAC, T0, T0 + timedelta(days=1)) == [
+        PresenceInterval(MAC, T0, T0 + 100 * POLL, True),
+        PresenceInterval(MAC, T0 + 100 * POLL, T0 + 299 * POLL, False),
+    ]
+    assert history.intervals(MAC, T0 + 50 * POLL, T0 + 150 * POLL) == [
+        PresenceInterval(MAC, T0 + 50 * POLL, T0 + 100 * POLL, True),
+        PresenceInterval(MAC, T0 + 100 * POLL, T0 + 150 * POLL, False),
+    ]
+    assert history.last_online(MAC) == T0 + 100 * POLL
+    assert history.last_online(OTHER_MAC) is None
+    assert history.online_time(MAC, T0, T0 + timedelta(days=1)) == 100 * POLL
+    assert _row_count(history, "presence") == 3
+
+
+def test_record_starts_new_intervals_after_gap():
+    history = PresenceHistory(max_gap=timedelta(minutes=5))
+
+    _poll(history, T0, 10, [_device("192.168.178.2")])
+    _poll(history, T0 + timedelta(hours=1), 10, [_device("192.168.178.2")])
+
+    assert [(interval.start, interval.end) for interval in history.intervals(MAC, T0, T0 + timedelta(days=1))] == [
+        (T0, T0 + 9 * POLL),
+        (T0 + timedelta(hours=1), T0 + timedelta(hours=1) + 9 * POLL),
+    ]
+
+
+def test_online_time_per_day():
+    history = PresenceHistory()
+
+    _poll(history, T0 + timedelta(hours=22), 8 * 60 * 2 + 1, [_device("192.168.178.2")])
+    history.record([_device("192.168.178.2", online=False)], T0 + timedelta(hours=30, seconds=30))
+
+    assert history.online_time_per_day(MAC, date(2024, 1, 1), date(2024, 1, 3)) == {
+        date(2024, 1, 1): timedelta(hours=2),
+        date(2024, 1, 2): timedelta(hours=6, seconds=30),
+        date(2024, 1, 3): timedelta(),
+    }
+
+
+def test_attribute_changes():
+    history = PresenceHistory()
+
+    _poll(history, T0, 10, [_device("192.168.178.2"), _device("fe80::1")])
+    _poll(history, T0 + 10 * POLL, 10, [_device("192.168.178.3", hostname="renamed")])
+
+    changes = history.attribute_changes(MAC, T0 + POLL, T0 + timedelta(days=1))
+
+    assert [(change.time, change.hostname, change.ips) for change in changes] == [
+        (T0, "laptop", ["192.168.178.2", "fe80::1"]),
+        (T0 + 10 * POLL, "renamed", ["192.168.178.3"]),
+    ]
+    assert changes[0].adapter_type == LanClientAdapterType.WIRELESS1
+    assert changes[0].type == LanClientType.DYNAMIC
+    assert _row_count(history, "attributes") == 2
+
+
+def test_history_is_reopened(tmp_path):
+    path = tmp_path / "history.db"
+
+    with PresenceHistory(path) as history:
+        _poll(history, T0, 10, [_device("192.168.178.2")])
+
+    with PresenceHistory(path) as history:
+        _poll(history, T0 + 10 * POLL, 10, [_device("192.168.178.2")])
+
+        assert history.intervals(MAC, T0, T0 + timedelta(days=1)) == [PresenceInterval(MAC, T0, T0 + 19 * POLL, True)]
+        assert _row_count(history, "attributes") == 1
+
+
+def test_prune():
+    history = PresenceHistory()
+
+    _poll(history, T0, 10, [_device("192.168.178.2")])
+    _poll(history, T0 + 10 * POLL, 10, [_device("192.168.178.2", online=False, hostname="renamed")])
+    _poll(history, T0 + 20 * POLL, 10, [_device("192.168.178.2")])
+
+    history.prune(T0 + 15 * POLL)
+
+    assert [interval.online for interval in history.intervals(MAC, T0, T0 + timedelta(days=1))] == [False, True]
+    assert [change.hostname for change in history.attribute_changes(MAC, T0, T0 + timedelta(days=1))] == ["laptop"]
+
+    # The open interval is never removed.
+    history.prune(T0 + timedelta(days=1))
+    history.record([_device("192.168.178.2")], T0 + 30 * POLL)
+
+    assert history.intervals(MAC, T0, T0 + timedelta(days=1)) == [PresenceInterval(MAC, T0 + 20 * POLL, T0 + 30 * POLL, True)]
+
+
+def test_downsample():
+    history = PresenceHistory()
+
+    # Online for an hour with a short offline period, then offline with a short online period.
+    _poll(history, T0, 40, [_device("192.168.178.2")])
+    _poll(history, T0 + 40 * POLL, 2, [_device("192.168.178.2", online=False)])
+    _poll(history, T0 + 42 * POLL, 78, [_device("192.168.178.2")])
+    _poll(history, T0 + 120 * POLL, 50, [_device("192.168.178.2", online=False)])
+    _poll(history, T0 + 170 * POLL, 1, [_device("192.168.178.2")])
+    _poll(history, T0 + 171 * POLL, 50, [_device("192.168.178.2", online=False)])
+    _poll(history, T0 + 221 * POLL, 10, [_device("192.168.178.2")])
+
+    history.downsample(T0 + timedelta(days=1), timedelta(minutes=10))
+
+    assert history.intervals(MAC, T0, T0 + timedelta(days=1)) == [
+        PresenceInterval(MAC, T0, T0 + timedelta(hours=1), True),
+        PresenceInterval(MAC, T0 + timedelta(hours=1), T0 + 221 * POLL, False),
+        PresenceInterval(MAC, T0 + 221 * POLL, T0 + 230 * POLL, True),
+    ]
+
+
+def test_absent_device_is_closed_and_pruned():
+    history = PresenceHistory(max_absence=timedelta(minutes=10))
+
+    _poll(history, T0, 10, [_device("192.168.178.2"), _device("192.168.178.3", mac=OTHER_MAC)])
+    _poll(history, T0 + 10 * POLL, 30, [_device("192.168.178.2")])
+
+    # The other device was closed 10 minutes after it was last returned, with a single offline interval.
+    assert history.intervals(OTHER_MAC, T0, T0 + timedelta(days=1)) == [
+        PresenceInterval(OTHER_MAC, T0, T0 + 10 * POLL, True),
+        PresenceInterval(OTHER_MAC, T0 + 10 * POLL, T0 + 30 * POLL, False),
+    ]
+    assert OTHER_MAC not in history._open
+
+    history.prune(T0 + timedelta(hours=1))
+
+    assert history.intervals(OTHER_MAC, T0, T0 + timedelta(days=1)) == []
+    assert [interval.online for interval in history.intervals(MAC, T0, T0 + timedelta(days=1))] == [True]
+
+    history.record([_device("192.168.178.3", mac=OTHER_MAC)], T0 + 40 * POLL)
+
+    assert history.intervals(OTHER_MAC, T0, T0 + timedelta(days=1)) == [
+        PresenceInterval(OTHER_MAC, T0 + 40 * POLL, T0 + 40 * POLL, True)
+    ]
+
+
+def test_year_of_polls_is_compact(tmp_path):
+    path = tmp_path / "history.db"
+    devices = [_device(f"192.168.178.{client}", mac=f"AA:00:00:00:00:{client:02X}") for client in range(20)]
+
+    with PresenceHistory(path, max_gap=timedelta(days=1)) as history:
+        now = T0
+        for day in range(365):
+            for client in range(20):
+                # Every device goes offline for the night.
+                devices[client].online = False
+            history.record(devices, now)
+            history.record(devices, now + timedelta(hours=8))
+            for device in devices:
+                device.online = True
+            history.record(devices, now + timedelta(hours=8, seconds=30))
+            history.record(devices, now + timedelta(hours=23, minutes=59, seconds=30))
+            now += timedelta(days=1)
+
+        assert _row_count(history, "presence") == 20 * 2 * 365
+        history.vacuum()
+
+    assert path.stat().st_size < 2 * 1024 * 1024
@@ -0,0 +1,85 @@
+import base64
+import os
+
+from aiohttp import web
+from pathlib import Path
+
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.instrumentation import Instrumentation, PrometheusExporter, RequestEvent
+
+
+async def test_events_for_retried_request(aiohttp_client):
+    client = await aiohttp_client(_create_app())
+
+    events = []
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret")
+    connect_box.instrumentation.subscribe(events.append)
+
+    await connect_box.async_get_connected_devices()
+
+    assert [(event.operation, event.status, event.retry) for event in events] == [
+        ("login", 200, False),
+        ("getConnDevices", 401, False),
+        ("login", 200, False),
+        ("getConnDevices", 200, True),
+        ("parse", None, False),
+    ]
+    assert events[3].response_bytes == len(_get_mock_data_text().encode())
+    assert events[3].token_age >= 0
+    assert all(event.duration >= 0 for event in events)
+
+
+async def test_unsubscribe(aiohttp_client):
+    client = await aiohttp_client(_create_app())
+
+    events = []
+    instrumentation = Instrumentation()
+    unsubscribe = instrumentation.subscribe(events.append)
+    unsubscribe()
+
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret", instrumentation=instrumentation)
+    await connect_box.async_get_connected_devices()
+
+    assert not instrumentation.enabled
+    assert events == []
+
+
+def test_prometheus_exporter():
+    instrumentation = Instrumentation()
+    exporter = PrometheusExporter(instrumentation)
+
+    instrumentation.emit(RequestEvent("http://router", "getConnDevices", 0.5, 401, 0, False, 10.0))
+    instrumentation.emit(RequestEvent("http://router", "getConnDevices", 0.25, 200, 1000, True, 12.0))
+
+    metrics = exporter.render()
+
+    assert "# TYPE arris_tg2492lg_requests_total counter" in metrics
+    assert 'arris_tg2492lg_requests_total{hostname="http://router",operation="getConnDevices"} 2' in metrics
+    assert 'arris_tg2492lg_request_duration_seconds_total{hostname="http://router",operation="getConnDevices"} 0.75' in metrics
+    assert 'arris_tg2492lg_response_bytes_total{hostname="http://router",operation="getConnDevices"} 1000' in metrics
+    assert 'arris_tg2492lg_unauthorized_total{hostname="http://router",operation="getConnDevices"} 1' in metrics
+    assert 'arris_tg2492lg_retries_total{hostname="http://router",operation="getConnDevices"} 1' in metrics
+    assert 'arris_tg2492lg_token_age_seconds{hostname="http://router"} 12.0' in metrics
+
+
+def _get_mock_data_text():
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    return (current_path / "getConnDevices-response.json").read_text()
+
+
+def _create_app():
+    async def get_credential(request):
+        return web.Response(text=base64.b64encode('{"name": "admin"}'.encode("utf-8")).decode("ascii"))
+
+    async def get_conn_devices(request):
+        get_conn_devices.call_count += 1
+        if get_conn_devices.call_count == 1:
+            return web.Response(status=401)
+        return web.Response(text=_get_mock_data_text())
+
+    get_conn_devices.call_count = 0
+
+    app = web.Application()
+    app.router.add_get("/login", get_credential)
+    app.router.add_get("/getConnDevices", get_conn_devices)
+    return app
@@ -0,0 +1,87 @@
+import pytest
+
+from arris_tg2492lg.cache import SnmpCache
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.emulator import RouterEmulator
+from arris_tg2492lg.metrics import METRIC_CATALOG, Metric, MetricsCollector, MetricType
+
+UPTIME_OID = "1.3.6.1.2.1.1.3.0"
+WAN_RECEIVED_OID = "1.3.6.1.2.1.31.1.1.1.6.2"
+WAN_ERRORS_OID = "1.3.6.1.2.1.2.2.1.14.2"
+
+
+@pytest.fixture
+async def emulator(aiohttp_client):
+    emulator = RouterEmulator("secret")
+    emulator.snmp_values.update({metric.oid: "0" for metric in METRIC_CATALOG})
+    emulator.client = await aiohttp_client(emulator.app)
+    return emulator
+
+
+def _connect_box(emulator, **kwargs):
+    return ConnectBox(emulator.client.session, f"http://{emulator.client.host}:{emulator.client.port}", "secret", **kwargs)
+
+
+async def test_sample_requests_all_metrics_at_once(emulator):
+    emulator.snmp_values[UPTIME_OID] = "123456"
+    emulator.snmp_values["1.3.6.1.2.1.10.127.1.1.1.1.6.3"] = "-35"
+
+    collector = MetricsCollector(_connect_box(emulator, snmp_cache=SnmpCache()))
+    await collector.async_sample()
+    sample = await collector.async_sample()
+
+    assert emulator.request_counts["/snmpGet"] == 2
+    assert sample.values["uptime_seconds"] == pytest.approx(1234.56)
+    assert sample.values["downstream_power_dbmv"] == pytest.approx(-3.5)
+    assert sample.errors == {}
+
+
+async def test_sample_computes_rates(emulator):
+    collector = MetricsCollector(_connect_box(emulator))
+    emulator.snmp_values[WAN_RECEIVED_OID] = "1000"
+    emulator.snmp_values[WAN_ERRORS_OID] = str(2**32 - 10)
+    first = await collector.async_sample()
+
+    emulator.snmp_values[UPTIME_OID] = "100"
+    emulator.snmp_values[WAN_RECEIVED_OID] = "51000"
+    emulator.snmp_values[WAN_ERRORS_OID] = "5"
+    second = await collector.async_sample()
+
+    elapsed = second.timestamp - first.timestamp
+    assert first.rates == {}
+    assert second.rates["wan_received_bytes"] == pytest.approx(50000 / elapsed)
+    assert second.rates["wan_receive_errors"] == pytest.approx(15 / elapsed)
+    assert second.rates["wan_sent_bytes"] == 0
+    assert "uptime_seconds" not in second.rates
+
+
+async def test_sample_skips_rates_after_restart(emulator):
+    collector = MetricsCollector(_connect_box(emulator))
+    emulator.snmp_values[UPTIME_OID] = "100000"
+    emulator.snmp_values[WAN_RECEIVED_OID] = "1000"
+    await collector.async_sample()
+
+    emulator.snmp_values[UPTIME_OID] = "100"
+    emulator.snmp_values[WAN_RECEIVED_OID] = "10"
+    sample = await collector.async_sample()
+
+    assert sample.rates == {}
+
+
+async def test_sample_reports_errors(emulator):
+    emulator.snmp_values[WAN_RECEIVED_OID] = "n/a"
+    metrics = [Metric("wan_received_bytes", WAN_RECEIVED_OID, MetricType.COUNTER64), Metric("unknown", "1.2.3")]
+
+    sample = await MetricsCollector(_connect_box(emulator), metrics).async_sample()
+
+    assert sample.values == {}
+    assert sample.errors == {"wan_received_bytes": "Received invalid value: n/a", "unknown": "Error in OID formatting!"}
+
+
+async def test_history_is_bounded(emulator):
+    collector = MetricsCollector(_connect_box(emulator), history=3)
+
+    samples = [await collector.async_sample() for _ in range(5)]
+
+    assert collector.samples == samples[2:]
+    assert collector.latest is samples[-1]
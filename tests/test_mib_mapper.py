@@ -1,10 +1,26 @@
+import json
+import logging
 import os
 import pytest
 
+from datetime import datetime
 from pathlib import Path
 from arris_tg2492lg.device import LanClientAdapterType, LanClientType
 
-from arris_tg2492lg.mib_mapper import format_date, format_mac, to_devices
+from arris_tg2492lg.emulator import generate_conn_devices_payload
+from arris_tg2492lg.mib_mapper import (
+    ConnDevicesParser,
+    DeviceBuilder,
+    device_from_raw_row,
+    devices_from_raw_rows,
+    format_date,
+    format_dates,
+    format_mac,
+    format_macs,
+    to_devices,
+    to_raw_rows,
+)
+from benchmarks.legacy import legacy_to_devices
 
 
 def test_to_devices() -> None:
@@ -23,7 +39,8 @@ def test_to_devices() -> None:
     assert device.mac == "12:34:56:78:90:AB"
     assert device.adapter_type == LanClientAdapterType.WIRELESS1
     assert device.type == LanClientType.DYNAMIC
-    assert device.lease_end == "2019-11-03 16:51:04:00"
+    assert device.lease_end == datetime(2019, 11, 3, 16, 51, 4)
+    assert device.lease_end_string == "2019-11-03 16:51:04:00"
     assert device.row_status == "1"
     assert device.online
     assert device.comment == ""
@@ -36,7 +53,8 @@ def test_to_devices() -> None:
     assert device2.mac == "BA:09:87:65:43:21"
     assert device2.adapter_type == LanClientAdapterType.ETHERNET2
     assert device2.type == LanClientType.STATIC
-    assert device2.lease_end == "0000-00-00 00:00:00:00"
+    assert device2.lease_end is None
+    assert device2.lease_end_string == "0000-00-00 00:00:00:00"
     assert device2.row_status == "1"
     assert device2.online
     assert device2.comment == ""
@@ -49,7 +67,7 @@ def test_to_devices() -> None:
     assert device3.mac == "AA:AA:AA:AA:AA:AA"
     assert device3.adapter_type == LanClientAdapterType.ETHERNET2
     assert device3.type == LanClientType.STATIC
-    assert device3.lease_end == "0000-00-00 00:00:00:00"
+    assert device3.lease_end is None
     assert device3.row_status == "1"
     assert device3.online
     assert device3.comment == ""
@@ -62,7 +80,7 @@ def test_to_devices() -> None:
     assert device4.mac == "12:34:56:78:90:AB"
     assert device4.adapter_type == LanClientAdapterType.WIRELESS1
     assert device4.type == LanClientType.DYNAMIC
-    assert device4.lease_end == "2019-11-03 16:51:04:00"
+    assert device4.lease_end == datetime(2019, 11, 3, 16, 51, 4)
     assert device4.row_status == "1"
     assert device4.online
     assert device4.comment == ""
@@ -90,6 +108,79 @@ def test_to_devices_with_invalid_lan_client_type():
         to_devices(json)
 
 
+def test_to_raw_rows_converts_to_same_devices() -> None:
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    get_conn_devices_json = (current_path / "getConnDevices-response.json").read_text()
+
+    raw_rows = to_raw_rows(get_conn_devices_json)
+
+    assert raw_rows[0] == (
+        "192.168.178.2",
+        ("My Device", "$1234567890AB", "5", "1", "$07e30b0310330400", "1", "1", "", "unknown device"),
+    )
+    assert [device_from_raw_row(ip, raw_row) for ip, raw_row in raw_rows] == to_devices(get_conn_devices_json)
+    assert devices_from_raw_rows(raw_rows) == to_devices(get_conn_devices_json)
+
+
+def test_to_devices_logs_ignored_keys_once(caplog) -> None:
+    json_string = """
+    {
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.3.200.1.4.192.168.178.2":"My Device",
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.98.200.1.4.192.168.178.2":"unknown",
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.99.200.1.4.192.168.178.2":"unknown",
+        "routerCurrentTime":"2020-01-09 21:40:21.00",
+        "1": "Finish"
+    }
+    """
+
+    with caplog.at_level(logging.DEBUG, logger="arris_tg2492lg.mib_mapper"):
+        to_devices(json_string)
+
+    assert [(record.levelname, record.getMessage()) for record in caplog.records] == [
+        (
+            "WARNING",
+            "Found 2 unknown OIDs: 1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.98.200.1.4.192.168.178.2, "
+            "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.99.200.1.4.192.168.178.2",
+        ),
+        ("DEBUG", "Found 2 non-OID keys: routerCurrentTime, 1"),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_conn_devices_parser_matches_to_devices(chunk_size) -> None:
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    get_conn_devices_json = (current_path / "getConnDevices-response.json").read_text()
+
+    parser = ConnDevicesParser()
+    devices = []
+
+    for start in range(0, len(get_conn_devices_json), chunk_size):
+        devices += parser.feed(get_conn_devices_json[start : start + chunk_size])
+    devices += parser.close()
+
+    assert devices == to_devices(get_conn_devices_json)
+
+
+def test_conn_devices_parser_returns_device_when_next_row_starts() -> None:
+    parser = ConnDevicesParser()
+
+    devices = parser.feed(
+        '{"1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.3.200.1.4.192.168.178.2":"My Device",'
+        '"1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.3.200.1.4.192.168.178.3":"My Device 2",'
+    )
+
+    assert [device.hostname for device in devices] == ["My Device"]
+    assert [device.hostname for device in parser.feed('"1": "Finish"}') + parser.close()] == ["My Device 2"]
+
+
+def test_conn_devices_parser_incomplete_response() -> None:
+    parser = ConnDevicesParser()
+    parser.feed('{"1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.3.200.1.4.192.168.178.2":"My Dev')
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+
 def test_format_mac_ok():
     result = format_mac("$1234567890ab")
     assert result == "12:34:56:78:90:ab"
@@ -108,3 +199,89 @@ def test_format_date_ok():
 def test_format_date_error():
     with pytest.raises(ValueError):
         format_date("invalid_value")
+
+
+def test_format_macs_matches_format_mac() -> None:
+    values = ["$1234567890ab", "$ABCDEF012345", "$000000000000"]
+
+    assert format_macs(values) == [format_mac(value) for value in values]
+    assert format_macs([]) == []
+
+
+@pytest.mark.parametrize("invalid_value", ["invalid_value", "$1234567890ab\n$1234567890ab", "", "$1234567890a"])
+def test_format_macs_raises_error_of_first_invalid_value(invalid_value) -> None:
+    with pytest.raises(ValueError) as expected:
+        format_mac(invalid_value)
+
+    with pytest.raises(ValueError) as actual:
+        format_macs(["$1234567890ab", invalid_value, "other_invalid_value"])
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_format_dates_matches_format_date() -> None:
+    values = ["$07e30b0310330400", "$0000000000000000", "$FFFF0C1F173B3B63", "$07e30b03103304002b0100"]
+
+    assert format_dates(values) == [format_date(value) for value in values]
+    assert format_dates(values[:3]) == [format_date(value) for value in values[:3]]
+    assert format_dates([]) == []
+
+
+@pytest.mark.parametrize("invalid_value", ["invalid_value", "$07e30b031033040", "$07e30b03", "$07e30b0310330400\n"])
+def test_format_dates_raises_error_of_first_invalid_value(invalid_value) -> None:
+    with pytest.raises((IndexError, ValueError)) as expected:
+        format_date(invalid_value)
+
+    with pytest.raises(expected.type) as actual:
+        format_dates(["$07e30b0310330400", invalid_value, "other_invalid_value"])
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_device_builder_deferred_conversion_matches_direct_conversion() -> None:
+    current_path = Path(os.path.dirname(os.path.realpath(__file__)))
+    get_conn_devices_json = (current_path / "getConnDevices-response.json").read_text()
+    pairs = json.loads(get_conn_devices_json, object_pairs_hook=list)
+
+    def build(defer_conversion):
+        builder = DeviceBuilder(defer_conversion)
+        devices = builder.add_pairs(pairs[:10]) + builder.add_pairs(pairs[10:])
+        last_device = builder.finish()
+        return devices + ([last_device] if last_device is not None else [])
+
+    assert build(True) == build(False) == to_devices(get_conn_devices_json)
+
+
+def test_to_devices_raises_error_of_first_invalid_value() -> None:
+    json_string = """
+    {
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.4.200.1.4.192.168.178.2":"$1234567890ab",
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.9.200.1.4.192.168.178.2":"invalid date",
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.4.200.1.4.192.168.178.3":"invalid mac"
+    }
+    """
+
+    with pytest.raises(ValueError, match="Received invalid date value: invalid date"):
+        to_devices(json_string)
+
+
+def test_to_devices_raises_deferred_error_before_later_error() -> None:
+    json_string = """
+    {
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.4.200.1.4.192.168.178.2":"bad mac",
+        "1.3.6.1.4.1.4115.1.20.1.1.2.4.2.1.6.200.1.4.192.168.178.3":"invalid adapter type"
+    }
+    """
+
+    with pytest.raises(ValueError, match="Received invalid MAC value: bad mac"):
+        to_devices(json_string)
+
+    raw_rows = to_raw_rows(json_string)
+    with pytest.raises(ValueError, match="Received invalid MAC value: bad mac"):
+        devices_from_raw_rows(raw_rows)
+
+
+def test_to_devices_matches_legacy_mapper() -> None:
+    payload = generate_conn_devices_payload(1000)
+
+    assert to_devices(payload) == json.loads(payload, object_pairs_hook=legacy_to_devices)
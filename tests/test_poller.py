@@ -0,0 +1,108 @@
+import asyncio
+
+from aiohttp import ClientSession
+from datetime import timedelta
+
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.emulator import RouterEmulator
+from arris_tg2492lg.fleet import ConnectBoxFleet
+from arris_tg2492lg.poller import AdaptiveInterval, ConnectBoxPoller
+
+from .test_fleet import _InFlight, _create_router, _start_routers
+
+MIN_INTERVAL = timedelta(milliseconds=10)
+MAX_INTERVAL = timedelta(milliseconds=50)
+
+
+def test_adaptive_interval_polls_idle_router_less_often():
+    interval = AdaptiveInterval(timedelta(seconds=10), timedelta(minutes=5))
+
+    polls = 0
+    elapsed = 0.0
+    while elapsed < 24 * 60 * 60:
+        elapsed += interval.success(changed=polls == 0, latency=0.1)
+        polls += 1
+
+    # A fixed interval of 10 seconds would poll 8640 times a day.
+    assert polls < 8640 / 20
+
+
+def test_adaptive_interval_resets_on_changes():
+    interval = AdaptiveInterval(timedelta(seconds=10), timedelta(minutes=5))
+
+    assert interval.success(changed=False, latency=0.1) == 15
+    assert interval.success(changed=False, latency=0.1) == 22.5
+    assert interval.success(changed=True, latency=0.1) == 10
+
+
+def test_adaptive_interval_respects_latency():
+    interval = AdaptiveInterval(timedelta(seconds=10), timedelta(minutes=5))
+
+    assert interval.success(changed=True, latency=3.0) == 30
+
+
+def test_adaptive_interval_backs_off_on_failures():
+    interval = AdaptiveInterval(timedelta(seconds=10), timedelta(minutes=5), timedelta(minutes=2), seed=1)
+
+    delays = [interval.failure() for _ in range(10)]
+
+    assert 10 <= delays[0] <= 20
+    assert 20 <= delays[1] <= 40
+    assert all(60 <= delay <= 120 for delay in delays[4:])
+
+    interval.success(changed=False, latency=0.1)
+    assert 10 <= interval.failure() <= 20
+
+
+async def test_poller_publishes_changes():
+    async with RouterEmulator("secret", client_count=2, ipv6_share=0.0) as emulator, ClientSession() as session:
+        connect_box = ConnectBox(session, emulator.hostname, "secret")
+
+        async with ConnectBoxPoller(connect_box, MIN_INTERVAL, MAX_INTERVAL) as poller:
+            updates = poller.subscribe()
+
+            first = await asyncio.wait_for(updates.__anext__(), 5)
+            emulator.set_client_online(1, False)
+            second = await asyncio.wait_for(updates.__anext__(), 5)
+
+    assert first.delta is not None and len(first.delta.added) == 2
+    assert second.delta is not None and [device.mac for device in second.delta.went_offline] == ["00:00:00:00:00:01"]
+    assert second.next_interval >= MIN_INTERVAL.total_seconds()
+    assert [update async for update in updates] == []
+
+
+async def test_poller_backs_off_on_errors():
+    async with RouterEmulator("secret") as emulator, ClientSession() as session:
+        connect_box = ConnectBox(session, emulator.hostname, "secret")
+        poller = ConnectBoxPoller(connect_box, MIN_INTERVAL, MAX_INTERVAL, max_backoff=timedelta(seconds=1))
+
+        emulator.fail_next("/getConnDevices", status=503, count=2)
+        first = await poller.async_poll()
+        second = await poller.async_poll()
+        third = await poller.async_poll()
+
+    assert first.error is not None and second.error is not None
+    assert 0.01 <= first.next_interval <= 0.02
+    assert 0.02 <= second.next_interval <= 0.04
+    assert third.ok and third.delta
+
+
+async def test_fleet_pollers_share_concurrency(aiohttp_server):
+    in_flight = _InFlight()
+    routers = await _start_routers(aiohttp_server, [_create_router(in_flight=in_flight) for _ in range(4)])
+
+    async with ConnectBoxFleet(routers, max_concurrency=1, timeout=10) as fleet:
+        pollers = [fleet.create_poller(hostname, MIN_INTERVAL, MAX_INTERVAL) for hostname in fleet.hostnames]
+        updates = await asyncio.gather(*(poller.async_poll() for poller in pollers))
+
+    assert all(update.ok for update in updates)
+    assert in_flight.maximum == 1
+
+
+async def test_fleet_pollers_share_timeout(aiohttp_server):
+    routers = await _start_routers(aiohttp_server, [_create_router(latency=10)])
+
+    async with ConnectBoxFleet(routers, timeout=0.1) as fleet:
+        update = await fleet.create_poller(routers[0][0], MIN_INTERVAL, MAX_INTERVAL).async_poll()
+
+    assert isinstance(update.error, asyncio.TimeoutError)
@@ -0,0 +1,93 @@
+import pytest
+
+from arris_tg2492lg.connect_box import ConnectBox
+from arris_tg2492lg.const import MAC_ADDRESS_OID, SERIAL_NUMBER_OID
+from arris_tg2492lg.emulator import ReplayRouter, RouterEmulator
+from arris_tg2492lg.mib_mapper import to_devices
+from arris_tg2492lg.recorder import PayloadRecorder, RecordedPayload, read_recording
+
+
+def test_read_recording(tmp_path):
+    path = tmp_path / "recording.bin"
+
+    with PayloadRecorder(path) as recorder:
+        recorder.record("getConnDevices", "", '{"1": "Finish"}', timestamp=1.0)
+        recorder.record("snmpGet", "1.2.3;1.2.4", '{"1.2.3": "a"}', timestamp=2.0)
+
+    # A recording can be appended to.
+    with PayloadRecorder(path) as recorder:
+        recorder.record("getConnDevices", "", "é" * 1000, timestamp=3.0)
+
+    assert list(read_recording(path)) == [
+        RecordedPayload(1.0, "getConnDevices", "", '{"1": "Finish"}'),
+        RecordedPayload(2.0, "snmpGet", "1.2.3;1.2.4", '{"1.2.3": "a"}'),
+        RecordedPayload(3.0, "getConnDevices", "", "é" * 1000),
+    ]
+    assert [payload.timestamp for payload in read_recording(path, "getConnDevices")] == [1.0, 3.0]
+    assert path.stat().st_size < 1000
+
+
+def test_read_recording_ignores_cut_off_record(tmp_path):
+    path = tmp_path / "recording.bin"
+
+    with PayloadRecorder(path) as recorder:
+        recorder.record("getConnDevices", "", "first")
+        recorder.record("getConnDevices", "", "second")
+
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert [payload.body for payload in read_recording(path)] == ["first"]
+
+
+def test_read_recording_rejects_other_files(tmp_path):
+    path = tmp_path / "recording.bin"
+    path.write_bytes(b"{}")
+
+    with pytest.raises(ValueError):
+        list(read_recording(path))
+
+
+async def test_record_and_replay(aiohttp_client, tmp_path):
+    path = tmp_path / "recording.bin"
+    emulator = RouterEmulator("secret", client_count=3)
+    client = await aiohttp_client(emulator.app)
+
+    with PayloadRecorder(path) as recorder:
+        connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "secret", recorder=recorder)
+
+        devices = await connect_box.async_get_connected_devices()
+        emulator.set_client_online(0, False)
+        streamed_devices = [device async for device in connect_box.async_iter_connected_devices()]
+        router_information = await connect_box.async_get_router_information()
+        await connect_box.async_snmp_get_many([MAC_ADDRESS_OID, "1.2.3"])
+
+    assert [to_devices(payload.body) for payload in read_recording(path, "getConnDevices")] == [
+        devices,
+        streamed_devices,
+    ]
+
+    replay_router = ReplayRouter(path)
+    replay_client = await aiohttp_client(replay_router.app)
+    replay_connect_box = ConnectBox(replay_client.session, f"http://{replay_client.host}:{replay_client.port}", "password")
+
+    assert await replay_connect_box.async_get_connected_devices() == devices
+    assert await replay_connect_box.async_get_connected_devices() == streamed_devices
+    assert await replay_connect_box.async_get_router_information() == router_information
+
+    result = await replay_connect_box.async_snmp_get_many([MAC_ADDRESS_OID, "1.2.3"])
+    assert result.values == {MAC_ADDRESS_OID: "$1234567890ab"}
+    assert set(result.errors) == {"1.2.3"}
+
+    # Requests without a recorded response left.
+    result = await replay_connect_box.async_snmp_get_many([SERIAL_NUMBER_OID])
+    assert set(result.errors) == {SERIAL_NUMBER_OID}
+
+
+async def test_replay_repeats(aiohttp_client):
+    payloads = [RecordedPayload(0.0, "getConnDevices", "", '{"1": "Finish"}')]
+    replay_router = ReplayRouter(payloads, repeat=True)
+    client = await aiohttp_client(replay_router.app)
+    connect_box = ConnectBox(client.session, f"http://{client.host}:{client.port}", "password")
+
+    for _ in range(3):
+        assert await connect_box.async_get_connected_devices() == []
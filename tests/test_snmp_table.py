@@ -0,0 +1,24 @@
+from arris_tg2492lg.const import ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID
+from arris_tg2492lg.snmp_table import TableRow, split_table_key
+
+
+def test_split_table_key():
+    key = ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".3.200.1.4.192.168.178.2"
+
+    assert split_table_key(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, key) == (3, "200.1.4.192.168.178.2")
+
+
+def test_split_table_key_outside_of_table():
+    assert split_table_key(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, "1") is None
+    assert split_table_key(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + "1.3.200") is None
+    assert split_table_key(ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID, ARRIS_ROUTER_LAN_CLIENT_ENTRY_OID + ".3") is None
+
+
+def test_table_row_ip():
+    ipv4_row = TableRow("200.1.4.192.168.178.2", {3: "My Device"})
+    ipv6_row = TableRow("200.2.16.32.1.28.18.8.214.187.0.176.246.133.90.13.205.85.40", {})
+
+    assert ipv4_row.ip == "192.168.178.2"
+    assert ipv4_row[3] == "My Device"
+    assert ipv4_row.get(4) is None
+    assert ipv6_row.ip == "2001:1c12:8d6:bb00:b0f6:855a:dcd:5528"